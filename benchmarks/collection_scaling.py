@@ -0,0 +1,38 @@
+"""
+Scaling of the entity collections with the roster size
+
+Usage:
+    python -m benchmarks.collection_scaling
+
+The time per student should stay roughly constant from 10 to 50k students.
+"""
+import time
+
+from defusedxml.lxml import fromstring
+
+from benchmarks.payloads import course_students_xml
+from muni_is_api import entities
+
+SIZES = (10, 1000, 50000)
+
+
+def iterate_roster(roster: entities.CourseStudents) -> int:
+    total = 0
+    for student in roster.students:
+        total += student.uco
+        (student.first_name, student.last_name, student.full_name, student.study_status)
+    return total
+
+
+def main():
+    print(f"{'students':>10} {'total [s]':>10} {'per student [us]':>18}")
+    for size in SIZES:
+        roster = entities.CourseStudents(fromstring(course_students_xml(size)))
+        start = time.perf_counter()
+        iterate_roster(roster)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>10} {elapsed:>10.3f} {elapsed / size * 1e6:>18.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+Columnar export of the roster compared with reading the entity properties
+
+Usage:
+    python -m benchmarks.export_roster
+"""
+import time
+
+from defusedxml.lxml import fromstring
+
+from benchmarks.payloads import course_students_xml
+from muni_is_api import entities
+
+SIZES = (1000, 30000)
+
+
+def properties(roster: entities.CourseStudents) -> list:
+    return [dict(uco=student.uco, first_name=student.first_name,
+                 last_name=student.last_name, full_name=student.full_name,
+                 study_status=student.study_status)
+            for student in roster.students]
+
+
+def main():
+    print(f"{'students':>10} {'properties [s]':>15} {'to_records [s]':>15} {'columns [s]':>12}")
+    for size in SIZES:
+        timings = []
+        for export in (properties, entities.CourseStudents.to_records,
+                       entities.CourseStudents.columns):
+            # A fresh entity, so the cached collections do not skew the results
+            roster = entities.CourseStudents(fromstring(course_students_xml(size)))
+            start = time.perf_counter()
+            export(roster)
+            timings.append(time.perf_counter() - start)
+        print(f"{size:>10} {timings[0]:>15.3f} {timings[1]:>15.3f} {timings[2]:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
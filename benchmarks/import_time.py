@@ -0,0 +1,34 @@
+"""
+Import time of the package
+
+Usage:
+    python -m benchmarks.import_time
+
+The package import should not load the clients, lxml, requests or the logging config.
+"""
+import statistics
+import subprocess
+import sys
+
+RUNS = 10
+
+_CODE = "import time; start = time.perf_counter(); import {module}; " \
+        "print(time.perf_counter() - start)"
+
+
+def measure(module: str, runs: int = RUNS) -> float:
+    times = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', _CODE.format(module=module)],
+                                check=True, stdout=subprocess.PIPE, universal_newlines=True)
+        times.append(float(output.stdout))
+    return statistics.median(times)
+
+
+def main():
+    for module in ('muni_is_api', 'muni_is_api.client'):
+        print(f"{module:>20}: {measure(module) * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
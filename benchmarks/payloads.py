@@ -0,0 +1,128 @@
+"""
+Synthetic payloads of the IS API with the shape of the production responses
+
+Every generator takes the number of the rows (students, seminars or nodes) and returns
+the UTF-8 encoded XML. The payloads are deterministic, the same size gives the same bytes.
+
+Usage:
+    from benchmarks import payloads
+    roster = entities.CourseStudents(utils.parse(payloads.course_students_xml(10000)))
+"""
+import random
+
+from muni_is_api.standin import FIRST_NAMES, LAST_NAMES
+
+FIRST_UCO = 100000
+STUDENTS_PER_SEMINAR = 20
+_TITLES = ('', '', '', 'Bc. ', 'Mgr. ')
+_STUDIES = ('FI B-IN Inf', 'FI B-PVA PVA', 'FI N-SWE SWE', 'FI C-CV EL celoživ.')
+_CONTENTS = ('*{points}', '{points} bodů', 'odevzdáno *{points}', 'Great work! *{points}',
+             '{points}', 'neodevzdáno')
+
+
+def _person(rng: random.Random, uco: int) -> str:
+    first = rng.choice(FIRST_NAMES)
+    last = rng.choice(LAST_NAMES)
+    return (f"<CELE_JMENO>{rng.choice(_TITLES)}{first} {last}</CELE_JMENO>"
+            f"<JMENO>{first}</JMENO><PRIJMENI>{last}</PRIJMENI><UCO>{uco}</UCO>")
+
+
+def _student(rng: random.Random, uco: int, seminar: int = None) -> str:
+    seminars = f"<SEMINARE><SEMINAR><OZNACENI>{seminar:02}</OZNACENI></SEMINAR></SEMINARE>" \
+        if seminar is not None else "<SEMINARE/>"
+    return (f"<STUDENT>{_person(rng, uco)}{seminars}"
+            f"<STAV_STUDIA>{'aktivní' if rng.random() < 0.95 else 'ukončené'}</STAV_STUDIA>"
+            f"<STAV_ZAPISU>{'zapsáno' if rng.random() < 0.9 else 'registrováno'}</STAV_ZAPISU>"
+            f"<STUDENT_NEMA_SEMINAR>{'0' if seminar is not None else '1'}"
+            f"</STUDENT_NEMA_SEMINAR>"
+            f"<STUDIA><STUDIUM_IDENTIFIKACE>{rng.choice(_STUDIES)}</STUDIUM_IDENTIFIKACE>"
+            f"</STUDIA><UKONCENI>{rng.choice('zkk')}</UKONCENI></STUDENT>")
+
+
+def _seminar_fields(index: int) -> str:
+    return (f"<OZNACENI>{index:02}</OZNACENI><SEMINAR_ID>{200000 + index}</SEMINAR_ID>"
+            f"<MAX_STUDENTU>{STUDENTS_PER_SEMINAR}</MAX_STUDENTU>"
+            f"<POCET_STUDENTU_VE_SKUPINE>{STUDENTS_PER_SEMINAR}</POCET_STUDENTU_VE_SKUPINE>"
+            f"<PRIHLASIT_OD>20200901180000</PRIHLASIT_OD>"
+            f"<PRIHLASIT_DO>20201004000000</PRIHLASIT_DO>"
+            f"<ODHLASIT_DO>20201004000000</ODHLASIT_DO><POZNAMKA/>"
+            f"<ZMENENO>20200819215850</ZMENENO><ZMENIL>{FIRST_UCO - 1}</ZMENIL>")
+
+
+def course_info_xml(seminars: int) -> bytes:
+    """Course info with the seminars and a teacher for each ten seminars"""
+    rng = random.Random(seminars)
+    listed = "".join(f"<SEMINAR>{_seminar_fields(index)}</SEMINAR>"
+                     for index in range(1, seminars + 1))
+    teachers = "".join(f"<VYUCUJICI>{_person(rng, 1000 + index)}<ROLE>cvičící</ROLE>"
+                       f"<OSOBA_TEXTOVE>ne</OSOBA_TEXTOVE><ZASTUPCE/></VYUCUJICI>"
+                       for index in range(max(1, seminars // 10)))
+    return (f"<PREDMET_INFO><FAKULTA_ID>1433</FAKULTA_ID>"
+            f"<FAKULTA_ZKRATKA_DOM>fi</FAKULTA_ZKRATKA_DOM><KOD_PREDMETU>PB000</KOD_PREDMETU>"
+            f"<NAZEV_PREDMETU>Benchmark</NAZEV_PREDMETU>"
+            f"<NAZEV_PREDMETU_ANGL>Benchmark</NAZEV_PREDMETU_ANGL>"
+            f"<OBDOBI_ID>7024</OBDOBI_ID><OBDOBI_NAZEV>podzim 2020</OBDOBI_NAZEV>"
+            f"<POCET_ZAPSANYCH_STUDENTU>{seminars * STUDENTS_PER_SEMINAR}"
+            f"</POCET_ZAPSANYCH_STUDENTU>"
+            f"<POCET_ZAREG_STUDENTU>{seminars * STUDENTS_PER_SEMINAR}</POCET_ZAREG_STUDENTU>"
+            f"<PREDMET_ID>990599</PREDMET_ID><SEMINARE>{listed}</SEMINARE>"
+            f"<VYUCUJICI_SEZNAM>{teachers}</VYUCUJICI_SEZNAM></PREDMET_INFO>").encode('utf-8')
+
+
+def course_students_xml(count: int) -> bytes:
+    """Roster of the students, most of them in a seminar"""
+    rng = random.Random(count)
+    students = "".join(
+        _student(rng, uco, (uco - FIRST_UCO) // STUDENTS_PER_SEMINAR + 1
+                 if rng.random() < 0.9 else None)
+        for uco in range(FIRST_UCO, FIRST_UCO + count))
+    return f"<PREDMET_STUDENTI_INFO>{students}</PREDMET_STUDENTI_INFO>".encode('utf-8')
+
+
+def notepad_content_xml(count: int) -> bytes:
+    """Notepad content of the students, some of them without the entry"""
+    rng = random.Random(count)
+    rows = []
+    for uco in range(FIRST_UCO, FIRST_UCO + count):
+        if rng.random() < 0.1:
+            rows.append(f"<STUDENT><NEMA_POZN_BLOK>1</NEMA_POZN_BLOK><UCO>{uco}</UCO></STUDENT>")
+            continue
+        content = rng.choice(_CONTENTS).format(points=rng.randint(0, 20))
+        rows.append(f"<STUDENT><OBSAH>{content}</OBSAH><UCO>{uco}</UCO>"
+                    f"<ZMENENO>2020{rng.randint(10, 12)}{rng.randint(10, 28)}104208</ZMENENO>"
+                    f"<ZMENIL>{FIRST_UCO - 1}</ZMENIL></STUDENT>")
+    return f"<BLOKY_OBSAH>{''.join(rows)}</BLOKY_OBSAH>".encode('utf-8')
+
+
+def seminar_students_xml(count: int) -> bytes:
+    """Students of the seminars, ``STUDENTS_PER_SEMINAR`` students in each seminar"""
+    rng = random.Random(count)
+    seminars = []
+    for start in range(0, count, STUDENTS_PER_SEMINAR):
+        index = start // STUDENTS_PER_SEMINAR + 1
+        students = "".join(_student(rng, FIRST_UCO + offset, index)
+                           for offset in range(start, min(count, start + STUDENTS_PER_SEMINAR)))
+        seminars.append(f"<SEMINAR><OZNACENI>{index:02}</OZNACENI>"
+                        f"<SEMINAR_ID>{200000 + index}</SEMINAR_ID>{students}</SEMINAR>")
+    return f"<SEMINAR_STUDENTI_INFO>{''.join(seminars)}</SEMINAR_STUDENTI_INFO>".encode('utf-8')
+
+
+def _node(node_id: int, parent_id: int, path: str, objects: int, subnodes: int) -> str:
+    name = path.rstrip('/').rsplit('/', 1)[-1]
+    return (f"<nazev>{name}</nazev><zkratka>{name}</zkratka><uzel_id>{node_id}</uzel_id>"
+            f"<rodic_id>{parent_id}</rodic_id><cesta>{path}</cesta>"
+            f"<vaha_pro_razeni>{node_id % 100}</vaha_pro_razeni>"
+            f"<zmeneno>20201015120000</zmeneno><zmenil_uco>{FIRST_UCO - 1}</zmenil_uco>"
+            f"<zmenil_jmeno>Jan Novák</zmenil_jmeno><smi_cist_svet>0</smi_cist_svet>"
+            f"<smi_cist_auth>1</smi_cist_auth><pocet_objektu>{objects}</pocet_objektu>"
+            f"<pocet_poduzlu>{subnodes}</pocet_poduzlu>"
+            f"<url_metadata>/auth/dok/fmgr_api?url={path}</url_metadata>")
+
+
+def files_xml(count: int, root: str = '/el/fi/podzim2020/PB000/odp/') -> bytes:
+    """Metadata of the folder with the listing of its subnodes, a file of each student"""
+    subnodes = "".join(
+        f"<poduzel>{_node(index + 2, 1, f'{root}{FIRST_UCO + index}.zip', 1, 0)}</poduzel>"
+        for index in range(count))
+    return (f"<fmgr><uzel>{_node(1, 0, root, 0, count)}<poduzly>{subnodes}</poduzly>"
+            f"</uzel></fmgr>").encode('utf-8')
@@ -0,0 +1,89 @@
+"""
+Per-call overhead of the prepared operations compared with the client methods
+
+Usage:
+    python -m benchmarks.prepared
+
+The responses are served by an adapter of the ``requests`` session without the network,
+so the times contain only the work of the client, ``requests`` and the parser.
+"""
+import time
+
+import requests
+from requests.adapters import BaseAdapter
+
+from typing import Callable
+
+import muni_is_api
+from benchmarks import payloads
+from muni_is_api import entities
+
+CALLS = 5000
+UCOS = list(range(payloads.FIRST_UCO, payloads.FIRST_UCO + 50))
+
+
+class CannedAdapter(BaseAdapter):
+    """Answers every request with the same response"""
+
+    def __init__(self, content: bytes):
+        super().__init__()
+        self.content = content
+
+    def send(self, request, **kwargs) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.content
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def _client(content: bytes) -> muni_is_api.IsApiClient:
+    client = muni_is_api.IsApiClient('is.muni.cz', 'secret_token', 'PB000', 1433)
+    client.http.session.mount('https://', CannedAdapter(content))
+    return client
+
+
+def per_call(call: Callable[[int], object], calls: int = CALLS) -> float:
+    """Runs the call repeatedly
+    Returns(float): Median of three runs per call in seconds
+    """
+    runs = []
+    for _ in range(3):
+        start = time.perf_counter()
+        for index in range(calls):
+            call(index)
+        runs.append((time.perf_counter() - start) / calls)
+    return sorted(runs)[1]
+
+
+def cases(client: muni_is_api.IsApiClient):
+    info = client.prepare('predmet-info', entities.CourseInfo)
+    update = client.prepare('blok-pis-student-obsah')
+    content = client.prepare('blok-dej-obsah', entities.NotepadContent)
+    return [
+        ('predmet-info', lambda index: client.course_info(), lambda index: info()),
+        ('blok-pis-student-obsah',
+         lambda index: client.notepad_update('hw01', uco=UCOS[index % 50], content='*1'),
+         lambda index: update(zkratka='hw01', uco=UCOS[index % 50], obsah='*1', prepis='a')),
+        ('blok-dej-obsah (50 ucos)',
+         lambda index: client.notepad_content('hw01', ucos=UCOS),
+         lambda index: content(zkratka='hw01', uco=UCOS)),
+    ]
+
+
+def main():
+    client = _client(b'<BLOKY_OBSAH><STUDENT><UCO>100000</UCO></STUDENT></BLOKY_OBSAH>')
+    print(f"{'operation':>26} {'method [us]':>12} {'prepared [us]':>14} {'saved [us]':>11}")
+    for (name, method, prepared) in cases(client):
+        before = per_call(method)
+        after = per_call(prepared)
+        print(f"{name:>26} {before * 1e6:>12.1f} {after * 1e6:>14.1f} "
+              f"{(before - after) * 1e6:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+"""
+Benchmark suite of the parsing, the entities, the params and the client calls
+
+Every case runs on the synthetic payloads (see ``benchmarks.payloads``) of each size,
+the client cases on the courses and the files of the ``muni_is_api.standin`` server.
+The results can be saved as a baseline and the later runs on the same machine compared
+with it:
+
+Usage:
+    python -m benchmarks.suite --sizes 10 1000 100000
+    python -m benchmarks.suite --save reference
+    python -m benchmarks.suite --compare reference --only 'properties/*'
+
+The comparison exits with the status 1 if the fastest run of a case is slower than
+in the baseline by more than the ``--threshold`` ratio, the fastest run is the least
+affected by the noise of the machine.
+"""
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import requests
+from lxml import etree
+
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import muni_is_api
+from benchmarks import payloads
+from muni_is_api import entities, utils
+from muni_is_api.standin import Course, StandInServer
+
+BASELINES = Path(__file__).parent / 'baselines'
+SIZES = (10, 1000, 10000)
+ROOT = '/el/fi/podzim2020/PB000/odp/'
+
+
+class Case(NamedTuple):
+    """Benchmark, ``setup`` runs once for each size, ``fresh`` before each timed ``run``"""
+    name: str
+    setup: Callable[[int], Any]
+    run: Callable[[Any], Any]
+    fresh: Optional[Callable[[Any], Any]] = None
+
+
+class Payload(NamedTuple):
+    generate: Callable[[int], bytes]
+    entity: type
+    # Reads the properties of every row
+    properties: Callable[[Any], Any]
+    # Builds the collections of the rows
+    iteration: Callable[[Any], Any]
+
+
+def _roster_properties(roster: entities.CourseStudents) -> list:
+    return [(student.uco, student.first_name, student.last_name, student.full_name,
+             student.study_status, student.registration_status, student.has_seminary)
+            for student in roster.students]
+
+
+def _notepad_properties(content: entities.NotepadContent) -> list:
+    return [(entry.uco, entry.content, entry.changed.date) for entry in content.students]
+
+
+def _seminar_properties(seminars: entities.SeminarStudents) -> list:
+    return [(seminar.name, student.uco, student.full_name)
+            for seminar in seminars.seminars for student in seminar.students]
+
+
+def _course_info_properties(info: entities.CourseInfo) -> list:
+    return [(seminar.id, seminar.label, seminar.students.count, seminar.dates.signin_from,
+             seminar.changed.date) for seminar in info.seminars]
+
+
+def _files_properties(node: entities.NodeMetadata) -> list:
+    return [(subnode.node_id, subnode.path, subnode.updated_at, subnode.objects_count,
+             subnode.subnodes_count) for subnode in node.subnodes]
+
+
+PAYLOADS = {
+    'course_info': Payload(payloads.course_info_xml, entities.CourseInfo,
+                           _course_info_properties, lambda info: len(info.seminars)),
+    'course_students': Payload(payloads.course_students_xml, entities.CourseStudents,
+                               _roster_properties, lambda roster: roster.by_uco()),
+    'notepad_content': Payload(payloads.notepad_content_xml, entities.NotepadContent,
+                               _notepad_properties, lambda content: content.by_uco()),
+    'seminar_students': Payload(payloads.seminar_students_xml, entities.SeminarStudents,
+                                _seminar_properties, lambda seminars: seminars.by_uco()),
+    'files': Payload(payloads.files_xml, entities.NodeMetadata,
+                     _files_properties, lambda node: len(node.subnodes)),
+}
+
+
+def _response(content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    return response
+
+
+def _params(size: int) -> Dict:
+    return dict(klic='secret_token', fakulta=1433, kod='PB000', operace='blok-dej-obsah',
+                zkratka='hw01', uco=list(range(payloads.FIRST_UCO, payloads.FIRST_UCO + size)))
+
+
+class _Server:
+    """Local stand-in server and the clients, started on the first client case"""
+
+    def __init__(self):
+        self.standin = None
+        self.client = None
+        self.files = None
+
+    def start(self):
+        if self.standin is None:
+            # The requests are not recorded, the long runs would keep all of them
+            self.standin = StandInServer(history=0).start()
+            self.client = muni_is_api.IsApiClient(self.standin.domain, 'secret_token',
+                                                  'PB000', 1433, scheme='http')
+            self.files = muni_is_api.FilesApiClient(self.standin.domain, '1', 'password',
+                                                    scheme='http')
+        return self
+
+    def stop(self):
+        if self.standin is not None:
+            self.standin.stop()
+
+
+def _client_cases(server: _Server) -> List[Case]:
+    def _serve(seminars: bool = False):
+        def _setup(size: int):
+            # The course info lists a seminar for each student, the others use a single
+            # seminar of all the students
+            course = Course.generate('PB000', 1433, 'secret_token', students=size,
+                                     notepads=1, seminar_size=1 if seminars else size)
+            server.start().standin.add_course(course)
+            return server.client
+        return _setup
+
+    def _serve_files(size: int):
+        folder = f"{ROOT}{size}/"
+        for index in range(size):
+            server.start().standin.add_file(f"{folder}file{index}.txt", b'')
+        return server.files.for_url(folder)
+
+    return [
+        Case('client/course_info', _serve(seminars=True), lambda client: client.course_info()),
+        Case('client/course_students', _serve(), lambda client: client.course_list_students()),
+        Case('client/notepad_content', _serve(), lambda client: client.notepad_content('hw01')),
+        Case('client/seminar_students', _serve(),
+             lambda client: client.seminar_list_students(['01'])),
+        Case('client/files', _serve_files, lambda wrapper: wrapper.metadata(tree=True)),
+    ]
+
+
+def cases(server: _Server) -> List[Case]:
+    result = []
+    for (name, payload) in PAYLOADS.items():
+        def _parse(content: bytes, entity=payload.entity):
+            return entity(utils.parse(content))
+
+        result += [
+            Case(f"serialize/{name}", lambda size, generate=payload.generate:
+                 _response(generate(size)), utils.serialize),
+            Case(f"properties/{name}", payload.generate, payload.properties, _parse),
+            Case(f"iteration/{name}", payload.generate, payload.iteration, _parse),
+        ]
+    result.append(Case('params_serialize/uco', _params, utils.params_serialize))
+    return result + _client_cases(server)
+
+
+def measure(case: Case, size: int, repeat: int, budget: float) -> List[float]:
+    """Runs the case at least once and at most ``repeat`` times or for the ``budget`` seconds
+    Returns(List[float]): Duration of each run in seconds
+    """
+    state = case.setup(size)
+    timings = []
+    deadline = time.perf_counter() + budget
+    while len(timings) < repeat:
+        argument = case.fresh(state) if case.fresh is not None else state
+        start = time.perf_counter()
+        case.run(argument)
+        timings.append(time.perf_counter() - start)
+        if time.perf_counter() > deadline:
+            break
+    return timings
+
+
+def environment() -> Dict:
+    return dict(python=platform.python_version(), platform=platform.platform(),
+                lxml='.'.join(map(str, etree.LXML_VERSION)), package=muni_is_api.__version__)
+
+
+def run(sizes, only: str = None, repeat: int = 5, budget: float = 2.0) -> Dict[str, Dict]:
+    """Runs the selected cases
+    Returns(Dict[str, Dict]): Statistics of the runs by the case name and the size
+    """
+    server = _Server()
+    results = {}
+    try:
+        for case in cases(server):
+            if only and not fnmatch.fnmatchcase(case.name, only):
+                continue
+            for size in sizes:
+                timings = measure(case, size, repeat, budget)
+                median = statistics.median(timings)
+                results.setdefault(case.name, {})[str(size)] = dict(
+                    runs=len(timings), min=min(timings), median=median)
+                print(f"{case.name:>32} {size:>8} {median * 1000:>12.3f} "
+                      f"{median / size * 1e6:>12.3f}", flush=True)
+    finally:
+        server.stop()
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List:
+    """Compares the fastest runs with the baseline
+    Returns(List): Names and sizes of the cases slower than the baseline by the threshold ratio
+    """
+    regressions = []
+    print(f"\n{'case':>32} {'size':>8} {'baseline [ms]':>14} {'now [ms]':>12} {'ratio':>8}")
+    for (name, sizes) in results.items():
+        for (size, stats) in sizes.items():
+            previous = baseline.get(name, {}).get(size)
+            if previous is None:
+                continue
+            ratio = stats['min'] / previous['min']
+            mark = ' !' if ratio > threshold else ''
+            print(f"{name:>32} {size:>8} {previous['min'] * 1000:>14.3f} "
+                  f"{stats['min'] * 1000:>12.3f} {ratio:>8.2f}{mark}")
+            if ratio > threshold:
+                regressions.append((name, size))
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help="Numbers of the rows of the payloads")
+    parser.add_argument('--only', help="Glob pattern of the case names, e.g. 'client/*'")
+    parser.add_argument('--repeat', type=int, default=5, help="Maximal runs of each case")
+    parser.add_argument('--budget', type=float, default=2.0,
+                        help="Seconds after which no more runs of the case are started")
+    parser.add_argument('--save', metavar='NAME', help="Save the results as the baseline")
+    parser.add_argument('--compare', metavar='NAME', help="Compare with the baseline")
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help="Slowdown ratio reported as the regression")
+    args = parser.parse_args(argv)
+
+    print(f"{'case':>32} {'size':>8} {'median [ms]':>12} {'per row [us]':>12}")
+    results = run(args.sizes, only=args.only, repeat=args.repeat, budget=args.budget)
+
+    if args.save:
+        BASELINES.mkdir(exist_ok=True)
+        path = BASELINES / f"{args.save}.json"
+        path.write_text(json.dumps(dict(environment=environment(), results=results),
+                                   indent=1, sort_keys=True) + '\n', encoding='utf-8')
+        print(f"\nSaved the baseline {path}")
+
+    if args.compare:
+        saved = json.loads((BASELINES / f"{args.compare}.json").read_text(encoding='utf-8'))
+        if saved['environment'] != environment():
+            print(f"\nThe baseline has been measured in {saved['environment']}")
+        regressions = compare(results, saved['results'], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions over {args.threshold}x")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,41 @@
-import muni_is_api.log_config
-from muni_is_api.client import IsApiClient         # noqa: F401
-from muni_is_api.files_api import FilesApiClient   # noqa: F401
+"""
+IS MUNI API wrapper
+
+The import of the package has no side effects, the clients (and their dependencies)
+are imported on the first access. Logging is configured only on explicit request:
+
+    import muni_is_api.log_config
+    muni_is_api.log_config.load_config()
+"""
+import importlib
+import sys
+import types
 
 __version__ = '0.8.0'
 
-muni_is_api.log_config.load_config()
+_LAZY_ATTRIBUTES = {
+    'IsApiClient': 'muni_is_api.client',
+    'FilesApiClient': 'muni_is_api.files_api',
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
+
+
+if sys.version_info < (3, 7):
+    # The module level __getattr__ (PEP 562) is supported since Python 3.7
+    class _LazyModule(types.ModuleType):
+        def __getattr__(self, name: str):
+            return __getattr__(name)
+
+    sys.modules[__name__].__class__ = _LazyModule
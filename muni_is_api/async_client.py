@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import time
+
+import aiohttp
+import yarl
+from defusedxml.lxml import RestrictedElement
+
+from typing import Dict, Optional
+
+from muni_is_api import entities, errors, planner, utils
+from muni_is_api.client import BaseHttpClient, BaseIsApiClient
+from muni_is_api.retry import RetryPolicy
+
+log = logging.getLogger(__name__)
+
+
+class AsyncIsApiClient(BaseIsApiClient):
+    """Asyncio variant of the IsApiClient
+
+    It has the same operations as the IsApiClient, but every operation returns an awaitable
+    that resolves to the same entity as its sync counterpart.
+
+    Example:
+        async with AsyncIsApiClient('is.muni.cz', token, 'PB071', 1433) as client:
+            info, students = await asyncio.gather(
+                client.course_info(), client.course_list_students())
+
+    The concurrency is bounded by the ``limit`` of the AsyncHttpClient, the ``AdaptiveLimiter``
+    of the sync client blocks the threads and it is not supported.
+    """
+
+    def __init__(self, domain: str, token: str, course_code: str, faculty_id: int,
+                 **kwargs):
+        """Creates async IS API client
+        Args:
+            domain(str): Is domain (ex. is.muni.cz)
+            token(str): Token for the Notes api
+            course_code(str): Course code
+            faculty_id(int): Id of the faculty
+            **kwargs: Additional options for the AsyncHttpClient
+        """
+        super().__init__(AsyncHttpClient(domain, token, course_code, faculty_id, **kwargs))
+
+    @property
+    def http(self) -> 'AsyncHttpClient':
+        """Gets instance of the async HTTP Client
+        Returns(AsyncHttpClient): Http client instance
+        """
+        return self._http
+
+    async def close(self):
+        """Closes the underlying HTTP session"""
+        await self.http.close()
+
+    async def __aenter__(self) -> 'AsyncIsApiClient':
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def _create_resource(self, operation: str, params: Dict = None,
+                               cls=entities.Resource):
+        params = params or {}
+        resp = await self.http.operation(operation=operation, **params)
+        return cls(resp)
+
+
+class AsyncHttpClient(BaseHttpClient):
+    __slots__ = ('_session', '_owns_session', '_limit', '_semaphore', '_retry')
+
+    def __init__(self, domain: str, token: str, course_code: str, faculty_id: int,
+                 limit: int = 100, session: aiohttp.ClientSession = None,
+                 retry: RetryPolicy = None, **kwargs):
+        """Creates async HTTP Client wrapper
+        Args:
+            domain(str): Is domain (ex. is.muni.cz)
+            token(str): Token for the Notes api
+            course_code(str): Course code
+            faculty_id(int): Id of the faculty
+            limit(int): Maximal number of the requests in flight
+            session(aiohttp.ClientSession): Shared session (connection pool),
+                the client does not close the shared session
+            retry(RetryPolicy): Retry policy of the failed requests, None disables retries
+            **kwargs: Options of the BaseHttpClient
+        """
+        super().__init__(domain, token, course_code, faculty_id, **kwargs)
+        self._session = session
+        self._owns_session = session is None
+        self._limit = limit
+        self._semaphore = None
+        self._retry = retry
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self._limit)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    @property
+    def limit(self) -> int:
+        """Maximal number of the requests in flight
+        Returns(int): Concurrency limit
+        """
+        return self._limit
+
+    @property
+    def retry(self) -> Optional[RetryPolicy]:
+        """Retry policy of the failed requests
+        Returns(RetryPolicy): Policy instance, None if the requests are not retried
+        """
+        return self._retry
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily, so it is bound to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._limit)
+        return self._semaphore
+
+    async def operation(self, operation, **params) -> RestrictedElement:
+        """Invokes operation of the API
+        Args:
+            operation(str): Name of the operation
+            **params: Optional params for the operation
+
+        Returns: Resource instance
+        """
+        if self._cache is not None:
+            key = self._cache_params(operation, params)
+            cached = self._cache.get(operation, key)
+            if cached is not None:
+                log.debug(f"[CACHE] Hit: {operation}")
+                return cached
+
+        planned = self._plan(operation, params)
+        if len(planned) == 1:
+            resource = await self._request(operation, planned[0])
+        else:
+            roots = await asyncio.gather(*[self._request(operation, part) for part in planned])
+            resource = planner.merge(list(roots))
+
+        if self._cache is not None:
+            self._cache.set(operation, key, resource)
+        return resource
+
+    async def _request(self, operation: str, params: Dict) -> RestrictedElement:
+        url = utils.build_url(self.api_url, params)
+        attempt = 1
+        while True:
+            async with self.semaphore:
+                log.debug(f"[REQ] New: {operation}")
+                start = time.perf_counter()
+                try:
+                    async with self.session.get(yarl.URL(url, encoded=True)) as response:
+                        content = await response.read()
+                        status = response.status
+                        headers = response.headers
+                except Exception as ex:
+                    self._record(operation, None, time.perf_counter() - start, error=ex,
+                                 attempt=attempt)
+                    if self._retry is None or \
+                            not self._retry.should_retry(operation, attempt, None, ex):
+                        raise
+                    status, delay = None, self._retry.delay(attempt)
+                network_time = time.perf_counter() - start
+            if status is not None:
+                if status < 400 or self._retry is None or \
+                        not self._retry.should_retry(operation, attempt, status):
+                    break
+                self._record(operation, status, network_time, response_bytes=len(content),
+                             attempt=attempt)
+                delay = self._retry.delay(attempt, headers)
+            log.warning(f"[RETRY] Attempt {attempt} of {operation} has failed, "
+                        f"retry in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        if status >= 400:
+            self._record(operation, status, network_time, response_bytes=len(content),
+                         attempt=attempt)
+            log.error(f"[RES] Response[{status}]: {content} - "
+                      f"\"{content.decode('utf-8')}\"")
+            if self._fail:
+                raise errors.ISApiError(message=content.decode('utf-8'), status_code=status,
+                                        headers=headers)
+            return None
+
+        log.debug(f"[RES] Response[{status}]: {operation}")
+        start = time.perf_counter()
+        resource = utils.parse(content)
+        self._record(operation, status, network_time, parse_time=time.perf_counter() - start,
+                     response_bytes=len(content), attempt=attempt)
+        return resource
+
+    async def close(self):
+        """Closes the session, if it is owned by the client"""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
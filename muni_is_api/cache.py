@@ -0,0 +1,377 @@
+"""
+Response caches for the HttpClient
+
+The cache is keyed by the operation and its normalized params (without the ``klic``),
+the params include the domain and the course (see the ``SCOPE_PARAMS``), so the cache
+can be shared by the clients of several courses.
+Only the read operations are cached, the write operations invalidate the cached
+responses which depend on them.
+"""
+import abc
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from defusedxml.lxml import RestrictedElement, tostring
+
+from typing import Dict, Hashable, NamedTuple, Optional, Tuple, Union
+
+from muni_is_api import utils
+
+log = logging.getLogger(__name__)
+
+READ_OPERATIONS = (
+    'predmet-info',
+    'predmet-seznam',
+    'seminar-seznam',
+    'seminar-cvicici-seznam',
+    'bloky-seznam',
+    'blok-dej-obsah',
+    'terminy-seznam',
+)
+
+# Write operation -> {read operation -> params, which has to match to invalidate the entry}
+INVALIDATES = {
+    'blok-pis-student-obsah': {'blok-dej-obsah': ('zkratka',), 'bloky-seznam': ()},
+    'blok-novy': {'blok-dej-obsah': ('zkratka',), 'bloky-seznam': ()},
+}
+
+# Params which identify the course of the response, the dependent entries are invalidated
+# only for the same course
+SCOPE_PARAMS = ('domain', 'fakulta', 'kod')
+
+DEFAULT_TTL = 60.0
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+
+
+def normalize_params(params: Dict) -> Tuple[Tuple[str, Hashable], ...]:
+    """Normalizes the params, so the same request has always the same key
+    Args:
+        params(Dict): Params of the operation
+
+    Returns(Tuple): Sorted params without the ``klic``
+    """
+    normalized = []
+    for (key, val) in params.items():
+        if key == 'klic':
+            continue
+        if isinstance(val, (list, tuple)):
+            val = tuple(str(item) for item in val)
+        else:
+            val = str(val)
+        normalized.append((key, val))
+    return tuple(sorted(normalized))
+
+
+def _matches(match: Tuple, normalized: Tuple) -> bool:
+    return set(match) <= set(normalized)
+
+
+class BaseCache(abc.ABC):
+    """Interface of the response cache used by the HttpClient"""
+
+    def __init__(self, ttl: Dict[str, float] = None, default_ttl: float = DEFAULT_TTL):
+        """Creates the cache
+        Args:
+            ttl(Dict[str, float]): Time to live in seconds for each operation,
+                ``0`` disables caching of the operation
+            default_ttl(float): Time to live of the operations not present in the ``ttl``
+        """
+        self._ttl = dict(ttl or {})
+        self._default_ttl = default_ttl
+
+    def ttl(self, operation: str) -> float:
+        """Time to live of the operation
+        Args:
+            operation(str): Name of the operation
+
+        Returns(float): Time to live in seconds, ``0`` if the operation is not cached
+        """
+        if operation not in READ_OPERATIONS:
+            return 0
+        return self._ttl.get(operation, self._default_ttl)
+
+    @abc.abstractmethod
+    def get(self, operation: str, params: Dict) -> Optional[RestrictedElement]:
+        """Gets the cached response
+        Args:
+            operation(str): Name of the operation
+            params(Dict): Params of the operation
+
+        Returns(RestrictedElement): Cached response, None if missing or expired
+        """
+
+    @abc.abstractmethod
+    def set(self, operation: str, params: Dict, resource: RestrictedElement):
+        """Stores the response of the read operation,
+        the response of the write operation invalidates the dependent entries
+        Args:
+            operation(str): Name of the operation
+            params(Dict): Params of the operation
+            resource(RestrictedElement): Parsed response
+        """
+
+    @abc.abstractmethod
+    def invalidate(self, operation: str, **params) -> int:
+        """Removes the entries of the operation, which match all of the given params
+        Args:
+            operation(str): Name of the operation
+            **params: Params to match, no params match all entries of the operation
+
+        Returns(int): Number of the removed entries
+        """
+
+    @abc.abstractmethod
+    def clear(self):
+        """Removes all entries"""
+
+    @abc.abstractmethod
+    def stats(self) -> CacheStats:
+        """Snapshot of the cache statistics
+        Returns(CacheStats): Statistics
+        """
+
+    def _invalidate_dependent(self, operation: str, params: Dict) -> int:
+        removed = 0
+        for (dependent, keys) in INVALIDATES.get(operation, {}).items():
+            match = {key: params[key] for key in keys + SCOPE_PARAMS if key in params}
+            removed += self.invalidate(dependent, **match)
+        return removed
+
+
+class MemoryCache(BaseCache):
+    """Thread-safe in-memory cache with the per-operation TTL and the LRU size bound"""
+
+    def __init__(self, max_size: int = 256, **kwargs):
+        """Creates the in-memory cache
+        Args:
+            max_size(int): Maximal number of the entries
+            **kwargs: Options of the BaseCache
+        """
+        super().__init__(**kwargs)
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, operation: str, params: Dict) -> Optional[RestrictedElement]:
+        if not self.ttl(operation):
+            return None
+        key = (operation, normalize_params(params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, operation: str, params: Dict, resource: RestrictedElement):
+        if operation in INVALIDATES:
+            self._invalidate_dependent(operation, params)
+            return
+        ttl = self.ttl(operation)
+        if not ttl or resource is None:
+            return
+        key = (operation, normalize_params(params))
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, resource)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, operation: str, **params) -> int:
+        match = normalize_params(params)
+        with self._lock:
+            keys = [key for key in self._entries
+                    if key[0] == operation and _matches(match, key[1])]
+            for key in keys:
+                del self._entries[key]
+            self._invalidations += len(keys)
+        if keys:
+            log.debug(f"[CACHE] Invalidated {len(keys)} entries of {operation}: {params}")
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(hits=self._hits, misses=self._misses,
+                              evictions=self._evictions, invalidations=self._invalidations,
+                              size=len(self._entries))
+
+
+class SqliteCache(BaseCache):
+    """Persistent cache in the SQLite database, it can be shared by several processes
+
+    The responses are stored as the raw XML bytes. The size of the stored responses
+    is bounded, the least recently used entries are evicted first.
+    """
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            operation TEXT NOT NULL,
+            params TEXT NOT NULL,
+            expires REAL NOT NULL,
+            accessed REAL NOT NULL,
+            size INTEGER NOT NULL,
+            content BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_operation ON responses (operation);
+        CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 256 * 1024 * 1024,
+                 timeout: float = 30.0, **kwargs):
+        """Creates the persistent cache
+        Args:
+            path(Union[str, Path]): Path to the database file
+            max_bytes(int): Maximal size of the stored responses
+            timeout(float): How long to wait for the lock held by the other process
+            **kwargs: Options of the BaseCache
+        """
+        super().__init__(**kwargs)
+        self._path = Path(path)
+        self._max_bytes = max_bytes
+        self._timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        with self._connection() as connection:
+            connection.executescript(self._SCHEMA)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections can not be shared by the threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self._path), timeout=self._timeout)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    def _count(self, name: str, value: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    @staticmethod
+    def _key(operation: str, normalized: Tuple) -> str:
+        return json.dumps([operation, normalized], ensure_ascii=False)
+
+    @staticmethod
+    def _load_params(params: str) -> Tuple:
+        return tuple((key, tuple(val) if isinstance(val, list) else val)
+                     for (key, val) in json.loads(params))
+
+    def get(self, operation: str, params: Dict) -> Optional[RestrictedElement]:
+        if not self.ttl(operation):
+            return None
+        key = self._key(operation, normalize_params(params))
+        now = time.time()
+        with self._connection() as connection:
+            row = connection.execute(
+                'SELECT content FROM responses WHERE key = ? AND expires >= ?',
+                (key, now)).fetchone()
+            if row is not None:
+                connection.execute('UPDATE responses SET accessed = ? WHERE key = ?',
+                                   (now, key))
+        if row is None:
+            self._count('_misses')
+            return None
+        self._count('_hits')
+        return utils.parse(row[0])
+
+    def set(self, operation: str, params: Dict, resource: RestrictedElement):
+        if operation in INVALIDATES:
+            self._invalidate_dependent(operation, params)
+            return
+        ttl = self.ttl(operation)
+        if not ttl or resource is None:
+            return
+        normalized = normalize_params(params)
+        content = tostring(resource, encoding='utf-8')
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(key, operation, params, expires, accessed, size, content) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (self._key(operation, normalized), operation,
+                 json.dumps(normalized, ensure_ascii=False), now + ttl, now,
+                 len(content), content))
+            self._evict(connection, now)
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        connection.execute('DELETE FROM responses WHERE expires < ?', (now,))
+        total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        evicted = 0
+        for (key, size) in connection.execute(
+                'SELECT key, size FROM responses ORDER BY accessed').fetchall():
+            if total <= self._max_bytes:
+                break
+            connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+            evicted += 1
+        self._count('_evictions', evicted)
+
+    def invalidate(self, operation: str, **params) -> int:
+        match = normalize_params(params)
+        with self._connection() as connection:
+            rows = connection.execute('SELECT key, params FROM responses WHERE operation = ?',
+                                      (operation,)).fetchall()
+            keys = [(key,) for (key, stored) in rows
+                    if _matches(match, self._load_params(stored))]
+            connection.executemany('DELETE FROM responses WHERE key = ?', keys)
+        self._count('_invalidations', len(keys))
+        if keys:
+            log.debug(f"[CACHE] Invalidated {len(keys)} entries of {operation}: {params}")
+        return len(keys)
+
+    def clear(self):
+        with self._connection() as connection:
+            connection.execute('DELETE FROM responses')
+
+    def stats(self) -> CacheStats:
+        with self._connection() as connection:
+            size = connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        with self._lock:
+            return CacheStats(hits=self._hits, misses=self._misses,
+                              evictions=self._evictions, invalidations=self._invalidations,
+                              size=size)
+
+    def close(self):
+        """Closes the connection of the current thread"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -1,11 +1,24 @@
+import abc
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from defusedxml.lxml import RestrictedElement
+from requests.utils import requote_uri
 
-from typing import List, Dict
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, NamedTuple, \
+    Optional, Tuple, Union
 
-from muni_is_api import entities, utils
+from muni_is_api import concurrency, entities, errors, planner, records, utils
+from muni_is_api.cache import BaseCache
+from muni_is_api.limiter import AdaptiveLimiter
+from muni_is_api.metrics import Metrics, OperationStats, RequestEvent
+from muni_is_api.retry import RetryPolicy
+from muni_is_api.transport import Transport
+
+if TYPE_CHECKING:
+    from muni_is_api.gradebook import Gradebook
 
 log = logging.getLogger(__name__)
 
@@ -14,22 +27,31 @@ URL: https://is.muni.cz/auth/napoveda/technicka/bloky_api?fakulta=1433;obdobi=70
 """
 
 
-class IsApiClient:
-    def __init__(self, domain: str, token: str, course_code: str, faculty_id: int):
-        """Creates IS API client
-        Args:
-            domain(str): Is domain (ex. is.muni.cz)
-            token(str): Token for the Notes api
-            course_code(str): Course code
-            faculty_id(int): Id of the faculty
-        """
-        self._http = HttpClient(domain, token, course_code, faculty_id)
+NotepadFilter = Union[Iterable[str], Callable[[entities.NoteInfo], bool]]
+StudentFilter = Union[Iterable[int], Callable[[records.Student], bool]]
+
+
+class NotepadSyncResult(NamedTuple):
+    """Result of the ``IsApiClient.sync_notepad``"""
+    written: Dict[int, concurrency.TaskResult]
+    unchanged: List[int]
+
+
+class BaseIsApiClient(abc.ABC):
+    """Operations of the IS Notes API shared by the sync and the async client
+
+    Every operation builds its params and delegates to the ``_create_resource``,
+    which is implemented by the concrete client.
+    """
+
+    def __init__(self, http: 'BaseHttpClient'):
+        self._http = http
         log.debug(f"[INIT] Created client {self.http}")
 
     @property
-    def http(self) -> 'HttpClient':
+    def http(self) -> 'BaseHttpClient':
         """Gets instance of the HTTP Client
-        Returns(HttpClient): Http client instance
+        Returns(BaseHttpClient): Http client instance
         """
         return self._http
 
@@ -64,6 +86,12 @@ class IsApiClient:
         """
         return self.http.faculty
 
+    def stats(self) -> Dict[str, OperationStats]:
+        """Snapshot of the request statistics for each operation, see the ``metrics``
+        Returns(Dict[str, OperationStats]): Statistics for each operation
+        """
+        return self.http.metrics.stats()
+
     def course_info(self) -> entities.CourseInfo:
         """
         Returns(entities.CourseInfo): Course info
@@ -83,6 +111,13 @@ class IsApiClient:
 
         Returns(Resource): Gets an instance of the list of students
         """
+        params = self._course_students_params(registered, terminated, inactive)
+        log.debug(f"[LIST] Get list of students in the course with params: {params}")
+        return self._create_resource('predmet-seznam', params,
+                                     cls=entities.CourseStudents)
+
+    @staticmethod
+    def _course_students_params(registered: bool, terminated: bool, inactive: bool) -> Dict:
         params = {}
 
         if registered:
@@ -93,9 +128,7 @@ class IsApiClient:
 
         if inactive:
             params['vcneaktiv'] = 'a'
-        log.debug(f"[LIST] Get list of students in the course with params: {params}")
-        return self._create_resource('predmet-seznam', params,
-                                     cls=entities.CourseStudents)
+        return params
 
     def seminar_list_students(self, seminars: List[str], terminated: bool = False,
                               inactive: bool = False) -> entities.SeminarStudents:
@@ -140,11 +173,16 @@ class IsApiClient:
 
         Returns(Resource): Resource instance
         """
+        params = self._notepad_content_params(shortcut, ucos)
+        log.debug(f"[READ] Get notepad content with params: {params}")
+        return self._create_resource('blok-dej-obsah', params, cls=entities.NotepadContent)
+
+    @staticmethod
+    def _notepad_content_params(shortcut: str, ucos: List[int] = None) -> Dict:
         params = dict(zkratka=shortcut)
         if ucos:
             params['uco'] = ucos
-        log.debug(f"[READ] Get notepad content with params: {params}")
-        return self._create_resource('blok-dej-obsah', params, cls=entities.NotepadContent)
+        return params
 
     def notepad_list(self) -> entities.NotesList:
         """List of all notepads
@@ -188,6 +226,13 @@ class IsApiClient:
 
         Returns(etree.Element): Parsed XML response
         """
+        params = self._notepad_update_params(shortcut, uco, content, last_change, override)
+        log.info(f"[NOTES] Update notepad with params: {params} ")
+        return self._create_resource('blok-pis-student-obsah', params)
+
+    @staticmethod
+    def _notepad_update_params(shortcut: str, uco: int, content: str,
+                               last_change: Optional[str], override: bool) -> Dict:
         params = dict(
             zkratka=shortcut,
             uco=uco,
@@ -197,9 +242,7 @@ class IsApiClient:
             params['poslzmeneno'] = last_change
         if override:
             params['prepis'] = 'a'
-
-        log.info(f"[NOTES] Update notepad with params: {params} ")
-        return self._create_resource('blok-pis-student-obsah', params)
+        return params
 
     def exams_list(self, terminated: bool = False, inactive: bool = False):
         """Gets a list of exams
@@ -216,18 +259,268 @@ class IsApiClient:
             params['vcneaktiv'] = 'a'
         return self._create_resource('terminy-seznam', params)
 
+    @abc.abstractmethod
+    def _create_resource(self, operation: str, params: Dict = None, cls=entities.Resource):
+        """Invokes the operation and decodes its response
+        Args:
+            operation(str): Name of the operation
+            params(Dict): Params for the operation
+            cls(type): Entity of the response
+
+        Returns: Instance of the ``cls``, an awaitable of it for the async client
+        """
+
+
+class IsApiClient(BaseIsApiClient):
+    def __init__(self, domain: str, token: str, course_code: str, faculty_id: int,
+                 **kwargs):
+        """Creates IS API client
+        Args:
+            domain(str): Is domain (ex. is.muni.cz)
+            token(str): Token for the Notes api
+            course_code(str): Course code
+            faculty_id(int): Id of the faculty
+            **kwargs: Additional options for the HttpClient
+        """
+        super().__init__(HttpClient(domain, token, course_code, faculty_id, **kwargs))
+
+    @property
+    def http(self) -> 'HttpClient':
+        """Gets instance of the HTTP Client
+        Returns(HttpClient): Http client instance
+        """
+        return self._http
+
+    def iter_students(self, registered: bool = False, terminated: bool = False,
+                      inactive: bool = False) -> Iterator[records.Student]:
+        """Streams the students in the course one by one,
+        the response is parsed incrementally, so the memory stays flat for large courses
+
+        Args:
+            registered(bool): Also show the registered students
+            terminated(bool): Also show the students with theirs studies terminated
+            inactive(bool): Also show an inactive students
+
+        Returns(Iterator[records.Student]): Decoded students
+        """
+        params = self._course_students_params(registered, terminated, inactive)
+        log.debug(f"[LIST] Stream students in the course with params: {params}")
+        return self.http.stream('predmet-seznam', 'STUDENT', records.STUDENT, **params)
+
+    def iter_notepad_entries(self, shortcut: str,
+                             ucos: List[int] = None) -> Iterator[records.NotepadEntry]:
+        """Streams the notepad entries one by one,
+        the response is parsed incrementally, so the memory stays flat for large notepads
+
+        Args:
+            shortcut(str): Shortcut name of the notepad
+            ucos(List[int]): List of students' ucos
+
+        Returns(Iterator[records.NotepadEntry]): Decoded notepad entries
+        """
+        params = self._notepad_content_params(shortcut, ucos)
+        log.debug(f"[READ] Stream notepad content with params: {params}")
+        return self.http.stream('blok-dej-obsah', 'STUDENT', records.NOTEPAD_ENTRY, **params)
+
+    def notepad_update_many(self, shortcut: str, contents: Dict[int, str],
+                            override: bool = True, workers: int = 8, rate: float = None,
+                            progress: concurrency.ProgressCallback = None,
+                            last_changes: Dict[int, str] = None
+                            ) -> Dict[int, concurrency.TaskResult]:
+        """Updates notepad content for many students concurrently
+        Failed updates do not stop the batch, they are reported in the results.
+        Transient failures are retried by the retry policy of the ``http`` client
+        after the cell has been checked, the ``attempts`` of the result count the writes.
+
+        Args:
+            shortcut(str): Notepad shortcut identification
+            contents(Dict[int, str]): Content for each UCO
+            override(bool): Overrides the content
+            workers(int): Maximal number of the concurrent requests
+            rate(float): Maximal number of requests per second
+            progress(ProgressCallback): Called as ``progress(done, total, result)``
+            last_changes(Dict[int, str]): Last change (YYYYMMDDHH24MISS) of the cells
+                known to the caller, the IS refuses to write the cells changed since then
+
+        Returns(Dict[int, TaskResult]): Result of the update for each UCO
+        """
+        log.info(f"[NOTES] Update notepad {shortcut} for {len(contents)} students")
+        last_changes = last_changes or {}
+        attempts = {}
+
+        def _update(uco):
+            return self._notepad_update_safely(shortcut, uco, contents[uco],
+                                               last_changes.get(uco), override, attempts)
+
+        results = {result.key: result for result in concurrency.map_concurrently(
+            _update, contents.keys(), workers=workers, rate=rate, progress=progress)}
+        return {uco: results[uco]._replace(attempts=attempts.get(uco, 1)) for uco in contents}
+
+    def _notepad_update_safely(self, shortcut: str, uco: int, content: str,
+                               last_change: Optional[str], override: bool,
+                               attempts: Dict[int, int]) -> Optional[entities.Resource]:
+        """Updates the notepad cell and repeats the failed write by the retry policy
+
+        The failed write may have been applied by the IS, so the cell is read before
+        the write is repeated. The write is not repeated if the cell already has the content,
+        it is refused if the cell has been changed since the ``last_change``.
+        Otherwise it is repeated with the last change of the cell, so the IS refuses it
+        if the cell changes in the meantime.
+
+        Returns(entities.Resource): Response of the write,
+            None if the write has been confirmed by the read
+        """
+        policy = self.http.retry
+        attempt = 1
+        while True:
+            params = self._notepad_update_params(shortcut, uco, content, last_change, override)
+            log.info(f"[NOTES] Update notepad with params: {params} ")
+            try:
+                # This is the only retry loop of the write, the http client sends it once
+                return entities.Resource(
+                    self.http._execute('blok-pis-student-obsah', params, retry=False))
+            except Exception as ex:
+                status = getattr(ex, 'status_code', None)
+                if policy is None or attempt >= policy.max_attempts or \
+                        not policy.retryable(status, ex):
+                    raise
+                delay = policy.delay(attempt, getattr(ex, 'headers', None))
+            log.warning(f"[NOTES] Write of {uco} to {shortcut} has failed, "
+                        f"check and retry in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+            attempts[uco] = attempt
+
+            self.http.invalidate('blok-dej-obsah', zkratka=shortcut)
+            entry = self.notepad_content(shortcut, ucos=[uco]).get(uco)
+            if entry is not None and (entry.content or '') == (content or ''):
+                log.info(f"[NOTES] Write of {uco} to {shortcut} has been applied")
+                return None
+            changed = entry.changed.date if entry is not None else None
+            if last_change is not None and changed != last_change:
+                raise errors.ISApiError(
+                    message=f"Notepad {shortcut} of {uco} has been changed since {last_change}")
+            last_change = changed
+
+    def sync_notepad(self, shortcut: str, desired: Dict[int, str],
+                     **kwargs) -> 'NotepadSyncResult':
+        """Writes only the notepad cells which differ from the desired content
+
+        The current content is fetched first, the changed cells are written with their
+        last change date (``poslzmeneno``), so the concurrent edits are not overwritten.
+
+        Args:
+            shortcut(str): Notepad shortcut identification
+            desired(Dict[int, str]): Desired content for each UCO
+            **kwargs: Options of the ``notepad_update_many`` (workers, rate, progress)
+
+        Returns(NotepadSyncResult): Results of the writes and the unchanged UCOs
+        """
+        self.http.invalidate('blok-dej-obsah', zkratka=shortcut)
+        current = self.notepad_content(shortcut, ucos=list(desired))
+
+        changed = {}
+        last_changes = {}
+        unchanged = []
+        for (uco, content) in desired.items():
+            entry = current.get(uco)
+            current_content = entry.content if entry is not None else None
+            if (current_content or '') == (content or ''):
+                unchanged.append(uco)
+                continue
+            changed[uco] = content
+            if entry is not None and entry.changed.date:
+                last_changes[uco] = entry.changed.date
+
+        log.info(f"[NOTES] Sync notepad {shortcut}: {len(changed)} changed, "
+                 f"{len(unchanged)} unchanged")
+        written = self.notepad_update_many(shortcut, changed, last_changes=last_changes,
+                                           **kwargs) if changed else {}
+        return NotepadSyncResult(written=written, unchanged=unchanged)
+
+    def gradebook(self, notepads: NotepadFilter = None, students: StudentFilter = None,
+                  registered: bool = False, terminated: bool = False, inactive: bool = False,
+                  workers: int = 8) -> 'Gradebook':
+        """Fetches the points of the students in all of the notepads of the course
+
+        The notepad list, the roster and the content of the notepads are fetched concurrently,
+        the content of each notepad is requested as soon as the notepad list has arrived.
+        The roster is not fetched if the students are given by their UCOs and the notepad
+        list is not fetched if the notepads are given by their shortcuts.
+
+        Args:
+            notepads(NotepadFilter): Shortcuts of the notepads or a predicate
+                of the ``entities.NoteInfo``, all of the notepads by default
+            students(StudentFilter): UCOs of the students or a predicate
+                of the ``records.Student``, all of the students in the roster by default
+            registered(bool): Also include the registered students
+            terminated(bool): Also include the students with theirs studies terminated
+            inactive(bool): Also include an inactive students
+            workers(int): Maximal number of the concurrent requests
+
+        Returns(Gradebook): Matrix of the points, the students in the order of the roster
+            (or of the ``students``) and the notepads in the order of the notepad list
+        """
+        # The gradebook needs the scoring, which imports the numpy only when it is used
+        from muni_is_api.gradebook import Gradebook
+
+        ucos = None if students is None or callable(students) else [int(uco) for uco in students]
+        shortcuts = None if notepads is None or callable(notepads) else list(notepads)
+        contents = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            roster = executor.submit(self.course_list_students, registered, terminated,
+                                     inactive) if ucos is None else None
+            if shortcuts is None:
+                notes = self.notepad_list().notes
+                shortcuts = [note.shortcut for note in notes
+                             if notepads is None or notepads(note)]
+            for shortcut in shortcuts:
+                contents[shortcut] = executor.submit(self.notepad_content, shortcut, ucos)
+
+            if roster is not None:
+                rows = roster.result().decode().students
+                ucos = [student.uco for student in rows
+                        if students is None or students(student)]
+            log.info(f"[GRADEBOOK] Fetching {len(shortcuts)} notepads "
+                     f"for {len(ucos)} students")
+            book = Gradebook(ucos, shortcuts)
+            for (shortcut, future) in contents.items():
+                book.fill(shortcut, future.result())
+        return book
+
+    def prepare(self, operation: str, cls: type = entities.Resource) -> 'PreparedOperation':
+        """Prepares the operation for the repeated calls, for example in the hot loops
+        The authentication and course params are encoded only once, every call encodes
+        only its own params and returns the response decoded as the ``cls``.
+
+        Example:
+            update = client.prepare('blok-pis-student-obsah')
+            for (uco, content) in contents.items():
+                update(zkratka='hw01', uco=uco, obsah=content, prepis='a')
+
+        Args:
+            operation(str): Name of the operation
+            cls(type): Entity of the response, for example ``entities.NotepadContent``
+
+        Returns(PreparedOperation): Callable with the params of the operation
+        """
+        return self.http.prepare(operation, cls=cls)
+
     def _create_resource(self, operation: str, params: Dict = None, cls=entities.Resource):
         params = params or {}
         resp = self.http.operation(operation=operation, **params)
         return cls(resp)
 
 
-class HttpClient:
-    __slots__ = ('_session', '__fail', '__faculty_id',
-                 '__course', '__token', '__domain')
+class BaseHttpClient:
+    __slots__ = ('_fail', '_max_url_length', '_cache', '_metrics', '__faculty_id', '__course',
+                 '__token', '__domain', '__scheme')
 
     def __init__(self, domain: str, token: str, course_code: str,
-                 faculty_id: int, fail: bool = True):
+                 faculty_id: int, fail: bool = True, scheme: str = 'https',
+                 max_url_length: int = planner.DEFAULT_MAX_URL_LENGTH,
+                 cache: BaseCache = None, metrics: Metrics = None):
         """Creates HTTP Client wrapper
         Args:
             domain(str): Is domain (ex. is.muni.cz)
@@ -235,19 +528,20 @@ class HttpClient:
             course_code(str): Course code
             faculty_id(int): Id of the faculty
             fail(bool): Throw an exception if the request has not been successful
+            scheme(str): Url scheme, ``http`` is useful only for a local stand-in server
+            max_url_length(int): Longer requests are split into several requests
+            cache(BaseCache): Cache of the responses, for example ``cache.MemoryCache()``
+            metrics(Metrics): Instrumentation of the requests, it can be shared by the clients
         """
         self.__domain = domain
         self.__token = token
         self.__course = course_code
         self.__faculty_id = faculty_id
-        self.__fail = fail
-        self._session = None
-
-    @property
-    def session(self) -> requests.Session:
-        if self._session is None:
-            self._session = requests.Session()
-        return self._session
+        self.__scheme = scheme
+        self._fail = fail
+        self._max_url_length = max_url_length
+        self._cache = cache
+        self._metrics = metrics if metrics is not None else Metrics()
 
     @property
     def api_url(self) -> str:
@@ -255,7 +549,7 @@ class HttpClient:
 
         Returns(str): Full url
         """
-        return f"https://{self.domain}/export/pb_blok_api"
+        return f"{self.__scheme}://{self.domain}/export/pb_blok_api"
 
     @property
     def domain(self) -> str:
@@ -265,6 +559,20 @@ class HttpClient:
         """
         return self.__domain
 
+    @property
+    def metrics(self) -> Metrics:
+        """Instrumentation of the requests
+        Returns(Metrics): Metrics instance
+        """
+        return self._metrics
+
+    @property
+    def cache(self) -> Optional[BaseCache]:
+        """Cache of the responses
+        Returns(BaseCache): Cache instance, None if the caching is disabled
+        """
+        return self._cache
+
     @property
     def course(self) -> str:
         """Course code name
@@ -280,6 +588,113 @@ class HttpClient:
         """
         return self.__faculty_id
 
+    def _operation_params(self, operation: str, params: Dict) -> Dict:
+        """Merges the operation params with the authentication and course params
+        Args:
+            operation(str): Name of the operation
+            params(Dict): Params for the operation
+
+        Returns(Dict): Params of the request
+        """
+        prepared = dict(klic=self.__token, fakulta=self.faculty, kod=self.course)
+        return {**params, **prepared, "operace": operation}
+
+    def _cache_params(self, operation: str, params: Dict) -> Dict:
+        """Params of the cache entry, they identify the domain and the course as well
+        Args:
+            operation(str): Name of the operation
+            params(Dict): Params for the operation
+
+        Returns(Dict): Params of the request and the domain
+        """
+        return {**self._operation_params(operation, params), 'domain': self.domain}
+
+    def invalidate(self, operation: str, **params) -> int:
+        """Removes the cached responses of the operation for the course of the client
+        Args:
+            operation(str): Name of the operation
+            **params: Params to match, see the ``BaseCache.invalidate``
+
+        Returns(int): Number of the removed entries
+        """
+        if self._cache is None:
+            return 0
+        return self._cache.invalidate(operation, **self._cache_params(operation, params))
+
+    def _record(self, operation: str, status: Optional[int], network_time: float,
+                parse_time: float = 0.0, response_bytes: int = 0, error: Exception = None,
+                attempt: int = 1):
+        self._metrics.record(RequestEvent(
+            operation=operation, status=status, network_time=network_time,
+            parse_time=parse_time, response_bytes=response_bytes, error=error,
+            attempt=attempt))
+
+    def _plan(self, operation: str, params: Dict) -> List[Dict]:
+        """Plans the requests for the operation, see the ``planner.plan``
+        Args:
+            operation(str): Name of the operation
+            params(Dict): Params for the operation
+
+        Returns(List[Dict]): Params for each of the requests
+        """
+        return planner.plan(self.api_url, self._operation_params(operation, params),
+                            max_length=self._max_url_length)
+
+    def __str__(self):
+        return f"[{self.domain}]: (FAC={self.faculty}, COURSE={self.course})"
+
+
+class HttpClient(BaseHttpClient):
+    __slots__ = ('_transport', '_workers', '_limiter', '_retry', '_template')
+
+    def __init__(self, domain: str, token: str, course_code: str,
+                 faculty_id: int, workers: int = 4, transport: Transport = None,
+                 limiter: AdaptiveLimiter = None, retry: RetryPolicy = None, **kwargs):
+        """Creates HTTP Client wrapper
+        Args:
+            domain(str): Is domain (ex. is.muni.cz)
+            token(str): Token for the Notes api
+            course_code(str): Course code
+            faculty_id(int): Id of the faculty
+            workers(int): Maximal number of the concurrent requests of the split operation
+            transport(Transport): Connection pool and timeouts, it can be shared by the clients
+            limiter(AdaptiveLimiter): Rate and concurrency limiter of the requests,
+                see the ``AdaptiveLimiter.for_domain``
+            retry(RetryPolicy): Retry policy of the failed requests, None disables retries
+            **kwargs: Options of the BaseHttpClient
+        """
+        super().__init__(domain, token, course_code, faculty_id, **kwargs)
+        self._transport = transport if transport is not None else Transport()
+        self._workers = workers
+        self._limiter = limiter
+        self._retry = retry
+        self._template = None
+
+    @property
+    def transport(self) -> Transport:
+        """Transport configuration of the client
+        Returns(Transport): Transport instance
+        """
+        return self._transport
+
+    @property
+    def limiter(self) -> Optional[AdaptiveLimiter]:
+        """Limiter of the requests
+        Returns(AdaptiveLimiter): Limiter instance, None if the requests are not limited
+        """
+        return self._limiter
+
+    @property
+    def retry(self) -> Optional[RetryPolicy]:
+        """Retry policy of the failed requests
+        Returns(RetryPolicy): Policy instance, None if the requests are not retried
+        """
+        return self._retry
+
+    @property
+    def session(self) -> requests.Session:
+        return self._transport.session
+
     def operation(self, operation, **params) -> RestrictedElement:
         """Invokes operation of the API
         Args:
@@ -289,18 +704,245 @@ class HttpClient:
         Returns: Resource instance
 
         """
+        return self._execute(operation, params)
 
-        prepared = dict(klic=self.__token, fakulta=self.faculty, kod=self.course)
-        response = utils.make_get_request(
-            session=self.session,
-            url=self.api_url,
-            params={**params, **prepared, "operace": operation},
-            fail=self.__fail
-        )
+    def prepare(self, operation: str, cls: type = None) -> 'PreparedOperation':
+        """Prepares the operation for the repeated calls, see the ``IsApiClient.prepare``
+        Args:
+            operation(str): Name of the operation
+            cls(type): Entity of the response, None returns the parsed response
+
+        Returns(PreparedOperation): Callable with the params of the operation
+        """
+        static = self._operation_params(operation, {})
+        free = self._max_url_length - len(utils.build_url(self.api_url, static))
+        log.debug(f"[PREPARE] Prepared operation {operation}")
+        prefix = requote_uri(utils.params_serialize(static))
+        return PreparedOperation(self, operation, prefix, free, cls, prepared=static)
+
+    def _execute(self, operation: str, params: Dict, query: str = None,
+                 retry: bool = True) -> RestrictedElement:
+        """Invokes operation of the API
+        Args:
+            operation(str): Name of the operation
+            params(Dict): Params for the operation
+            query(str): Serialized and quoted params of the single request,
+                None plans the requests
+            retry(bool): Repeat the failed requests by the retry policy,
+                False when the caller repeats them itself
+
+        Returns(RestrictedElement): Parsed response
+        """
+        if self._cache is not None:
+            key = self._cache_params(operation, params)
+            cached = self._cache.get(operation, key)
+            if cached is not None:
+                log.debug(f"[CACHE] Hit: {operation}")
+                return cached
+
+        planned = [query] if query is not None else self._plan(operation, params)
+        if len(planned) == 1:
+            resource = self._request(operation, planned[0], retry=retry)
+        else:
+            results = concurrency.map_concurrently(
+                lambda index: self._request(operation, planned[index], retry=retry),
+                range(len(planned)),
+                workers=self._workers)
+            results = sorted(results, key=lambda result: result.key)
+            for result in results:
+                if not result.ok:
+                    raise result.error
+            resource = planner.merge([result.value for result in results])
 
-        resource = utils.serialize(response=response)
         log.debug(f"[SERIAL] Serialized response: {resource}")
+        if self._cache is not None:
+            self._cache.set(operation, key, resource)
         return resource
 
-    def __str__(self):
-        return f"[{self.domain}]: (FAC={self.faculty}, COURSE={self.course})"
+    def stream(self, operation: str, tag: str, schema: records.Schema,
+               **params) -> Iterator:
+        """Invokes operation of the API and decodes the elements while the response is read
+        The responses are not cached; split requests (see the ``planner``) are streamed
+        one after another.
+
+        Args:
+            operation(str): Name of the operation
+            tag(str): Tag of the streamed elements
+            schema(records.Schema): Schema of the streamed elements
+            **params: Optional params for the operation
+
+        Returns(Iterator): Decoded records
+        """
+        for planned in self._plan(operation, params):
+            response, network_time, attempt = self._send(operation, planned, stream=True)
+            start = time.perf_counter()
+            try:
+                if not response.ok:
+                    self._record(operation, response.status_code, network_time,
+                                 attempt=attempt)
+                    return
+                response.raw.decode_content = True
+                try:
+                    for element in utils.iterparse(response.raw, tag=tag):
+                        yield schema.decode(element)
+                finally:
+                    # The body is read while parsing, so the parse time includes the transfer;
+                    # the slot of the limiter has been released when the headers arrived, a
+                    # suspended stream would block the other requests of the loop otherwise
+                    self._record(operation, response.status_code, network_time,
+                                 parse_time=time.perf_counter() - start,
+                                 response_bytes=response.raw.tell(), attempt=attempt)
+            finally:
+                response.close()
+
+    def _send(self, operation: str, params: Union[Dict, str], stream: bool = False,
+              retry: bool = True) -> Tuple[requests.Response, float, int]:
+        """Sends the request and repeats it by the retry policy
+        Args:
+            operation(str): Name of the operation
+            params(Union[Dict, str]): Params of the request or its serialized and quoted query
+            stream(bool): Do not read the body of the response
+            retry(bool): Repeat the failed request by the retry policy
+
+        Returns(Tuple): Response, its network time and the number of the attempts
+        """
+        policy = self._retry if retry else None
+        attempt = 1
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self._send_once(params, stream=stream)
+            except Exception as ex:
+                status = getattr(ex, 'status_code', None)
+                self._record(operation, status, time.perf_counter() - start, error=ex,
+                             attempt=attempt)
+                if policy is None or not policy.should_retry(operation, attempt, status, ex):
+                    raise
+                delay = policy.delay(attempt, getattr(ex, 'headers', None))
+            else:
+                network_time = time.perf_counter() - start
+                if response.ok or policy is None or \
+                        not policy.should_retry(operation, attempt, response.status_code):
+                    return response, network_time, attempt
+                self._record(operation, response.status_code, network_time, attempt=attempt)
+                delay = policy.delay(attempt, response.headers)
+                response.close()
+            log.warning(f"[RETRY] Attempt {attempt} of {operation} has failed, "
+                        f"retry in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+
+    def _send_once(self, params: Union[Dict, str], stream: bool = False) -> requests.Response:
+        """Sends the request in a slot of the limiter
+        The slot is released when the headers arrive, the body of a streamed response
+        is read outside of the limiter.
+
+        Args:
+            params(Union[Dict, str]): Params of the request or its serialized and quoted query
+            stream(bool): Do not read the body of the response
+
+        Returns(requests.Response): Response of the request
+        """
+        if self._limiter is not None:
+            self._limiter.acquire()
+        start = time.perf_counter()
+        status, error = None, None
+        try:
+            if isinstance(params, str):
+                response = self._get_template().send(
+                    params, fail=self._fail, stream=stream, timeout=self._transport.timeout)
+            else:
+                response = utils.make_get_request(
+                    session=self.session,
+                    url=self.api_url,
+                    params=params,
+                    fail=self._fail,
+                    stream=stream,
+                    timeout=self._transport.timeout
+                )
+            status = response.status_code
+            return response
+        except Exception as ex:
+            status, error = getattr(ex, 'status_code', None), ex
+            raise
+        finally:
+            if self._limiter is not None:
+                self._limiter.release(time.perf_counter() - start, status, error)
+
+    def _get_template(self) -> utils.GetTemplate:
+        """Request template of the api url for the prepared operations
+        Returns(GetTemplate): Template for the current session of the transport
+        """
+        session = self.session
+        template = self._template
+        if template is None or template.session is not session:
+            template = self._template = utils.GetTemplate(session, self.api_url)
+        return template
+
+    def _request(self, operation: str, params: Union[Dict, str],
+                 retry: bool = True) -> RestrictedElement:
+        response, network_time, attempt = self._send(operation, params, retry=retry)
+        start = time.perf_counter()
+        resource = utils.serialize(response=response)
+        self._record(operation, response.status_code, network_time,
+                     parse_time=time.perf_counter() - start,
+                     response_bytes=len(response.content), attempt=attempt)
+        return resource
+
+
+class PreparedOperation:
+    """Operation of the API with the authentication and course params encoded in advance
+    It is created by the ``IsApiClient.prepare``, the calls behave as the ``HttpClient.operation``
+    including the cache, the retries and the metrics. The requests are sent by the request
+    template of the client (see the ``utils.GetTemplate``), which is prepared once per session.
+    """
+    __slots__ = ('_http', '_operation', '_prefix', '_free', '_split', '_cls', '_prepared')
+
+    def __init__(self, http: HttpClient, operation: str, prefix: str, free: int,
+                 cls: type = None, prepared: Iterable[str] = ()):
+        """Creates the prepared operation
+        Args:
+            http(HttpClient): Client of the requests
+            operation(str): Name of the operation
+            prefix(str): Serialized and quoted authentication, course and operation params
+            free(int): Maximal quoted length of the other params in the single request url
+            cls(type): Entity of the response, None returns the parsed response
+            prepared(Iterable[str]): Names of the params encoded in the prefix
+        """
+        self._http = http
+        self._operation = operation
+        self._prefix = prefix
+        self._free = free
+        self._split = planner.SPLITTABLE_PARAMS.get(operation)
+        self._cls = cls
+        self._prepared = frozenset(prepared)
+
+    @property
+    def operation(self) -> str:
+        """Name of the operation
+        Returns(str): Operation name
+        """
+        return self._operation
+
+    def __call__(self, **params):
+        """Invokes the operation
+        Args:
+            **params: Params of the operation, the prepared params must not be repeated
+
+        Returns: Instance of the ``cls``, the parsed response if the ``cls`` is None
+        """
+        if not self._prepared.isdisjoint(params):
+            repeated = ', '.join(sorted(self._prepared.intersection(params)))
+            raise ValueError(f"The prepared params of {self._operation} are repeated: {repeated}")
+        quoted = requote_uri(utils.params_serialize(params))
+        values = params.get(self._split) if self._split is not None else None
+        if isinstance(values, (list, tuple)) and len(values) > 1 and len(quoted) > self._free:
+            # The planner splits the request, the same as the not prepared operation does
+            query = None
+        else:
+            query = self._prefix + quoted
+        resource = self._http._execute(self._operation, params, query)
+        return resource if self._cls is None else self._cls(resource)
+
+    def __repr__(self):
+        return f"PreparedOperation({self._operation}, {self._http})"
@@ -0,0 +1,86 @@
+"""
+Helpers for running the blocking API calls concurrently on a worker pool
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from typing import Any, Callable, Hashable, Iterable, Iterator, NamedTuple, Optional
+
+log = logging.getLogger(__name__)
+
+
+class TaskResult(NamedTuple):
+    """Result of the one task run on the worker pool, ``attempts`` counts the repeated calls"""
+    key: Hashable
+    value: Any = None
+    error: Optional[Exception] = None
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+ProgressCallback = Callable[[int, int, TaskResult], None]
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces the calls to at most ``rate`` per second"""
+
+    def __init__(self, rate: float = None):
+        """Creates the rate limiter
+        Args:
+            rate(float): Maximal number of calls per second, ``None`` means unlimited
+        """
+        self._interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until the next call is allowed"""
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def map_concurrently(func: Callable[[Hashable], Any], keys: Iterable[Hashable],
+                     workers: int = 8, rate: float = None,
+                     progress: ProgressCallback = None) -> Iterator[TaskResult]:
+    """Calls the ``func`` for every key on the worker pool
+    Failure of one call does not stop the others, it is reported in its result.
+
+    Args:
+        func(Callable): Function called with the key
+        keys(Iterable): Keys to process
+        workers(int): Maximal number of the concurrent calls
+        rate(float): Maximal number of calls per second
+        progress(ProgressCallback): Called as ``progress(done, total, result)``
+            after each finished call
+
+    Returns(Iterator[TaskResult]): Results in the order of completion
+    """
+    keys = list(keys)
+    limiter = RateLimiter(rate)
+
+    def _task(key) -> TaskResult:
+        limiter.acquire()
+        try:
+            return TaskResult(key, value=func(key))
+        except Exception as ex:
+            log.warning(f"[TASK] Failed for {key}: {ex}")
+            return TaskResult(key, error=ex)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(_task, key) for key in keys]
+        for (done, future) in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            if progress is not None:
+                progress(done, len(keys), result)
+            yield result
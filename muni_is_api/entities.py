@@ -1,15 +1,23 @@
+import abc
 import logging
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
 
 from defusedxml.lxml import tostring, RestrictedElement
 
+from muni_is_api import export, records
+from muni_is_api.log_config import TRACE_LOG_LVL
+
 log = logging.getLogger(__name__)
 
 
 class Resource:
+    # Schema for the one-pass decoder, see the ``decode``
+    SCHEMA: Optional[records.Schema] = None
+
     def __init__(self, content: RestrictedElement, base_selector=""):
         self._content = content
         self._base_selector = base_selector
+        self._cache = {}
 
     @property
     def root(self) -> RestrictedElement:
@@ -22,9 +30,9 @@ class Resource:
 
     def __getitem__(self, item) -> RestrictedElement:
         selector = self._base_selector + item
-        log.trace(f"XPATH SELECTOR \"{selector}]\"")
         result = self.root.xpath(selector)
-        log.trace(f"XPATH RESULT \"{selector}]\": {result}")
+        if log.isEnabledFor(TRACE_LOG_LVL):
+            log.log(TRACE_LOG_LVL, f"XPATH RESULT \"{selector}]\": {result}")
         return result
 
     def __call__(self, item: str, default=None) -> Optional[str]:
@@ -34,14 +42,41 @@ class Resource:
         result = "".join(result)
         return result
 
+    @property
+    def element(self) -> Optional[RestrictedElement]:
+        """Element of the resource selected by the base selector
+        Returns(RestrictedElement): Element, None if it does not exist
+        """
+        if self.root is None:
+            return None
+        selector = self._base_selector.rstrip('/')
+        if not selector:
+            return self.root
+        result = self.root.xpath(selector)
+        return result[0] if result else None
+
+    def decode(self):
+        """Decodes the whole resource in one pass into the compact record
+        (see the ``records`` module), all values are converted up front
+
+        Returns: Record instance, None if the resource is empty;
+            raises the ``NotImplementedError`` for the resources without the schema
+        """
+        if self.SCHEMA is None:
+            raise NotImplementedError(f"No schema for the {self.__class__.__name__}")
+        return self.SCHEMA.decode(self.element)
+
     def _collection(self, selector: str, cls: type) -> List:
-        result = []
-        selector = f"{self._base_selector}{selector}"
-        for (index, _) in enumerate(self.root.xpath(selector)):
-            selector_inner = f"{selector}[{index + 1}]/"
-            cls_instance = self._cls_init(cls=cls, selector=selector_inner)
-            result.append(cls_instance)
-        return result
+        # Items are bound to their own element with the relative selectors,
+        # so the reads do not re-walk the whole document
+        return self._cached((selector, cls), lambda: [
+            cls(element, base_selector="") for element in self[selector]
+        ])
+
+    def _cached(self, key, factory: Callable):
+        if key not in self._cache:
+            self._cache[key] = factory()
+        return self._cache[key]
 
     def _cls_init(self, cls: type, selector=None):
         selector = selector or self._base_selector
@@ -54,7 +89,43 @@ class Resource:
         return int(self(item, default=default))
 
 
+class UcoIndexed(Resource, abc.ABC):
+    """Resource with the students indexed by UCO, the index is built only once"""
+
+    @abc.abstractmethod
+    def _indexed(self) -> List:
+        """Students to index
+        Returns(List): Student resources in the document order
+        """
+
+    def by_uco(self) -> Dict[int, Resource]:
+        """Students by UCO, the first occurrence wins
+        Returns(Dict[int, Resource]): Index of the students
+        """
+        def _build():
+            index = {}
+            for student in self._indexed():
+                index.setdefault(student.uco, student)
+            return index
+        return self._cached('by_uco', _build)
+
+    def get(self, uco: int, default=None) -> Optional[Resource]:
+        """Gets the student by UCO
+        Args:
+            uco(int): UCO of the student
+            default: Returned when the student is not present
+
+        Returns(Resource): Student
+        """
+        return self.by_uco().get(int(uco), default)
+
+    def __contains__(self, uco) -> bool:
+        return int(uco) in self.by_uco()
+
+
 class ChangedSub(Resource):
+    SCHEMA = records.CHANGED
+
     @property
     def person(self) -> int:
         return int(self('ZMENIL'))
@@ -65,6 +136,8 @@ class ChangedSub(Resource):
 
 
 class Seminar(Resource):
+    SCHEMA = records.SEMINAR
+
     class StudentsSub(Resource):
         @property
         def max(self) -> int:
@@ -113,6 +186,8 @@ class Seminar(Resource):
 
 
 class AbstractPerson(Resource):
+    SCHEMA = records.PERSON
+
     @property
     def first_name(self) -> str:
         return self('JMENO')
@@ -131,12 +206,16 @@ class AbstractPerson(Resource):
 
 
 class Teacher(AbstractPerson):
+    SCHEMA = records.TEACHER
+
     @property
     def role(self) -> str:
         return self('ROLE')
 
 
 class CourseInfo(Resource):
+    SCHEMA = records.COURSE_INFO
+
     def __init__(self, content: RestrictedElement,
                  base_selector="/PREDMET_INFO/"):
         super().__init__(content, base_selector=base_selector)
@@ -198,12 +277,17 @@ class CourseInfo(Resource):
             )
 
 
-class NotepadContent(Resource):
+class NotepadContent(UcoIndexed, export.Tabular):
+    SCHEMA = records.NOTEPAD_CONTENT
+    COLUMNS = export.NOTEPAD_COLUMNS
+
     def __init__(self, content: RestrictedElement,
                  base_selector="/BLOKY_OBSAH/"):
         super().__init__(content, base_selector=base_selector)
 
     class StudentSub(Resource):
+        SCHEMA = records.NOTEPAD_ENTRY
+
         @property
         def content(self) -> str:
             return self('OBSAH')
@@ -223,8 +307,13 @@ class NotepadContent(Resource):
                 cls=NotepadContent.StudentSub
             )
 
+    def _indexed(self) -> List:
+        return self.students
+
 
 class StudentSub(AbstractPerson):
+    SCHEMA = records.STUDENT
+
     @property
     def study_status(self):
         return self('STAV_STUDIA')
@@ -242,7 +331,10 @@ class StudentSub(AbstractPerson):
         return self('STUDENT_NEMA_SEMINAR', '0') != '1'
 
 
-class CourseStudents(Resource):
+class CourseStudents(UcoIndexed, export.Tabular):
+    SCHEMA = records.COURSE_STUDENTS
+    COLUMNS = export.STUDENT_COLUMNS
+
     def __init__(self, content: RestrictedElement,
                  base_selector="/PREDMET_STUDENTI_INFO/"):
         super().__init__(content, base_selector=base_selector)
@@ -251,6 +343,9 @@ class CourseStudents(Resource):
     def students(self) -> List[StudentSub]:
         return self._collection('STUDENT', StudentSub)
 
+    def _indexed(self) -> List:
+        return self.students
+
 
 class SeminarShared(Resource):
     @property
@@ -263,6 +358,8 @@ class SeminarShared(Resource):
 
 
 class SeminarTeachers(Resource):
+    SCHEMA = records.SEMINAR_TEACHERS
+
     def __init__(self, content: RestrictedElement,
                  base_selector="/SEMINAR_CVICICI_INFO/"):
         super().__init__(content, base_selector=base_selector)
@@ -272,12 +369,16 @@ class SeminarTeachers(Resource):
         return self._collection('SEMINAR', SeminarTeachers.SeminarSub)
 
     class SeminarSub(SeminarShared):
+        SCHEMA = records.TEACHERS_SEMINAR
+
         @property
         def teachers(self) -> List['StudentSub']:
             return self._collection('CVICICI', Teacher)
 
 
-class SeminarStudents(Resource):
+class SeminarStudents(UcoIndexed):
+    SCHEMA = records.SEMINAR_STUDENTS
+
     def __init__(self, content: RestrictedElement,
                  base_selector="/SEMINAR_STUDENTI_INFO/"):
         super().__init__(content, base_selector=base_selector)
@@ -286,13 +387,39 @@ class SeminarStudents(Resource):
     def seminars(self) -> List['SeminarStudents.SeminarSub']:
         return self._collection('SEMINAR', SeminarStudents.SeminarSub)
 
-    class SeminarSub(SeminarShared):
+    def seminar_of(self, uco: int) -> Optional['SeminarStudents.SeminarSub']:
+        """Gets the (first) seminar of the student
+        Args:
+            uco(int): UCO of the student
+
+        Returns(SeminarStudents.SeminarSub): Seminar, None if the student is not present
+        """
+        def _build():
+            index = {}
+            for seminar in self.seminars:
+                for student in seminar.students:
+                    index.setdefault(student.uco, seminar)
+            return index
+        return self._cached('seminar_by_uco', _build).get(int(uco))
+
+    def _indexed(self) -> List:
+        return [student for seminar in self.seminars for student in seminar.students]
+
+    class SeminarSub(SeminarShared, UcoIndexed, export.Tabular):
+        SCHEMA = records.STUDENTS_SEMINAR
+        COLUMNS = export.STUDENT_COLUMNS
+
         @property
         def students(self) -> List['StudentSub']:
             return self._collection('STUDENT', StudentSub)
 
+        def _indexed(self) -> List:
+            return self.students
+
 
 class NoteInfo(Resource):
+    SCHEMA = records.NOTE
+
     @property
     def id(self) -> int:
         return int(self('BLOK_ID'))
@@ -323,6 +450,8 @@ class NoteInfo(Resource):
 
 
 class NotesList(Resource):
+    SCHEMA = records.NOTES_LIST
+
     def __init__(self, content: RestrictedElement,
                  base_selector="/POZN_BLOKY_INFO/"):
         super().__init__(content, base_selector=base_selector)
@@ -339,10 +468,11 @@ class Exams(Resource):
 
 
 class NodeMetadata(Resource):
+    SCHEMA = records.NODE_METADATA
+
     def __init__(self, content: RestrictedElement,
                  base_selector="/fmgr/uzel/"):
         super().__init__(content, base_selector=base_selector)
-        self._subnodes = None
 
     @property
     def name(self) -> str:
@@ -403,9 +533,7 @@ class NodeMetadata(Resource):
 
     @property
     def subnodes(self) -> List['NodeMetadata']:
-        if self._subnodes is None:
-            self._subnodes = self._collection(
-                    selector='poduzly/poduzel',
-                    cls=NodeMetadata
-                )
-        return self._subnodes
+        return self._collection(
+                selector='poduzly/poduzel',
+                cls=NodeMetadata
+            )
@@ -1,12 +1,23 @@
 class ISApiError(Exception):
-    def __init__(self, message, *args, **kwargs):
+    def __init__(self, message, *args, status_code: int = None, headers=None, **kwargs):
         super(ISApiError, self).__init__(*args, **kwargs)
         self._message = message
+        self._status_code = status_code
+        self._headers = headers
 
     @property
     def message(self) -> str:
         return self._message
 
+    @property
+    def status_code(self) -> int:
+        return self._status_code
+
+    @property
+    def headers(self):
+        """Headers of the failed response, used for the ``Retry-After``"""
+        return self._headers
+
     def what(self) -> str:
         return f"API Error [{self.__class__.__name__}]: {self.message}"
 
@@ -0,0 +1,183 @@
+"""
+Columnar export of the rosters and notepads
+
+The rows are decoded by the record schemas (see the ``records`` module) and the fields
+of the records are collected into columns. The columns can be written to CSV
+or converted to the Arrow table or the pandas DataFrame (optional dependencies,
+``pip install muni-is-api[arrow]`` or ``muni-is-api[dataframe]``).
+
+Example:
+    roster = client.course_list_students()
+    roster.to_csv('students.csv')
+    frame = client.notepad_content('hw01').to_dataframe()
+"""
+import csv
+from pathlib import Path
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Sequence, TextIO, Tuple, Union
+
+from muni_is_api import records
+
+Table = Dict[str, List]
+
+
+class Column(NamedTuple):
+    """Column filled from the field of the record, the dotted path reads the groups"""
+    name: str
+    path: str
+
+
+def schema_columns(schema: records.Schema, **paths: str) -> Tuple[Column, ...]:
+    """Columns of the record fields
+    Args:
+        schema(records.Schema): Schema of the rows
+        **paths: Dotted path of the field (``changed.date``) for each column name,
+            all the fields outside the groups and the collections by default
+
+    Returns(Tuple[Column, ...]): Columns in the order of the paths
+    """
+    fields = _schema_fields(schema)
+    if not paths:
+        paths = {path: path for path in fields if '.' not in path}
+    for path in paths.values():
+        if path not in fields:
+            raise KeyError(f"No field {path} in the {schema.record.__name__}")
+    return tuple(Column(name, path) for (name, path) in paths.items())
+
+
+def _schema_fields(schema: records.Schema, prefix: str = '') -> Dict[str, records.Field]:
+    fields = {}
+    for (name, member) in zip(schema.record._fields, schema.members):
+        if isinstance(member, records.Field):
+            fields[prefix + name] = member
+        elif isinstance(member, records.Group):
+            fields.update(_schema_fields(member.schema, f"{prefix}{name}."))
+    return fields
+
+
+STUDENT_COLUMNS = schema_columns(records.STUDENT)
+
+NOTEPAD_COLUMNS = schema_columns(records.NOTEPAD_ENTRY, uco='uco', content='content',
+                                 changed='changed.date', changed_by='changed.person')
+
+
+def _flatten(record: tuple, prefix: str = '') -> Dict[str, Any]:
+    values = {}
+    for (name, value) in record._asdict().items():
+        if isinstance(value, tuple) and hasattr(value, '_asdict'):
+            values.update(_flatten(value, f"{prefix}{name}."))
+        else:
+            values[prefix + name] = value
+    return values
+
+
+def extract(rows: Iterable[tuple], columns: Sequence[Column]) -> Table:
+    """Collects the columns from the decoded rows
+    Args:
+        rows(Iterable[tuple]): Records of the rows, see the ``Schema.decode``
+        columns(Sequence[Column]): Columns to collect
+
+    Returns(Table): Values of each column, in the order of the rows
+    """
+    paths = [column.path for column in columns]
+    table_rows = []
+    for row in rows:
+        values = _flatten(row)
+        table_rows.append([values[path] for path in paths])
+    values = list(zip(*table_rows)) if table_rows else [()] * len(columns)
+    return {column.name: list(column_values)
+            for (column, column_values) in zip(columns, values)}
+
+
+def to_records(table: Table) -> List[Dict]:
+    """Converts the columns into the rows
+    Args:
+        table(Table): Columns
+
+    Returns(List[Dict]): Row for each student
+    """
+    names = list(table)
+    return [dict(zip(names, row)) for row in zip(*table.values())]
+
+
+def to_csv(table: Table, target: Union[str, Path, TextIO]):
+    """Writes the columns as CSV with the header
+    Args:
+        table(Table): Columns
+        target(Union[str, Path, TextIO]): Path or the opened text file
+    """
+    if isinstance(target, (str, Path)):
+        with open(str(target), 'w', encoding='utf-8', newline='') as fd:
+            return to_csv(table, fd)
+    writer = csv.writer(target)
+    writer.writerow(list(table))
+    writer.writerows(zip(*table.values()))
+
+
+def to_arrow(table: Table):
+    """Converts the columns into the Arrow table, requires the ``pyarrow``
+    Args:
+        table(Table): Columns
+
+    Returns(pyarrow.Table): Arrow table
+    """
+    try:
+        import pyarrow
+    except ImportError as ex:
+        raise ImportError("to_arrow requires the pyarrow: pip install muni-is-api[arrow]") \
+            from ex
+    return pyarrow.table(table)
+
+
+def to_dataframe(table: Table):
+    """Converts the columns into the DataFrame, requires the ``pandas``
+    Args:
+        table(Table): Columns
+
+    Returns(pandas.DataFrame): Data frame
+    """
+    try:
+        import pandas
+    except ImportError as ex:
+        raise ImportError("to_dataframe requires the pandas: "
+                          "pip install muni-is-api[dataframe]") from ex
+    return pandas.DataFrame(table, columns=list(table))
+
+
+class Tabular:
+    """Mixin of the entities with the rows of the students, see the ``export`` module"""
+    # Field of the decoded entity with the rows and their columns
+    ROWS = 'students'
+    COLUMNS: Sequence[Column] = ()
+
+    def columns(self) -> Table:
+        """Values of the columns of the decoded rows
+        Returns(Table): Values of each column, in the order of the rows
+        """
+        record = self.decode()
+        return extract(getattr(record, self.ROWS) if record is not None else (), self.COLUMNS)
+
+    def to_records(self) -> List[Dict]:
+        """Rows as the dictionaries
+        Returns(List[Dict]): Row for each student
+        """
+        return to_records(self.columns())
+
+    def to_csv(self, target: Union[str, Path, TextIO]):
+        """Writes the rows as CSV with the header
+        Args:
+            target(Union[str, Path, TextIO]): Path or the opened text file
+        """
+        to_csv(self.columns(), target)
+
+    def to_arrow(self):
+        """Rows as the Arrow table, requires the ``pyarrow``
+        Returns(pyarrow.Table): Arrow table
+        """
+        return to_arrow(self.columns())
+
+    def to_dataframe(self):
+        """Rows as the DataFrame, requires the ``pandas``
+        Returns(pandas.DataFrame): Data frame
+        """
+        return to_dataframe(self.columns())
@@ -1,37 +1,72 @@
 import requests
 import logging
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+from pathlib import Path
 
-from muni_is_api import entities, utils
+from muni_is_api import concurrency, entities, errors, utils
+from muni_is_api.transport import Transport
 
 from requests.auth import HTTPBasicAuth
-from typing import Dict
+from typing import Callable, Dict, Iterable, Iterator, Mapping, Optional, Tuple, Union
 
 log = logging.getLogger(__name__)
 
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+PathLike = Union[str, Path]
+
 
 class FilesApiClient:
     """
     Documentation: https://is.muni.cz/napoveda/technicka/spravce_souboru_api
     """
     def __init__(self, domain: str, uco: str, password: str,
-                 fail: bool = False):
+                 fail: bool = False, transport: Transport = None, scheme: str = 'https'):
+        """Creates Files API client
+        Args:
+            domain(str): Is domain (ex. is.muni.cz)
+            uco(str): UCO of the user
+            password(str): Password of the user
+            fail(bool): Throw an exception if the request has not been successful
+            transport(Transport): Connection pool and timeouts, it can be shared by the clients
+            scheme(str): Url scheme, ``http`` is useful only for a local stand-in server
+        """
         self._domain = domain
-        self._auth = (uco, password)
-        self._session = None
+        self._auth = HTTPBasicAuth(uco, password)
         self._fail = fail
+        self._transport = transport if transport is not None else Transport()
+        self._scheme = scheme
+
+    @property
+    def domain(self) -> str:
+        return self._domain
+
+    @property
+    def transport(self) -> Transport:
+        return self._transport
 
     @property
     def session(self) -> requests.Session:
-        if self._session is None:
-            self._session = requests.Session()
-            self._session.auth = HTTPBasicAuth(*self._auth)
-        return self._session
+        # The session may be shared, so the credentials are sent with each request
+        return self._transport.session
 
     @property
     def api_url(self) -> str:
-        return f"https://{self.domain}/auth/dok/fmgr_api"
+        return f"{self._scheme}://{self.domain}/auth/dok/fmgr_api"
+
+    def content_url(self, url: str) -> str:
+        """Url of the file content
+        Args:
+            url(str): Url of the file in the IS (ex. /el/fi/podzim2020/PB000/odp/file.pdf)
+
+        Returns(str): Full url of the authenticated content
+        """
+        if url.startswith(('http://', 'https://')):
+            return url
+        return f"{self._scheme}://{self.domain}/auth{url}"
 
-    @property
     def for_url(self, url: str) -> 'FilesApiWrapper':
         return FilesApiWrapper(self, url)
 
@@ -40,9 +75,245 @@ class FilesApiClient:
             session=self.session,
             url=self.api_url,
             params=(params if params is not None else {}),
-            fail=self._fail
+            fail=self._fail,
+            auth=self._auth,
+            timeout=self._transport.timeout
         )
 
+    def download(self, url: str, path: PathLike, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 resume: bool = True, attempts: int = 3) -> int:
+        """Downloads the file content to the path, the memory use does not depend on its size
+
+        The content is written to the ``<path>.part`` file, which is renamed when complete.
+        An interrupted download continues from the end of the partial file (HTTP Range),
+        if the file has not changed since. The validator of the file (``ETag`` or
+        ``Last-Modified``) is kept in the ``<path>.part.validator`` and sent as the ``If-Range``,
+        a partial file without the validator is downloaded again.
+
+        Args:
+            url(str): Url of the file in the IS
+            path(PathLike): Target path
+            chunk_size(int): Size of the chunks written to the file
+            resume(bool): Continue the download of an existing partial file
+            attempts(int): Maximal number of the attempts of the interrupted transfer
+
+        Returns(int): Size of the downloaded file
+        """
+        path = Path(path)
+        partial = path.with_name(path.name + '.part')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not resume:
+            self._discard(partial)
+        attempt = 1
+        while not self._download_part(url, partial, chunk_size):
+            if attempt >= attempts:
+                raise errors.ISApiError(message=f"Download of {url} has been interrupted")
+            attempt += 1
+            log.warning(f"[FILES] Download of {url} has been interrupted, "
+                        f"attempt {attempt} of {attempts}")
+        partial.replace(path)
+        self._discard(partial)
+        size = path.stat().st_size
+        log.info(f"[FILES] Downloaded {url} to {path} ({size} bytes)")
+        return size
+
+    def _download_part(self, url: str, partial: Path, chunk_size: int) -> bool:
+        offset = partial.stat().st_size if partial.exists() else 0
+        validator = _read_validator(partial) if offset else None
+        if offset and validator is None:
+            log.info(f"[FILES] Partial file {partial} can not be validated, download it again")
+            offset = 0
+        headers = {'Range': f"bytes={offset}-", 'If-Range': validator} if offset else {}
+        try:
+            with self.session.get(self.content_url(url), headers=headers, stream=True,
+                                  auth=self._auth, timeout=self._transport.timeout) as response:
+                if response.status_code == 416 and offset:
+                    (_, total) = _content_range(response.headers.get('Content-Range'))
+                    if total == offset:
+                        # The partial file is already complete
+                        return True
+                    log.warning(f"[FILES] Partial file {partial} ({offset} bytes) does not "
+                                f"match {url} ({total} bytes), download it again")
+                    self._discard(partial)
+                    return self._download_part(url, partial, chunk_size)
+                self._check(response)
+                if response.status_code == 206 and \
+                        _content_range(response.headers.get('Content-Range'))[0] != offset:
+                    log.warning(f"[FILES] Unexpected range of {url}, download it again")
+                    self._discard(partial)
+                    return self._download_part(url, partial, chunk_size)
+                expected = response.headers.get('Content-Length')
+                written = 0
+                # Without the partial content the server sends the whole file again,
+                # for example when the file has changed since the partial download
+                resumed = response.status_code == 206
+                if not resumed:
+                    _write_validator(partial, response.headers)
+                with partial.open('ab' if resumed else 'wb') as fd:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        fd.write(chunk)
+                        written += len(chunk)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError) as ex:
+            log.debug(f"[FILES] Transfer of {url} has failed: {ex}")
+            return False
+        return expected is None or written >= int(expected)
+
+    @staticmethod
+    def _discard(partial: Path):
+        for stale in (partial, _validator_path(partial)):
+            if stale.exists():
+                stale.unlink()
+
+    def upload(self, url: str, path: PathLike, name: str = None,
+               params: Dict = None) -> requests.Response:
+        """Uploads the file to the folder, the content is streamed from the file
+        Args:
+            url(str): Url of the target folder in the IS
+            path(PathLike): Path of the uploaded file
+            name(str): Name of the file in the IS, the name of the path by default
+            params(Dict): Additional params of the upload
+
+        Returns(requests.Response): Response of the upload
+        """
+        path = Path(path)
+        query = {'url': url, 'nazev': name or path.name, **(params or {})}
+        with path.open('rb') as fd:
+            response = self.session.post(
+                self.api_url, params=utils.params_serialize(query), data=fd,
+                headers={'Content-Type': 'application/octet-stream'},
+                auth=self._auth, timeout=self._transport.timeout)
+        self._check(response)
+        log.info(f"[FILES] Uploaded {path} to {url}")
+        return response
+
+    def download_many(self, targets: Mapping[str, PathLike], workers: int = 4,
+                      progress: concurrency.ProgressCallback = None,
+                      **kwargs) -> Dict[str, concurrency.TaskResult]:
+        """Downloads the files concurrently, see the ``download``
+        The transport pool should be at least as large as the number of the workers.
+
+        Args:
+            targets(Mapping[str, PathLike]): Target path for each file url
+            workers(int): Maximal number of the concurrent transfers
+            progress(ProgressCallback): Called as ``progress(done, total, result)``
+            **kwargs: Options of the ``download``
+
+        Returns(Dict[str, TaskResult]): Size of the file or the error for each url
+        """
+        results = {result.key: result for result in concurrency.map_concurrently(
+            lambda url: self.download(url, targets[url], **kwargs), targets.keys(),
+            workers=workers, progress=progress)}
+        return {url: results[url] for url in targets}
+
+    def upload_many(self, url: str, paths: Iterable[PathLike], workers: int = 4,
+                    progress: concurrency.ProgressCallback = None,
+                    **kwargs) -> Dict[PathLike, concurrency.TaskResult]:
+        """Uploads the files to the folder concurrently, see the ``upload``
+        Args:
+            url(str): Url of the target folder in the IS
+            paths(Iterable[PathLike]): Paths of the uploaded files
+            workers(int): Maximal number of the concurrent transfers
+            progress(ProgressCallback): Called as ``progress(done, total, result)``
+            **kwargs: Options of the ``upload``
+
+        Returns(Dict[PathLike, TaskResult]): Response or the error for each path
+        """
+        paths = list(paths)
+        results = {result.key: result for result in concurrency.map_concurrently(
+            lambda path: self.upload(url, path, **kwargs), paths,
+            workers=workers, progress=progress)}
+        return {path: results[path] for path in paths}
+
+    @staticmethod
+    def _check(response: requests.Response):
+        if not response.ok:
+            log.error(f"[RES] Response[{response.status_code}]: {response.url}")
+            raise errors.ISApiError(message=response.text, status_code=response.status_code,
+                                    headers=response.headers)
+
+    def walk(self, url: str, max_depth: int = None, include: Iterable[str] = None,
+             exclude: Iterable[str] = None, workers: int = 8,
+             descend: Callable[['entities.NodeMetadata'], bool] = None,
+             failed: Dict[str, Exception] = None) -> Iterator['entities.NodeMetadata']:
+        """Walks the tree of the nodes, it is explored breadth-first and the metadata
+        are fetched concurrently
+
+        Only the nodes with the subnodes are fetched, the other nodes are yielded
+        as listed by their parent. Every node is yielded once, identified by its ``node_id``.
+        Failure of one fetch does not stop the walk, the node is yielded as listed
+        and its subtree is skipped.
+
+        Args:
+            url(str): Url of the root node
+            max_depth(int): Maximal depth of the yielded nodes, the root has the depth 0
+            include(Iterable[str]): Path patterns (``fnmatch``) of the yielded nodes,
+                all nodes are yielded by default; the walk continues below the other nodes
+            exclude(Iterable[str]): Path patterns of the skipped subtrees
+            workers(int): Maximal number of the concurrent requests
+            descend(Callable): Called with the listed node, which has the subnodes;
+                the node is yielded as listed and its subtree is skipped if it returns False
+            failed(Dict[str, Exception]): Collects the error of each node url,
+                whose metadata could not be fetched
+
+        Returns(Iterator[NodeMetadata]): Nodes as they are fetched
+        """
+        include = list(include or [])
+        exclude = list(exclude or [])
+        workers = max(1, workers)
+
+        def _wanted(node: entities.NodeMetadata) -> bool:
+            return not include or any(fnmatch(node.path or '', pattern) for pattern in include)
+
+        def _fetch(node_url: str) -> Optional[entities.NodeMetadata]:
+            try:
+                node = self.for_url(node_url).metadata(tree=True)
+                if node.element is None:
+                    raise errors.ISApiError(message=f"Metadata of {node_url} are not available")
+            except Exception as ex:
+                log.warning(f"[WALK] Failed for {node_url}: {ex}")
+                if failed is not None:
+                    failed[node_url] = ex
+                return None
+            return node
+
+        seen = set()
+        pending = deque([(url, 0, None)])
+        in_flight = {}
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            while pending or in_flight:
+                while pending and len(in_flight) < workers:
+                    (node_url, depth, listed) = pending.popleft()
+                    in_flight[executor.submit(_fetch, node_url)] = (depth, listed)
+                (done, _) = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    (depth, listed) = in_flight.pop(future)
+                    node = future.result() or listed
+                    if node is None:
+                        continue
+                    seen.add(node.node_id if node.node_id is not None else node.path)
+                    if _wanted(node):
+                        yield node
+                    for subnode in node.subnodes:
+                        key = subnode.node_id if subnode.node_id is not None else subnode.path
+                        if key in seen or any(fnmatch(subnode.path or '', pattern)
+                                              for pattern in exclude):
+                            continue
+                        seen.add(key)
+                        if max_depth is not None and depth + 1 > max_depth:
+                            continue
+                        if subnode.path and subnode.subnodes_count != 0 and \
+                                (max_depth is None or depth + 1 < max_depth) and \
+                                (descend is None or descend(subnode)):
+                            pending.append((subnode.path, depth + 1, subnode))
+                        elif _wanted(subnode):
+                            yield subnode
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+
 
 class FilesApiWrapper:
     def __init__(self, client: 'FilesApiClient', url: str):
@@ -59,3 +330,67 @@ class FilesApiWrapper:
             query['strom'] = 1
         resp = self._client.get_metadata(query)
         return entities.NodeMetadata(content=utils.serialize(resp))
+
+    def download(self, path: PathLike, **kwargs) -> int:
+        """Downloads the file content to the path, see the ``FilesApiClient.download``
+        Args:
+            path(PathLike): Target path
+            **kwargs: Options of the download
+
+        Returns(int): Size of the downloaded file
+        """
+        return self._client.download(self.url, path, **kwargs)
+
+    def upload(self, path: PathLike, **kwargs) -> requests.Response:
+        """Uploads the file to the folder, see the ``FilesApiClient.upload``
+        Args:
+            path(PathLike): Path of the uploaded file
+            **kwargs: Options of the upload
+
+        Returns(requests.Response): Response of the upload
+        """
+        return self._client.upload(self.url, path, **kwargs)
+
+    def walk(self, **kwargs) -> Iterator['entities.NodeMetadata']:
+        """Walks the tree of the nodes below the url, see the ``FilesApiClient.walk``
+        Args:
+            **kwargs: Options of the walk
+
+        Returns(Iterator[NodeMetadata]): Nodes as they are fetched
+        """
+        return self._client.walk(self.url, **kwargs)
+
+
+def _validator_path(partial: Path) -> Path:
+    return partial.with_name(partial.name + '.validator')
+
+
+def _read_validator(partial: Path) -> Optional[str]:
+    path = _validator_path(partial)
+    if not path.exists():
+        return None
+    return path.read_text(encoding='utf-8').strip() or None
+
+
+def _write_validator(partial: Path, headers: Mapping[str, str]):
+    """Keeps the validator of the downloaded content for the ``If-Range`` of the resumed download
+    The weak ETags can not be used for the ranges, the ``Last-Modified`` is used instead.
+    """
+    etag = headers.get('ETag')
+    validator = etag if etag and not etag.startswith('W/') else headers.get('Last-Modified')
+    path = _validator_path(partial)
+    if validator:
+        path.write_text(validator, encoding='utf-8')
+    elif path.exists():
+        path.unlink()
+
+
+def _content_range(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """Parses the ``Content-Range`` header (``bytes 10-99/100`` or ``bytes */100``)
+    Returns(Tuple): First byte of the range and the total size, None if unknown
+    """
+    if not value or not value.startswith('bytes '):
+        return None, None
+    (span, _, total) = value[len('bytes '):].partition('/')
+    start = span.split('-')[0]
+    return (int(start) if start.isdigit() else None), (int(total) if total.isdigit() else None)
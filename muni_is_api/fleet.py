@@ -0,0 +1,107 @@
+"""
+Fan-out of the same operation over many courses
+
+Example:
+    fleet = CourseFleet('is.muni.cz', token, [('PB071', 1433), ('PB161', 1433)], workers=16)
+    for result in fleet.run('course_list_students'):
+        if result.ok:
+            print(result.key.code, len(result.value.students))
+        else:
+            print(result.key.code, 'failed', result.error)
+"""
+import logging
+
+from typing import Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Union
+
+from muni_is_api import concurrency
+from muni_is_api.client import IsApiClient
+from muni_is_api.metrics import Metrics, OperationStats
+from muni_is_api.transport import Transport
+
+log = logging.getLogger(__name__)
+
+
+class Course(NamedTuple):
+    """Definition of the course in the fleet, the token falls back to the fleet token"""
+    code: str
+    faculty_id: int
+    token: Optional[str] = None
+
+
+Operation = Union[str, Callable[[IsApiClient], Any]]
+
+
+class CourseFleet:
+    def __init__(self, domain: str, token: Optional[str], courses: Iterable,
+                 workers: int = 16, rate: float = None, transport: Transport = None,
+                 **kwargs):
+        """Creates the fleet of the courses
+        Args:
+            domain(str): Is domain (ex. is.muni.cz)
+            token(str): Token for the Notes api, used by courses without own token
+            courses(Iterable): Course definitions, ``Course`` or (code, faculty_id[, token])
+            workers(int): Maximal number of the concurrently queried courses
+            rate(float): Maximal number of the started course queries per second
+            transport(Transport): Shared transport, by default sized for the workers
+            **kwargs: Additional options for the HttpClient of each course
+        """
+        self._workers = workers
+        self._rate = rate
+        self._transport = transport if transport is not None else Transport(
+            pool_maxsize=max(workers, 10))
+        self._metrics = kwargs.pop('metrics', None) or Metrics()
+        self._clients = {}
+        for definition in courses:
+            course = Course(*definition)
+            self._clients[course] = IsApiClient(
+                domain, course.token or token, course.code, course.faculty_id,
+                transport=self._transport, metrics=self._metrics, **kwargs)
+        log.debug(f"[FLEET] Created fleet of {len(self._clients)} courses")
+
+    @property
+    def clients(self) -> Dict[Course, IsApiClient]:
+        """Clients of the courses
+        Returns(Dict[Course, IsApiClient]): Client for each course
+        """
+        return dict(self._clients)
+
+    def run(self, operation: Operation, *args, **kwargs) -> Iterator[concurrency.TaskResult]:
+        """Runs the operation for all courses concurrently
+        Failure of one course does not stop the others, it is reported in its result.
+
+        Args:
+            operation(Operation): Name of the IsApiClient method,
+                or a callable taking the client of the course
+            *args: Arguments of the method
+            **kwargs: Keyword arguments of the method
+
+        Returns(Iterator[TaskResult]): Results keyed by the ``Course`` as they complete
+        """
+        def _call(course: Course):
+            client = self._clients[course]
+            if callable(operation):
+                return operation(client, *args, **kwargs)
+            return getattr(client, operation)(*args, **kwargs)
+
+        log.info(f"[FLEET] Run {operation} for {len(self._clients)} courses")
+        return concurrency.map_concurrently(_call, list(self._clients),
+                                            workers=self._workers, rate=self._rate)
+
+    def collect(self, operation: Operation, *args,
+                **kwargs) -> Dict[Course, concurrency.TaskResult]:
+        """Runs the operation for all courses and waits for all of them
+        Args:
+            operation(Operation): See the ``run``
+            *args: Arguments of the method
+            **kwargs: Keyword arguments of the method
+
+        Returns(Dict[Course, TaskResult]): Results in the order of the courses
+        """
+        results = {result.key: result for result in self.run(operation, *args, **kwargs)}
+        return {course: results[course] for course in self._clients}
+
+    def stats(self) -> Dict[str, OperationStats]:
+        """Request statistics of all courses, see the ``metrics``
+        Returns(Dict[str, OperationStats]): Statistics for each operation
+        """
+        return self._metrics.stats()
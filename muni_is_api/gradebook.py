@@ -0,0 +1,178 @@
+"""
+Points of the whole course in one student × notepad matrix
+
+The matrix is dense, one float per cell, NaN for the cells without points. It is
+the 2-D NumPy array if the ``numpy`` is installed (``pip install muni-is-api[numpy]``),
+otherwise the flat ``array.array`` in the row-major order.
+
+Example:
+    book = client.gradebook(notepads=lambda note: note.shortcut.startswith('hw'))
+    book.get(123456, 'hw01'), book.row(123456), book.totals().mean()
+    book.to_csv('gradebook.csv')
+"""
+import math
+from array import array
+
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from muni_is_api import export, scoring
+from muni_is_api.scoring import Scores
+
+
+class Gradebook(export.Tabular):
+    """Points of the students (rows) in the notepads (columns)"""
+
+    def __init__(self, ucos: Sequence[int], shortcuts: Sequence[str],
+                 contents: Mapping[str, object] = None):
+        """Creates the gradebook
+        Args:
+            ucos(Sequence[int]): UCOs of the students, the rows of the matrix
+            shortcuts(Sequence[str]): Shortcuts of the notepads, the columns of the matrix
+            contents(Mapping[str, NotepadContent]): Content of the notepads,
+                the students who are not in the ``ucos`` are left out
+        """
+        self._columns = {}
+        for shortcut in shortcuts:
+            self._columns.setdefault(shortcut, len(self._columns))
+        self._shortcuts = list(self._columns)
+        self._rows = {}
+        for uco in ucos:
+            self._rows.setdefault(int(uco), len(self._rows))
+        size = len(self._rows) * len(self._shortcuts)
+        numpy = scoring.numpy
+        if numpy is not None:
+            self._ucos = numpy.fromiter(self._rows, dtype=numpy.int64, count=len(self._rows))
+            self._points = numpy.full((len(self._rows), len(self._shortcuts)), numpy.nan)
+        else:
+            self._ucos = array('q', self._rows)
+            self._points = array('d', [math.nan]) * size
+        for (shortcut, content) in (contents or {}).items():
+            self.fill(shortcut, content)
+
+    def fill(self, shortcut: str, content):
+        """Fills the column of the notepad by the points of its content
+        Args:
+            shortcut(str): Shortcut of the notepad
+            content(NotepadContent): Content of the notepad
+        """
+        column = self._columns[shortcut]
+        table = content.columns()
+        cells = {}
+        for (uco, value) in zip(table['uco'], scoring.parse_many(table['content'])):
+            row = self._rows.get(uco)
+            if row is not None and value is not None:
+                cells.setdefault(row, value)
+        numpy = scoring.numpy
+        if numpy is not None:
+            rows = numpy.fromiter(cells.keys(), dtype=numpy.intp, count=len(cells))
+            self._points[rows, column] = numpy.fromiter(cells.values(), dtype=numpy.float64,
+                                                        count=len(cells))
+            return
+        width = len(self._shortcuts)
+        for (row, value) in cells.items():
+            self._points[row * width + column] = value
+
+    @property
+    def ucos(self):
+        """UCOs of the students, the rows of the matrix
+        Returns: Array of the UCOs
+        """
+        return self._ucos
+
+    @property
+    def shortcuts(self) -> List[str]:
+        """Shortcuts of the notepads, the columns of the matrix
+        Returns(List[str]): Shortcuts
+        """
+        return list(self._shortcuts)
+
+    @property
+    def points(self):
+        """Matrix of the points, NaN for the missing points
+        Returns: 2-D NumPy array, or the flat array in the row-major order without the numpy
+        """
+        return self._points
+
+    @property
+    def shape(self):
+        return len(self._rows), len(self._shortcuts)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _value(self, row: int, column: int) -> Optional[float]:
+        if scoring.numpy is not None:
+            value = float(self._points[row, column])
+        else:
+            value = self._points[row * len(self._shortcuts) + column]
+        return None if math.isnan(value) else value
+
+    def get(self, uco: int, shortcut: str, default=None) -> Optional[float]:
+        """Gets the points of the student in the notepad
+        Args:
+            uco(int): UCO of the student
+            shortcut(str): Shortcut of the notepad
+            default: Returned when the student has no points
+
+        Returns(float): Points
+        """
+        row = self._rows.get(int(uco))
+        column = self._columns.get(shortcut)
+        if row is None or column is None:
+            return default
+        value = self._value(row, column)
+        return default if value is None else value
+
+    def row(self, uco: int) -> Dict[str, Optional[float]]:
+        """Points of the student in each notepad
+        Args:
+            uco(int): UCO of the student
+
+        Returns(Dict[str, float]): Points by the notepad shortcut, None if missing
+        """
+        row = self._rows[int(uco)]
+        return {shortcut: self._value(row, column)
+                for (column, shortcut) in enumerate(self._shortcuts)}
+
+    def _column_values(self, column: int) -> List[float]:
+        if scoring.numpy is not None:
+            return self._points[:, column].tolist()
+        return self._points[column::len(self._shortcuts)].tolist()
+
+    def column(self, shortcut: str) -> Scores:
+        """Points of the students in the notepad
+        Args:
+            shortcut(str): Shortcut of the notepad
+
+        Returns(Scores): Points of the students, in the order of the rows
+        """
+        values = self._column_values(self._columns[shortcut])
+        return Scores(self._ucos, [None if math.isnan(value) else value for value in values])
+
+    def totals(self) -> Scores:
+        """Sums the points of each student over the notepads
+        Returns(Scores): Total points, missing if the student has no points in any notepad
+        """
+        numpy = scoring.numpy
+        if numpy is not None:
+            scored = ~numpy.isnan(self._points).all(axis=1)
+            sums = numpy.where(scored, numpy.nansum(self._points, axis=1), numpy.nan)
+            return Scores(self._ucos, [None if math.isnan(value) else value
+                                       for value in sums.tolist()])
+        width = len(self._shortcuts)
+        sums = []
+        for row in range(len(self._rows)):
+            values = [value for value in self._points[row * width:(row + 1) * width]
+                      if not math.isnan(value)]
+            sums.append(math.fsum(values) if values else None)
+        return Scores(self._ucos, sums)
+
+    def columns(self) -> export.Table:
+        """Values of the columns, the UCOs and the points of each notepad
+        Returns(Table): Values of each column, None for the missing points
+        """
+        table = {'uco': list(self._rows)}
+        for (column, shortcut) in enumerate(self._shortcuts):
+            table[shortcut] = [None if math.isnan(value) else value
+                               for value in self._column_values(column)]
+        return table
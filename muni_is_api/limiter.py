@@ -0,0 +1,151 @@
+"""
+Adaptive limiter of the requests to the IS API
+
+The limiter combines a token bucket (requests per second) with an AIMD window of the
+concurrent requests: the window grows by one request per window of healthy responses
+and it is halved when the server answers with 429/5xx, fails or the latency climbs.
+
+The limiter should be shared by all clients of the same domain:
+
+    client = IsApiClient(..., limiter=AdaptiveLimiter.for_domain('is.muni.cz', rate=20))
+"""
+import logging
+import threading
+import time
+
+from typing import Dict, Optional
+
+log = logging.getLogger(__name__)
+
+THROTTLE_STATUSES = (429, 502, 503, 504)
+
+
+class TokenBucket:
+    """Thread-safe token bucket, ``rate`` tokens per second with the ``burst`` capacity"""
+
+    def __init__(self, rate: float, burst: float = None):
+        self._rate = rate
+        self._capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a token is available and takes it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity,
+                                   self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+class AdaptiveLimiter:
+    _domains: Dict[str, 'AdaptiveLimiter'] = {}
+    _domains_lock = threading.Lock()
+
+    def __init__(self, rate: float = None, burst: float = None, concurrency: int = 4,
+                 min_concurrency: int = 1, max_concurrency: int = 64,
+                 latency_tolerance: float = 3.0, max_latency: float = None,
+                 decrease_factor: float = 0.5):
+        """Creates the adaptive limiter
+        Args:
+            rate(float): Maximal number of requests per second, None is unlimited
+            burst(float): Capacity of the token bucket, the ``rate`` by default
+            concurrency(int): Initial number of the concurrent requests
+            min_concurrency(int): Lower bound of the window
+            max_concurrency(int): Upper bound of the window
+            latency_tolerance(float): The latency climbs when it is this many times larger
+                than its moving average
+            max_latency(float): Latency in seconds, which is always considered too high
+            decrease_factor(float): Multiplier of the window on the congestion
+        """
+        self._bucket = TokenBucket(rate, burst) if rate else None
+        self._window = float(concurrency)
+        self._min = min_concurrency
+        self._max = max_concurrency
+        self._latency_tolerance = latency_tolerance
+        self._max_latency = max_latency
+        self._decrease_factor = decrease_factor
+        self._average_latency = None
+        self._last_decrease = float('-inf')
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    @classmethod
+    def for_domain(cls, domain: str, **kwargs) -> 'AdaptiveLimiter':
+        """Gets the limiter shared by all clients of the domain
+        Args:
+            domain(str): Is domain (ex. is.muni.cz)
+            **kwargs: Options of the limiter, used only when it is created
+
+        Returns(AdaptiveLimiter): Limiter of the domain
+        """
+        with cls._domains_lock:
+            if domain not in cls._domains:
+                cls._domains[domain] = cls(**kwargs)
+            return cls._domains[domain]
+
+    @property
+    def concurrency(self) -> int:
+        """Current number of the allowed concurrent requests
+        Returns(int): Size of the window
+        """
+        return max(self._min, int(self._window))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self):
+        """Blocks until the request is allowed by the rate and the concurrency window"""
+        if self._bucket is not None:
+            self._bucket.acquire()
+        with self._condition:
+            while self._in_flight >= self.concurrency:
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, status: Optional[int] = None, error: Exception = None):
+        """Releases the request and adapts the window by its outcome
+        Args:
+            latency(float): Latency of the request in seconds
+            status(int): HTTP status of the response, None if there is no response
+            error(Exception): Error of the request
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if self._congested(latency, status, error):
+                now = time.monotonic()
+                # Decrease at most once per round-trip, the concurrent failures are one event
+                if now - self._last_decrease > latency:
+                    self._window = max(self._min, self._window * self._decrease_factor)
+                    self._last_decrease = now
+                    log.info(f"[LIMIT] Congestion (status={status}, latency={latency:.3f}), "
+                             f"concurrency: {self.concurrency}")
+            else:
+                self._window = min(self._max, self._window + 1.0 / self._window)
+            if status is not None and error is None:
+                self._update_latency(latency)
+            self._condition.notify_all()
+
+    def _congested(self, latency: float, status: Optional[int], error: Exception) -> bool:
+        if status in THROTTLE_STATUSES or (status is not None and status >= 500):
+            return True
+        if error is not None and status is None:
+            return True
+        if self._max_latency is not None and latency > self._max_latency:
+            return True
+        average = self._average_latency
+        return average is not None and latency > average * self._latency_tolerance
+
+    def _update_latency(self, latency: float):
+        if self._average_latency is None:
+            self._average_latency = latency
+        else:
+            self._average_latency = 0.8 * self._average_latency + 0.2 * latency
@@ -0,0 +1,179 @@
+"""
+Per-operation instrumentation of the HTTP clients
+
+Every request made by the client is recorded as the ``RequestEvent``.
+The ``Metrics`` aggregate the events per operation and pass them to the hooks,
+for example to the ``Histogram``, which can be exported in the Prometheus text format.
+
+Example:
+    histogram = metrics.Histogram('is_api_request_seconds')
+    client = IsApiClient(..., metrics=metrics.Metrics(hooks=[histogram]))
+    ...
+    client.stats()['predmet-seznam'].network_time
+    print(histogram.exposition())
+"""
+import bisect
+import logging
+import threading
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+log = logging.getLogger(__name__)
+
+
+class RequestEvent(NamedTuple):
+    """One request of the operation"""
+    operation: str
+    status: Optional[int]
+    network_time: float
+    parse_time: float
+    response_bytes: int
+    error: Optional[Exception] = None
+    attempt: int = 1
+
+    @property
+    def latency(self) -> float:
+        return self.network_time + self.parse_time
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None or (self.status is not None and self.status >= 400)
+
+
+class OperationStats(NamedTuple):
+    """Aggregated requests of the operation, the times are in seconds"""
+    requests: int
+    errors: int
+    statuses: Dict[int, int]
+    network_time: float
+    parse_time: float
+    response_bytes: int
+    max_latency: float
+    retries: int = 0
+
+    @property
+    def latency(self) -> float:
+        return self.network_time + self.parse_time
+
+
+Hook = Callable[[RequestEvent], None]
+
+
+class Metrics:
+    """Thread-safe aggregation of the request events, it can be shared by several clients"""
+
+    def __init__(self, hooks: Sequence[Hook] = None):
+        """Creates the metrics
+        Args:
+            hooks(Sequence[Hook]): Callbacks called with every recorded event
+        """
+        self._hooks = list(hooks or [])
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def add_hook(self, hook: Hook):
+        """Adds the callback called with every recorded event
+        Args:
+            hook(Hook): Callback
+        """
+        self._hooks.append(hook)
+
+    def record(self, event: RequestEvent):
+        """Records the request event
+        Args:
+            event(RequestEvent): Event of the request
+        """
+        with self._lock:
+            current = self._stats.get(event.operation)
+            statuses = dict(current.statuses) if current else {}
+            if event.status is not None:
+                statuses[event.status] = statuses.get(event.status, 0) + 1
+            self._stats[event.operation] = OperationStats(
+                requests=(current.requests if current else 0) + 1,
+                errors=(current.errors if current else 0) + event.failed,
+                statuses=statuses,
+                network_time=(current.network_time if current else 0.0) + event.network_time,
+                parse_time=(current.parse_time if current else 0.0) + event.parse_time,
+                response_bytes=(current.response_bytes if current else 0) + event.response_bytes,
+                max_latency=max(current.max_latency if current else 0.0, event.latency),
+                retries=(current.retries if current else 0) + (event.attempt > 1),
+            )
+        for hook in self._hooks:
+            try:
+                hook(event)
+            except Exception as ex:
+                log.warning(f"[METRICS] Hook {hook} has failed: {ex}")
+
+    def stats(self) -> Dict[str, OperationStats]:
+        """Snapshot of the statistics
+        Returns(Dict[str, OperationStats]): Statistics for each operation
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def reset(self):
+        """Removes all recorded statistics"""
+        with self._lock:
+            self._stats.clear()
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Prometheus-style histogram of the request latency per operation, usable as a hook"""
+
+    def __init__(self, name: str = 'is_api_request_seconds',
+                 buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 value: Callable[[RequestEvent], float] = None):
+        """Creates the histogram
+        Args:
+            name(str): Name of the metric
+            buckets(Sequence[float]): Upper bounds of the buckets
+            value(Callable): Observed value of the event, the latency by default
+        """
+        self._name = name
+        self._buckets = tuple(sorted(buckets))
+        self._value = value or (lambda event: event.latency)
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._sums = {}
+
+    def __call__(self, event: RequestEvent):
+        value = self._value(event)
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(event.operation, [0] * (len(self._buckets) + 1))
+            counts[index] += 1
+            self._sums[event.operation] = self._sums.get(event.operation, 0.0) + value
+
+    def buckets(self, operation: str) -> List[int]:
+        """Cumulative counts of the buckets, the last one is ``+Inf``
+        Args:
+            operation(str): Name of the operation
+
+        Returns(List[int]): Cumulative counts
+        """
+        with self._lock:
+            counts = list(self._counts.get(operation, [0] * (len(self._buckets) + 1)))
+        for index in range(1, len(counts)):
+            counts[index] += counts[index - 1]
+        return counts
+
+    def exposition(self) -> str:
+        """Histogram in the Prometheus text exposition format
+        Returns(str): Text of the metric
+        """
+        with self._lock:
+            operations = sorted(self._counts)
+            sums = dict(self._sums)
+        lines = [f"# TYPE {self._name} histogram"]
+        for operation in operations:
+            counts = self.buckets(operation)
+            bounds = [str(bound) for bound in self._buckets] + ['+Inf']
+            for (bound, count) in zip(bounds, counts):
+                lines.append(f'{self._name}_bucket{{operation="{operation}",le="{bound}"}} '
+                             f'{count}')
+            lines.append(f'{self._name}_sum{{operation="{operation}"}} {sums[operation]}')
+            lines.append(f'{self._name}_count{{operation="{operation}"}} {counts[-1]}')
+        return "\n".join(lines) + "\n"
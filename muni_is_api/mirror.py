@@ -0,0 +1,195 @@
+"""
+Incremental local mirror of the Files API folder
+
+The mirror keeps a manifest of the mirrored nodes next to the files. A folder, which has
+the same change time and the same counts of the objects and subnodes as in the manifest,
+is not fetched again, and only the new and changed files are downloaded.
+
+Example:
+    files = FilesApiClient('is.muni.cz', '1000', 'password')
+    mirror = FilesMirror(files, '/el/fi/podzim2020/PB000/odp/', '/srv/mirror/PB000')
+    result = mirror.sync()
+    print(len(result.downloaded), result.unchanged)
+"""
+import json
+import logging
+from pathlib import Path
+
+from typing import Dict, List, NamedTuple, Optional
+
+from muni_is_api import entities
+from muni_is_api.files_api import FilesApiClient, PathLike
+
+log = logging.getLogger(__name__)
+
+MANIFEST_NAME = '.fmgr-manifest.json'
+MANIFEST_VERSION = 1
+
+
+class MirrorResult(NamedTuple):
+    """Result of the sync, the nodes are identified by their paths in the IS"""
+    downloaded: List[str]
+    unchanged: int
+    removed: List[str]
+    failed: Dict[str, Exception]
+
+
+def fingerprint(node: entities.NodeMetadata) -> list:
+    """Change fingerprint of the node
+    Args:
+        node(NodeMetadata): Node
+
+    Returns(list): Change time, number of the objects and number of the subnodes
+    """
+    return [node.updated_at, node.objects_count, node.subnodes_count]
+
+
+def _ancestors(path: str) -> List[str]:
+    return [path[:index + 1] for (index, char) in enumerate(path)
+            if char == '/' and index + 1 < len(path)]
+
+
+class FilesMirror:
+    def __init__(self, client: FilesApiClient, url: str, root: PathLike,
+                 manifest: PathLike = None, workers: int = 8, delete: bool = False):
+        """Creates the mirror of the folder
+        Args:
+            client(FilesApiClient): Files API client
+            url(str): Url of the mirrored folder in the IS
+            root(PathLike): Local directory of the mirror
+            manifest(PathLike): Path of the manifest, ``<root>/.fmgr-manifest.json`` by default
+            workers(int): Maximal number of the concurrent requests and transfers
+            delete(bool): Delete the local files removed from the IS
+        """
+        self._client = client
+        self._url = url
+        self._root = Path(root)
+        self._manifest = Path(manifest) if manifest is not None else self._root / MANIFEST_NAME
+        self._workers = workers
+        self._delete = delete
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def manifest_path(self) -> Path:
+        return self._manifest
+
+    def load_manifest(self) -> Dict[str, Dict]:
+        """Loads the manifest of the last sync
+        Returns(Dict[str, Dict]): Entry for each node, empty if there is no usable manifest
+        """
+        if not self._manifest.exists():
+            return {}
+        try:
+            data = json.loads(self._manifest.read_text(encoding='utf-8'))
+        except ValueError as ex:
+            log.warning(f"[MIRROR] Manifest {self._manifest} is not valid: {ex}")
+            return {}
+        if data.get('version') != MANIFEST_VERSION or data.get('url') != self._url:
+            return {}
+        return data.get('nodes', {})
+
+    def sync(self, full: bool = False) -> MirrorResult:
+        """Updates the mirror
+        The manifest is saved only when the walk of the tree has completed.
+
+        Args:
+            full(bool): Walk the whole tree, even the folders which have not changed
+
+        Returns(MirrorResult): Downloaded, unchanged, removed and failed files, the failed
+            folders are walked again by the next sync
+        """
+        previous = self.load_manifest()
+        nodes = {}
+        skipped = set()
+
+        def _descend(node: entities.NodeMetadata) -> bool:
+            entry = previous.get(node.path)
+            if full or entry is None or entry['fingerprint'] != fingerprint(node):
+                return True
+            skipped.add(node.path)
+            return False
+
+        downloads = {}
+        unchanged = 0
+        unavailable = {}
+        for node in self._client.walk(self._url, workers=self._workers, descend=_descend,
+                                      failed=unavailable):
+            is_file = not node.path.endswith('/')
+            nodes[node.path] = dict(node_id=node.node_id, fingerprint=fingerprint(node),
+                                    file=is_file)
+            if not is_file:
+                continue
+            target = self._target(node.path)
+            entry = previous.get(node.path)
+            if target is None:
+                continue
+            if entry is not None and entry['fingerprint'] == fingerprint(node) \
+                    and target.exists():
+                unchanged += 1
+            else:
+                downloads[node.path] = target
+
+        # The subtrees of the unchanged folders have not been walked, they are kept as they were
+        for (path, entry) in previous.items():
+            if path not in nodes and any(parent in skipped for parent in _ancestors(path)):
+                nodes[path] = entry
+                unchanged += entry['file']
+
+        # The subtrees of the folders, which could not be fetched, are kept as they were
+        # and the folders are walked the next time
+        for folder in unavailable:
+            for (path, entry) in previous.items():
+                if path.startswith(folder) and path != folder and path not in nodes:
+                    nodes[path] = entry
+            self._forget(nodes, previous, folder)
+            if folder in nodes:
+                nodes[folder] = dict(nodes[folder], fingerprint=None)
+
+        log.info(f"[MIRROR] Sync {self._url}: {len(downloads)} to download, "
+                 f"{unchanged} unchanged, {len(skipped)} folders skipped")
+        results = self._client.download_many(downloads, workers=self._workers)
+        failed = {path: result.error for (path, result) in results.items() if not result.ok}
+        for path in failed:
+            self._forget(nodes, previous, path)
+        failed.update(unavailable)
+
+        removed = sorted(path for path in set(previous) - set(nodes) if previous[path]['file'])
+        if self._delete:
+            for path in removed:
+                target = self._target(path)
+                if target is not None and target.exists():
+                    target.unlink()
+        self._save(nodes)
+        downloaded = [path for (path, result) in results.items() if result.ok]
+        return MirrorResult(downloaded=downloaded, unchanged=unchanged, removed=removed,
+                            failed=failed)
+
+    def _target(self, path: str) -> Optional[Path]:
+        relative = path[len(self._url):] if path.startswith(self._url) else path.lstrip('/')
+        parts = [part for part in relative.split('/') if part]
+        if not parts or any(part in ('.', '..') for part in parts):
+            log.warning(f"[MIRROR] Path {path} can not be mirrored")
+            return None
+        return self._root.joinpath(*parts)
+
+    @staticmethod
+    def _forget(nodes: Dict[str, Dict], previous: Dict[str, Dict], path: str):
+        # The failed file keeps its previous state and its folders are walked the next time
+        if path in previous:
+            nodes[path] = previous[path]
+        else:
+            nodes.pop(path, None)
+        for parent in _ancestors(path):
+            if parent in nodes:
+                nodes[parent] = dict(nodes[parent], fingerprint=None)
+
+    def _save(self, nodes: Dict[str, Dict]):
+        self._manifest.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self._manifest.with_name(self._manifest.name + '.tmp')
+        temporary.write_text(json.dumps(dict(version=MANIFEST_VERSION, url=self._url,
+                                             nodes=nodes), ensure_ascii=False),
+                             encoding='utf-8')
+        temporary.replace(self._manifest)
@@ -0,0 +1,73 @@
+"""
+Request planner that splits the operations with too long urls into several requests
+
+The IS API accepts lists of values as repeated params (``uco=1;uco=2;...``).
+For long lists the url exceeds the server limits, so the list is split into chunks,
+each chunk is sent as a separate request and the responses are merged back.
+"""
+import logging
+
+from defusedxml.lxml import RestrictedElement
+from requests.utils import requote_uri
+
+from typing import Dict, List, Optional
+
+from muni_is_api import utils
+
+log = logging.getLogger(__name__)
+
+# Operations and their list params, which can be split into several requests
+SPLITTABLE_PARAMS = {
+    'blok-dej-obsah': 'uco',
+    'seminar-seznam': 'seminar',
+    'seminar-cvicici-seznam': 'seminar',
+}
+
+DEFAULT_MAX_URL_LENGTH = 4000
+
+
+def plan(url: str, params: Dict, max_length: int = DEFAULT_MAX_URL_LENGTH) -> List[Dict]:
+    """Splits the request params, so every request url fits into the max length
+    Args:
+        url(str): Api url
+        params(Dict): Params of the request including the ``operace``
+        max_length(int): Maximal length of the url
+
+    Returns(List[Dict]): Params for each of the requests
+    """
+    name = SPLITTABLE_PARAMS.get(params.get('operace'))
+    values = params.get(name)
+    if not isinstance(values, (list, tuple)) or len(values) < 2:
+        return [params]
+    if len(utils.build_url(url, params)) <= max_length:
+        return [params]
+
+    base = {key: val for (key, val) in params.items() if key != name}
+    free = max_length - len(utils.build_url(url, base))
+    chunks = []
+    chunk, size = [], 0
+    for value in values:
+        value_size = len(requote_uri(f"{name}={value};"))
+        if chunk and size + value_size > free:
+            chunks.append(chunk)
+            chunk, size = [], 0
+        chunk.append(value)
+        size += value_size
+    chunks.append(chunk)
+    log.debug(f"[PLAN] Split {params['operace']} into {len(chunks)} requests by \"{name}\"")
+    return [{**base, name: chunk} for chunk in chunks]
+
+
+def merge(roots: List[Optional[RestrictedElement]]) -> Optional[RestrictedElement]:
+    """Merges the responses of the split requests into the first one
+    Args:
+        roots(List[RestrictedElement]): Parsed responses in the order of the requests
+
+    Returns(RestrictedElement): Merged response, None if any of the requests has failed
+    """
+    if any(root is None for root in roots):
+        return None
+    merged = roots[0]
+    for root in roots[1:]:
+        merged.extend(list(root))
+    return merged
@@ -0,0 +1,366 @@
+"""
+Declarative schemas of the API entities and the one-pass decoder into compact records
+
+The lazy ``entities`` evaluate an XPath query for every property access.
+The schemas describe the same fields and the decoder walks each element only once,
+converting the values up front, so the records are cheap to iterate.
+
+Example:
+    students = client.course_list_students().decode().students
+    ucos = [student.uco for student in students]
+"""
+from defusedxml.lxml import RestrictedElement
+
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+
+class Field:
+    """Text of the child element, converted by the ``convert``"""
+    __slots__ = ('tag', 'convert', 'default')
+
+    def __init__(self, tag: str, convert: Callable[[str], Any] = None, default=None):
+        self.tag = tag
+        self.convert = convert
+        self.default = default
+
+    def extract(self, element: RestrictedElement, texts: Dict[str, str],
+                children: Dict[str, List]) -> Any:
+        text = texts.get(self.tag)
+        if text is None:
+            return self.default
+        return self.convert(text) if self.convert is not None else text
+
+
+class Group:
+    """Sub-record decoded from the fields of the same element"""
+    __slots__ = ('schema',)
+
+    def __init__(self, schema: 'Schema'):
+        self.schema = schema
+
+    def extract(self, element: RestrictedElement, texts: Dict[str, str],
+                children: Dict[str, List]) -> Any:
+        return self.schema.build(element, texts, children)
+
+
+class Collection:
+    """List of the sub-records on the path of child elements, the last tag is the item"""
+    __slots__ = ('path', 'schema')
+
+    def __init__(self, path: Sequence[str], schema: 'Schema' = None):
+        self.path = tuple(path)
+        self.schema = schema
+
+    def extract(self, element: RestrictedElement, texts: Dict[str, str],
+                children: Dict[str, List]) -> List:
+        items = children.get(self.path[0], [])
+        for tag in self.path[1:]:
+            items = [child for item in items for child in item if child.tag == tag]
+        return [self.schema.decode(item) for item in items]
+
+
+class Schema:
+    def __init__(self, record: type, members: Dict[str, Any]):
+        """Creates the schema of the record
+        Args:
+            record(type): NamedTuple type of the record
+            members(Dict): Field, Group or Collection for each record field
+        """
+        self.record = record
+        self.members = [members[name] for name in record._fields]
+
+    def decode(self, element: Optional[RestrictedElement]):
+        """Decodes the element into the record in one pass over its children
+        Args:
+            element(RestrictedElement): Element of the entity
+
+        Returns: Record instance, None for the missing element
+        """
+        if element is None:
+            return None
+        texts = {}
+        children = {}
+        for child in element:
+            tag = child.tag
+            if tag not in children:
+                children[tag] = []
+                texts[tag] = child.text
+            children[tag].append(child)
+        return self.build(element, texts, children)
+
+    def build(self, element: RestrictedElement, texts: Dict[str, str],
+              children: Dict[str, List]):
+        return self.record(*[member.extract(element, texts, children)
+                             for member in self.members])
+
+
+class Changed(NamedTuple):
+    person: Optional[int]
+    date: Optional[str]
+
+
+class SeminarCapacity(NamedTuple):
+    max: Optional[int]
+    count: Optional[int]
+
+
+class SeminarDates(NamedTuple):
+    signin_from: Optional[str]
+    signin_to: Optional[str]
+    signout_to: Optional[str]
+
+
+class Seminar(NamedTuple):
+    id: Optional[int]
+    label: Optional[str]
+    note: Optional[str]
+    changed: Changed
+    dates: SeminarDates
+    students: SeminarCapacity
+
+
+class Person(NamedTuple):
+    uco: Optional[int]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    full_name: Optional[str]
+
+
+class Teacher(NamedTuple):
+    uco: Optional[int]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    full_name: Optional[str]
+    role: Optional[str]
+
+
+class Student(NamedTuple):
+    uco: Optional[int]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    full_name: Optional[str]
+    study_status: Optional[str]
+    registration_status: Optional[str]
+    course_termination: Optional[str]
+    has_seminary: bool
+
+
+class Course(NamedTuple):
+    id: Optional[int]
+    name: Optional[str]
+    name_eng: Optional[str]
+    code: Optional[str]
+    number_of_students: Optional[int]
+    number_of_registered_students: Optional[int]
+
+
+class Faculty(NamedTuple):
+    id: Optional[int]
+    shortcut: Optional[str]
+
+
+class CourseInfo(NamedTuple):
+    course: Course
+    faculty: Faculty
+    seminars: List[Seminar]
+    teachers: List[Teacher]
+
+
+class NotepadEntry(NamedTuple):
+    uco: Optional[int]
+    content: Optional[str]
+    changed: Changed
+
+
+class NotepadContent(NamedTuple):
+    students: List[NotepadEntry]
+
+
+class CourseStudents(NamedTuple):
+    students: List[Student]
+
+
+class StudentsSeminar(NamedTuple):
+    id: Optional[int]
+    name: Optional[str]
+    students: List[Student]
+
+
+class SeminarStudents(NamedTuple):
+    seminars: List[StudentsSeminar]
+
+
+class TeachersSeminar(NamedTuple):
+    id: Optional[int]
+    name: Optional[str]
+    teachers: List[Person]
+
+
+class SeminarTeachers(NamedTuple):
+    seminars: List[TeachersSeminar]
+
+
+class Note(NamedTuple):
+    id: Optional[int]
+    name: Optional[str]
+    show_statistic: bool
+    type_id: Optional[str]
+    type_name: Optional[str]
+    shortcut: Optional[str]
+    changed: Changed
+
+
+class NotesList(NamedTuple):
+    notes: List[Note]
+
+
+class NodeMetadata(NamedTuple):
+    name: Optional[str]
+    shortcut: Optional[str]
+    ordering_weight: Optional[int]
+    updated_at: Optional[str]
+    updated_by_uco: Optional[int]
+    updated_by: Optional[str]
+    is_public: bool
+    is_internal: bool
+    node_id: Optional[int]
+    parent_id: Optional[int]
+    path: Optional[str]
+    objects_count: Optional[int]
+    subnodes_count: Optional[int]
+    metadata_url: Optional[str]
+    subnodes: List['NodeMetadata']
+
+
+def _flag(value: str) -> Callable[[str], bool]:
+    return lambda text: text == value
+
+
+def _internal(text: str) -> bool:
+    return text == "" or text == "1"
+
+
+CHANGED = Schema(Changed, dict(
+    person=Field('ZMENIL', int),
+    date=Field('ZMENENO'),
+))
+
+_PERSON = dict(
+    uco=Field('UCO', int),
+    first_name=Field('JMENO'),
+    last_name=Field('PRIJMENI'),
+    full_name=Field('CELE_JMENO'),
+)
+
+PERSON = Schema(Person, _PERSON)
+
+TEACHER = Schema(Teacher, dict(_PERSON, role=Field('ROLE')))
+
+STUDENT = Schema(Student, dict(
+    _PERSON,
+    study_status=Field('STAV_STUDIA'),
+    registration_status=Field('STAV_ZAPISU'),
+    course_termination=Field('UKONCENI'),
+    has_seminary=Field('STUDENT_NEMA_SEMINAR', lambda text: text != '1', default=True),
+))
+
+SEMINAR = Schema(Seminar, dict(
+    id=Field('SEMINAR_ID', int),
+    label=Field('OZNACENI'),
+    note=Field('POZNAMKA'),
+    changed=Group(CHANGED),
+    dates=Group(Schema(SeminarDates, dict(
+        signin_from=Field('PRIHLASIT_OD'),
+        signin_to=Field('PRIHLASIT_DO'),
+        signout_to=Field('ODHLASIT_DO'),
+    ))),
+    students=Group(Schema(SeminarCapacity, dict(
+        max=Field('MAX_STUDENTU', int),
+        count=Field('POCET_STUDENTU_VE_SKUPINE', int),
+    ))),
+))
+
+COURSE_INFO = Schema(CourseInfo, dict(
+    course=Group(Schema(Course, dict(
+        id=Field('PREDMET_ID', int),
+        name=Field('NAZEV_PREDMETU'),
+        name_eng=Field('NAZEV_PREDMETU_ANGL'),
+        code=Field('KOD_PREDMETU'),
+        number_of_students=Field('POCET_ZAPSANYCH_STUDENTU', int),
+        number_of_registered_students=Field('POCET_ZAREG_STUDENTU', int),
+    ))),
+    faculty=Group(Schema(Faculty, dict(
+        id=Field('FAKULTA_ID', int),
+        shortcut=Field('FAKULTA_ZKRATKA_DOM'),
+    ))),
+    seminars=Collection(('SEMINARE', 'SEMINAR'), SEMINAR),
+    teachers=Collection(('VYUCUJICI_SEZNAM', 'VYUCUJICI'), TEACHER),
+))
+
+NOTEPAD_ENTRY = Schema(NotepadEntry, dict(
+    uco=Field('UCO', int),
+    content=Field('OBSAH'),
+    changed=Group(CHANGED),
+))
+
+NOTEPAD_CONTENT = Schema(NotepadContent, dict(
+    students=Collection(('STUDENT',), NOTEPAD_ENTRY),
+))
+
+COURSE_STUDENTS = Schema(CourseStudents, dict(
+    students=Collection(('STUDENT',), STUDENT),
+))
+
+STUDENTS_SEMINAR = Schema(StudentsSeminar, dict(
+    id=Field('SEMINAR_ID', int),
+    name=Field('OZNACENI'),
+    students=Collection(('STUDENT',), STUDENT),
+))
+
+SEMINAR_STUDENTS = Schema(SeminarStudents, dict(
+    seminars=Collection(('SEMINAR',), STUDENTS_SEMINAR),
+))
+
+TEACHERS_SEMINAR = Schema(TeachersSeminar, dict(
+    id=Field('SEMINAR_ID', int),
+    name=Field('OZNACENI'),
+    teachers=Collection(('CVICICI',), PERSON),
+))
+
+SEMINAR_TEACHERS = Schema(SeminarTeachers, dict(
+    seminars=Collection(('SEMINAR',), TEACHERS_SEMINAR),
+))
+
+NOTE = Schema(Note, dict(
+    id=Field('BLOK_ID', int),
+    name=Field('JMENO'),
+    show_statistic=Field('STUDENTOVI_ZOBRAZIT_STATISTIKU', _flag('a'), default=False),
+    type_id=Field('TYP_ID'),
+    type_name=Field('TYP_NAZEV'),
+    shortcut=Field('ZKRATKA'),
+    changed=Group(CHANGED),
+))
+
+NOTES_LIST = Schema(NotesList, dict(
+    notes=Collection(('POZN_BLOK',), NOTE),
+))
+
+NODE_METADATA = Schema(NodeMetadata, dict(
+    name=Field('nazev'),
+    shortcut=Field('zkratka'),
+    ordering_weight=Field('vaha_pro_razeni', int),
+    updated_at=Field('zmeneno'),
+    updated_by_uco=Field('zmenil_uco', int),
+    updated_by=Field('zmenil_jmeno'),
+    is_public=Field('smi_cist_svet', _flag('1'), default=False),
+    is_internal=Field('smi_cist_auth', _internal, default=True),
+    node_id=Field('uzel_id', int),
+    parent_id=Field('rodic_id', int),
+    path=Field('cesta'),
+    objects_count=Field('pocet_objektu', int),
+    subnodes_count=Field('pocet_poduzlu', int),
+    metadata_url=Field('url_metadata'),
+    subnodes=Collection(('poduzly', 'poduzel')),
+))
+# The subnodes have the same schema as the node itself
+NODE_METADATA.members[-1].schema = NODE_METADATA
@@ -0,0 +1,110 @@
+"""
+Retry policy of the requests to the IS API
+
+The read operations are retried on the connection errors, timeouts and the 429/5xx
+responses with the capped exponential backoff and the full jitter, the ``Retry-After``
+header takes precedence over the backoff. The write operations are retried by the HTTP
+client only when the request has not been sent at all, the ``IsApiClient`` retries them
+after it has checked the current content of the notepad (see ``notepad_update_many``).
+
+Example:
+    client = IsApiClient(..., retry=RetryPolicy(max_attempts=5, backoff=1.0))
+"""
+import email.utils
+import random
+import time
+
+import requests
+
+from typing import Mapping, Optional
+
+from muni_is_api.cache import READ_OPERATIONS
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def parse_retry_after(headers: Optional[Mapping]) -> Optional[float]:
+    """Parses the ``Retry-After`` header
+    Args:
+        headers(Mapping): Headers of the response
+
+    Returns(float): Delay in seconds, None if the header is missing or invalid
+    """
+    value = headers.get('Retry-After') if headers is not None else None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    parsed = email.utils.parsedate_tz(value)
+    if parsed is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(parsed) - time.time())
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 4, backoff: float = 0.5, max_backoff: float = 30.0,
+                 jitter: float = 1.0, statuses=RETRY_STATUSES, max_retry_after: float = 120.0):
+        """Creates the retry policy
+        Args:
+            max_attempts(int): Maximal number of the attempts, including the first one
+            backoff(float): Delay before the first retry in seconds, it doubles each retry
+            max_backoff(float): Maximal delay between the attempts
+            jitter(float): Fraction of the delay which is randomized, ``1`` is the full jitter
+            statuses(Iterable[int]): Response statuses which are retried
+            max_retry_after(float): Maximal honoured ``Retry-After`` delay
+        """
+        self._max_attempts = max_attempts
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._jitter = jitter
+        self._statuses = frozenset(statuses)
+        self._max_retry_after = max_retry_after
+
+    @property
+    def max_attempts(self) -> int:
+        return self._max_attempts
+
+    def retryable(self, status: Optional[int], error: Exception = None) -> bool:
+        """Whether the failure is transient
+        Args:
+            status(int): HTTP status of the response, None if there is no response
+            error(Exception): Error of the request
+
+        Returns(bool): True if the request may succeed when repeated
+        """
+        if status is not None:
+            return status in self._statuses
+        return isinstance(error, (requests.exceptions.ConnectionError,
+                                  requests.exceptions.Timeout))
+
+    def should_retry(self, operation: str, attempt: int, status: Optional[int],
+                     error: Exception = None) -> bool:
+        """Whether the HTTP client should repeat the failed request
+        Args:
+            operation(str): Name of the operation
+            attempt(int): Number of the failed attempt, starting with 1
+            status(int): HTTP status of the response, None if there is no response
+            error(Exception): Error of the request
+
+        Returns(bool): True if the request should be repeated
+        """
+        if attempt >= self._max_attempts or not self.retryable(status, error):
+            return False
+        # The write which has not reached the server can be always repeated
+        return operation in READ_OPERATIONS or \
+            isinstance(error, requests.exceptions.ConnectTimeout)
+
+    def delay(self, attempt: int, headers: Mapping = None) -> float:
+        """Delay before the next attempt
+        Args:
+            attempt(int): Number of the failed attempt, starting with 1
+            headers(Mapping): Headers of the failed response
+
+        Returns(float): Delay in seconds
+        """
+        retry_after = parse_retry_after(headers)
+        if retry_after is not None:
+            return min(retry_after, self._max_retry_after)
+        delay = min(self._max_backoff, self._backoff * 2 ** (attempt - 1))
+        return delay * (1 - self._jitter * random.random())
@@ -0,0 +1,243 @@
+"""
+Points in the notepad cells and their statistics
+
+The IS sums the numbers marked by the asterisk (``*2``, ``*-0.5``, ``*1,5``).
+Cells without the asterisk notation are scored by the numbers with the point units
+(``25 bodů``, ``2 body``, ``1 bod``, ``3 b``, ``4 pts``), a cell with a bare number
+is scored by that number, other cells have no points.
+
+The points are kept in the arrays keyed by UCO, the NumPy arrays if the ``numpy``
+is installed (``pip install muni-is-api[numpy]``), the ``array.array`` otherwise.
+
+Example:
+    scores = Scores.from_content(client.notepad_content('hw01'))
+    print(scores.mean(), scores.percentile(90), scores.get(123456))
+"""
+import math
+import re
+from array import array
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_NUMBER = r'[+-]?\d+(?:[.,]\d+)?'
+_STARRED = re.compile(r'\*\s*(' + _NUMBER + r')')
+_WITH_UNIT = re.compile(r'(' + _NUMBER + r')\s*(?:bodů|bodu|body|bod|b\.?|points?|pts?)(?!\w)',
+                        re.IGNORECASE)
+_BARE = re.compile(r'\s*(' + _NUMBER + r')\s*$')
+
+
+def _number(text: str) -> float:
+    return float(text.replace(',', '.'))
+
+
+def parse_points(text: Optional[str]) -> Optional[float]:
+    """Points of the notepad cell
+    Args:
+        text(str): Content of the cell
+
+    Returns(float): Sum of the points, None if the cell has no points
+    """
+    if not text:
+        return None
+    for pattern in (_STARRED, _WITH_UNIT):
+        found = pattern.findall(text)
+        if found:
+            return sum(_number(value) for value in found)
+    bare = _BARE.match(text)
+    return _number(bare.group(1)) if bare else None
+
+
+def parse_many(texts: Iterable[Optional[str]]) -> List[Optional[float]]:
+    """Points of many cells, the same contents are parsed only once
+    Args:
+        texts(Iterable[str]): Contents of the cells
+
+    Returns(List[float]): Points of each cell, None for the cells without points
+    """
+    parsed = {}
+    result = []
+    for text in texts:
+        if text not in parsed:
+            parsed[text] = parse_points(text)
+        result.append(parsed[text])
+    return result
+
+
+def _percentile(ordered: Sequence[float], q: float) -> float:
+    # Linear interpolation, the same as the numpy default
+    position = (len(ordered) - 1) * q / 100.0
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class Scores:
+    """Points of the students in one notepad, missing points are NaN"""
+
+    def __init__(self, ucos: Sequence[int], points: Sequence[Optional[float]]):
+        """Creates the scores
+        Args:
+            ucos(Sequence[int]): UCOs of the students
+            points(Sequence[float]): Points of each student, None if missing
+        """
+        values = [math.nan if value is None else value for value in points]
+        if numpy is not None:
+            self._ucos = numpy.asarray(ucos, dtype=numpy.int64)
+            self._points = numpy.asarray(values, dtype=numpy.float64)
+        else:
+            self._ucos = array('q', ucos)
+            self._points = array('d', values)
+        self._index = None
+
+    @classmethod
+    def from_content(cls, content) -> 'Scores':
+        """Parses the points of the whole notepad at once
+        Args:
+            content(entities.NotepadContent): Notepad content
+
+        Returns(Scores): Points of the students
+        """
+        columns = content.columns()
+        return cls(columns['uco'], parse_many(columns['content']))
+
+    @property
+    def ucos(self):
+        """UCOs of the students
+        Returns: Array of the UCOs
+        """
+        return self._ucos
+
+    @property
+    def points(self):
+        """Points of the students, in the order of the ``ucos``
+        Returns: Array of the points, NaN for the missing points
+        """
+        return self._points
+
+    def __len__(self) -> int:
+        return len(self._ucos)
+
+    def by_uco(self) -> Dict[int, Optional[float]]:
+        """Points by UCO, the first occurrence wins
+        Returns(Dict[int, float]): Points of each student, None if missing
+        """
+        if self._index is None:
+            index = {}
+            for (uco, value) in zip(self._ucos.tolist(), self._points.tolist()):
+                index.setdefault(uco, None if math.isnan(value) else value)
+            self._index = index
+        return self._index
+
+    def get(self, uco: int, default=None) -> Optional[float]:
+        """Gets the points of the student
+        Args:
+            uco(int): UCO of the student
+            default: Returned when the student has no points
+
+        Returns(float): Points
+        """
+        value = self.by_uco().get(int(uco))
+        return default if value is None else value
+
+    def scored(self):
+        """Points without the missing ones
+        Returns: Array of the points
+        """
+        if numpy is not None:
+            return self._points[~numpy.isnan(self._points)]
+        return array('d', [value for value in self._points if not math.isnan(value)])
+
+    def count(self) -> int:
+        return len(self.scored())
+
+    def sum(self) -> float:
+        return float(self.scored().sum()) if numpy is not None else math.fsum(self.scored())
+
+    def mean(self) -> Optional[float]:
+        scored = self.scored()
+        if not len(scored):
+            return None
+        return float(scored.mean()) if numpy is not None else math.fsum(scored) / len(scored)
+
+    def min(self) -> Optional[float]:
+        scored = self.scored()
+        if not len(scored):
+            return None
+        return float(scored.min()) if numpy is not None else min(scored)
+
+    def max(self) -> Optional[float]:
+        scored = self.scored()
+        if not len(scored):
+            return None
+        return float(scored.max()) if numpy is not None else max(scored)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Percentile of the points, linearly interpolated
+        Args:
+            q(float): Percentile between 0 and 100
+
+        Returns(float): Value of the percentile, None if there are no points
+        """
+        scored = self.scored()
+        if not len(scored):
+            return None
+        if numpy is not None:
+            return float(numpy.percentile(scored, q))
+        return _percentile(sorted(scored), q)
+
+    def histogram(self, bins: int = 10,
+                  value_range: Tuple[float, float] = None) -> Tuple[List[int], List[float]]:
+        """Histogram of the points with the bins of the same width
+        Args:
+            bins(int): Number of the bins
+            value_range(Tuple[float, float]): Lower and upper bound, the points range by default
+
+        Returns(Tuple[List[int], List[float]]): Counts of the bins and the bin edges,
+            the last bin includes its upper edge
+        """
+        scored = self.scored()
+        if numpy is not None:
+            (counts, edges) = numpy.histogram(scored, bins=bins, range=value_range)
+            return counts.tolist(), edges.tolist()
+        (lower, upper) = value_range or ((min(scored), max(scored)) if len(scored) else (0, 1))
+        if lower == upper:
+            (lower, upper) = (lower - 0.5, upper + 0.5)
+        width = (upper - lower) / bins
+        edges = [lower + width * index for index in range(bins)] + [upper]
+        counts = [0] * bins
+        for value in scored:
+            if lower <= value <= upper:
+                counts[min(int((value - lower) / width), bins - 1)] += 1
+        return counts, edges
+
+
+def score_notepads(contents: Mapping[str, object]) -> Dict[str, Scores]:
+    """Parses the points of many notepads
+    Args:
+        contents(Mapping[str, NotepadContent]): Content of each notepad
+
+    Returns(Dict[str, Scores]): Scores of each notepad
+    """
+    return {shortcut: Scores.from_content(content) for (shortcut, content) in contents.items()}
+
+
+def totals(scores: Iterable[Scores]) -> Scores:
+    """Sums the points of each student over the notepads
+    Args:
+        scores(Iterable[Scores]): Scores of the notepads
+
+    Returns(Scores): Total points, missing if the student has no points in any notepad
+    """
+    total = {}
+    for notepad in scores:
+        for (uco, value) in notepad.by_uco().items():
+            if value is not None:
+                total[uco] = total.get(uco, 0.0) + value
+            else:
+                total.setdefault(uco, None)
+    return Scores(list(total), list(total.values()))
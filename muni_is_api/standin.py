@@ -0,0 +1,845 @@
+"""
+Local stand-in server of the IS Notes API and the Files API
+
+The server keeps the courses, their notepads and the files in memory. The writes
+(``blok-novy``, ``blok-pis-student-obsah`` and the uploads) change the state, so the
+following reads return them. The params are parsed from the ``;`` separated query
+the same way as the ``utils.params_serialize`` builds it.
+
+The faults are injected for all of the requests: the latency, the random server errors,
+the throttling (429 with the ``Retry-After``) above the request rate, the overload (503)
+above the number of the concurrent requests and any status returned by the ``fail_when``.
+The file transfers can be interrupted (``cut_after``), the content is served with the ``ETag``
+and the ranges are validated by the ``If-Range``, so the resumed downloads can be tested.
+
+Usage:
+    python -m muni_is_api.standin --port 8000 --students 500 --notepads 10 --latency 0.05
+
+Example:
+    with StandInServer(latency=0.02, error_rate=0.01) as server:
+        server.add_course(Course.generate('PB000', 1433, 'secret_token', students=1000))
+        client = IsApiClient(server.domain, 'secret_token', 'PB000', 1433, scheme='http')
+        client.notepad_update('hw01', uco=100000, content='*2')
+"""
+import argparse
+import logging
+import math
+import random
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import unquote, urlsplit
+from xml.sax.saxutils import escape
+
+from typing import Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+log = logging.getLogger(__name__)
+
+NOTES_PATH = '/export/pb_blok_api'
+FILES_PATH = '/auth/dok/fmgr_api'
+CONTENT_PREFIX = '/auth'
+SAVED = 'Úspěšně uloženo.'
+
+Params = Dict[str, List[str]]
+
+# Names of the generated students, shared with the synthetic payloads of the benchmarks
+FIRST_NAMES = ('Jan', 'Petr', 'Tomáš', 'Jana', 'Eva', 'Lucie', 'Martin', 'Šimon')
+LAST_NAMES = ('Novák', 'Svoboda', 'Dvořák', 'Černá', 'Procházková', 'Kučera', 'Veselý')
+
+
+def parse_params(query: str) -> Params:
+    """Parses the ``;`` separated query, the repeated params are collected into the list
+    Args:
+        query(str): Query of the url, as built by the ``utils.params_serialize``
+
+    Returns(Params): Values of each param
+    """
+    params = {}
+    for part in query.split(';'):
+        if not part:
+            continue
+        (name, _, value) = part.partition('=')
+        params.setdefault(unquote(name), []).append(unquote(value))
+    return params
+
+
+def _first(params: Params, name: str, default: str = None) -> Optional[str]:
+    values = params.get(name)
+    return values[0] if values else default
+
+
+def _flag(params: Params, name: str) -> bool:
+    return _first(params, name) == 'a'
+
+
+def _tag(tag: str, value) -> str:
+    if value is None or value == '':
+        return f"<{tag}/>"
+    return f"<{tag}>{escape(str(value))}</{tag}>"
+
+
+class StandInError(Exception):
+    """Refused request, rendered as the error response with the status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Student(NamedTuple):
+    uco: int
+    first_name: str
+    last_name: str
+    seminar: Optional[str] = None
+    # Only registered, not enrolled in the course
+    registered: bool = False
+    terminated: bool = False
+    inactive: bool = False
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+
+class Teacher(NamedTuple):
+    uco: int
+    first_name: str
+    last_name: str
+    role: str = 'cvičící'
+
+
+class Seminar(NamedTuple):
+    id: int
+    label: str
+    capacity: int = 20
+    teachers: Tuple[int, ...] = ()
+
+
+class Exam(NamedTuple):
+    id: int
+    date: str
+    room: str
+    capacity: int
+    students: Tuple[int, ...] = ()
+
+
+class Cell(NamedTuple):
+    content: str
+    changed: str
+    changed_by: int
+
+
+class Notepad:
+    def __init__(self, id: int, shortcut: str, name: str, visible: bool = False,
+                 complete: bool = True, statistic: bool = False, changed: str = None,
+                 changed_by: int = None):
+        self.id = id
+        self.shortcut = shortcut
+        self.name = name
+        self.visible = visible
+        self.complete = complete
+        self.statistic = statistic
+        self.changed = changed
+        self.changed_by = changed_by
+        self.cells: Dict[int, Cell] = {}
+
+
+class _Clock:
+    """Change times in the IS format, every change has a later time than the previous one"""
+
+    def __init__(self):
+        self._last = 0
+        self._lock = threading.Lock()
+
+    def stamp(self) -> str:
+        with self._lock:
+            self._last = max(int(time.time()), self._last + 1)
+            return time.strftime('%Y%m%d%H%M%S', time.localtime(self._last))
+
+
+class Course:
+    """State of the course, change it only by its methods, so the rendered responses
+    are not served after the change"""
+
+    def __init__(self, code: str, faculty_id: int, token: str, name: str = None,
+                 course_id: int = None, owner: int = 1):
+        """Creates the empty course
+        Args:
+            code(str): Course code
+            faculty_id(int): Id of the faculty
+            token(str): Token of the Notes API for the course
+            name(str): Name of the course
+            course_id(int): Id of the course
+            owner(int): UCO of the token owner, the author of the writes
+        """
+        self.code = code
+        self.faculty_id = faculty_id
+        self.token = token
+        self.name = name or code
+        self.course_id = course_id or zlib.crc32(f"{faculty_id}/{code}".encode()) % 10 ** 6
+        self.owner = owner
+        self.students: Dict[int, Student] = {}
+        self.teachers: Dict[int, Teacher] = {}
+        self.seminars: Dict[str, Seminar] = {}
+        self.notepads: Dict[str, Notepad] = {}
+        self.exams: List[Exam] = []
+        self.clock = _Clock()
+        self.lock = threading.RLock()
+        self._rendered: Dict[tuple, bytes] = {}
+
+    @property
+    def key(self) -> Tuple[int, str]:
+        return self.faculty_id, self.code
+
+    def touch(self):
+        """Drops the rendered responses, call it after changing the state directly"""
+        with self.lock:
+            self._rendered.clear()
+
+    def add_student(self, student: Student) -> Student:
+        with self.lock:
+            self.students[student.uco] = student
+            self.touch()
+        return student
+
+    def add_teacher(self, teacher: Teacher) -> Teacher:
+        with self.lock:
+            self.teachers[teacher.uco] = teacher
+            self.touch()
+        return teacher
+
+    def add_seminar(self, seminar: Seminar) -> Seminar:
+        with self.lock:
+            self.seminars[seminar.label] = seminar
+            self.touch()
+        return seminar
+
+    def add_exam(self, exam: Exam) -> Exam:
+        with self.lock:
+            self.exams.append(exam)
+            self.touch()
+        return exam
+
+    def add_notepad(self, shortcut: str, name: str = None, **kwargs) -> Notepad:
+        """Creates the notepad
+        Args:
+            shortcut(str): Shortcut of the notepad
+            name(str): Name of the notepad, the shortcut by default
+            **kwargs: Options of the ``Notepad`` (visible, complete, statistic)
+
+        Returns(Notepad): New notepad
+        """
+        with self.lock:
+            if shortcut in self.notepads:
+                raise StandInError(400, f"Blok se zkratkou {shortcut} již existuje.")
+            notepad = Notepad(len(self.notepads) + 1, shortcut, name or shortcut,
+                              changed=self.clock.stamp(), changed_by=self.owner, **kwargs)
+            self.notepads[shortcut] = notepad
+            self.touch()
+        return notepad
+
+    def write(self, shortcut: str, uco: int, content: str, last_change: str = None,
+              override: bool = True, author: int = None) -> Cell:
+        """Writes the content of the notepad cell
+        Args:
+            shortcut(str): Shortcut of the notepad
+            uco(int): UCO of the student
+            content(str): New content
+            last_change(str): Refuses the write if the cell has been changed since
+            override(bool): Overrides the content, otherwise only an empty cell is written
+            author(int): UCO of the author, the token owner by default
+
+        Returns(Cell): Written cell
+        """
+        with self.lock:
+            notepad = self.notepads.get(shortcut)
+            if notepad is None:
+                raise StandInError(400, f"Blok se zkratkou {shortcut} neexistuje.")
+            if uco not in self.students:
+                raise StandInError(400, f"Student {uco} není v předmětu.")
+            cell = notepad.cells.get(uco)
+            if cell is not None and last_change and cell.changed != last_change:
+                raise StandInError(400, f"Obsah bloku studenta {uco} byl mezitím změněn.")
+            if cell is not None and cell.content and not override:
+                raise StandInError(400, f"Obsah bloku studenta {uco} nelze přepsat.")
+            cell = Cell(content, self.clock.stamp(), author or self.owner)
+            notepad.cells[uco] = cell
+            self.touch()
+        return cell
+
+    @classmethod
+    def generate(cls, code: str, faculty_id: int, token: str, students: int = 100,
+                 notepads: int = 0, seminar_size: int = 20, first_uco: int = 100000,
+                 seed: int = 0) -> 'Course':
+        """Generates the course with the synthetic students, seminars and notepads
+        Args:
+            code(str): Course code
+            faculty_id(int): Id of the faculty
+            token(str): Token of the Notes API for the course
+            students(int): Number of the students
+            notepads(int): Number of the notepads (hw01, hw02, ...) with the points
+            seminar_size(int): Number of the students in each seminar
+            first_uco(int): UCO of the first student, the following ones are consecutive
+            seed(int): Seed of the random data
+
+        Returns(Course): Generated course
+        """
+        rng = random.Random(seed)
+        course = cls(code, faculty_id, token, name=f"Course {code}")
+        count = math.ceil(students / seminar_size) if students else 0
+        lecturer = course.add_teacher(Teacher(first_uco - 1, 'Jan', 'Přednášející',
+                                              'přednášející'))
+        for index in range(1, count + 1):
+            teacher = course.add_teacher(Teacher(first_uco - 1 - index,
+                                                 rng.choice(FIRST_NAMES),
+                                                 rng.choice(LAST_NAMES)))
+            course.add_seminar(Seminar(200000 + index, f"{index:02}", seminar_size,
+                                       (teacher.uco, lecturer.uco)))
+        for offset in range(students):
+            chance = rng.random()
+            course.add_student(Student(
+                first_uco + offset, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+                seminar=f"{offset // seminar_size + 1:02}" if chance < 0.9 else None,
+                registered=chance > 0.95, terminated=0.9 < chance <= 0.93,
+                inactive=0.93 < chance <= 0.95))
+        for index in range(1, notepads + 1):
+            notepad = course.add_notepad(f"hw{index:02}", f"Homework {index:02}")
+            for uco in course.students:
+                if rng.random() < 0.8:
+                    notepad.cells[uco] = Cell(f"*{rng.randint(0, 10)}", notepad.changed,
+                                              course.owner)
+        if students:
+            course.add_exam(Exam(1, '20210115090000', 'D1', students,
+                                 tuple(list(course.students)[:students // 2])))
+        course.touch()
+        return course
+
+
+class _FileNode(NamedTuple):
+    node_id: int
+    data: Optional[bytes]
+    updated_at: str
+
+
+class _Throttle:
+    """Non-blocking token bucket, tells how long to wait for the next request"""
+
+    def __init__(self, rate: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self._clock = clock
+        self._tokens = rate
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+
+class _ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+Latency = Union[float, Callable[[str], float]]
+FailWhen = Callable[[str, Params], Union[int, bool, None]]
+# Status, headers and body of the response, optionally the number of the bytes sent
+# before the transfer is interrupted
+Response = tuple
+
+
+def _etag(data: bytes) -> str:
+    return f'"{zlib.crc32(data):08x}-{len(data)}"'
+
+
+class StandInServer:
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: Latency = 0.0,
+                 error_rate: float = 0.0, rate: float = None, max_in_flight: int = None,
+                 fail_when: FailWhen = None, seed: int = None,
+                 clock: Callable[[], float] = time.monotonic, history: int = 10000):
+        """Creates the stand-in server, it is started by the ``start``
+        Args:
+            host(str): Address to listen on
+            port(int): Port to listen on, a free port by default
+            latency(Latency): Delay of each response in seconds,
+                or a function of the operation returning the delay
+            error_rate(float): Probability of the 500 response
+            rate(float): Maximal number of requests per second, the others get 429
+            max_in_flight(int): Maximal number of concurrent requests, the others get 503
+            fail_when(FailWhen): Called as ``fail_when(operation, params)``,
+                the returned status is sent instead of the response, True sends 500
+            seed(int): Seed of the random errors
+            clock(Callable[[], float]): Monotonic time in seconds of the throttling
+            history(int): Number of the latest requests kept in the ``requests``,
+                0 does not record them (e.g. for the long benchmark runs)
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_in_flight = max_in_flight
+        self.fail_when = fail_when
+        # The next file transfer is interrupted after the number of the bytes
+        self.cut_after: Optional[int] = None
+        self.courses: Dict[Tuple[int, str], Course] = {}
+        self.requests: Deque[Tuple[str, Params]] = deque(maxlen=history)
+        self.statuses = Counter()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._throttle = _Throttle(rate, clock) if rate else None
+        self._random = random.Random(seed)
+        self._files: Dict[str, _FileNode] = {}
+        # Urls of the nodes in each folder, in the order of their creation
+        self._folders: Dict[str, List[str]] = {}
+        self._files_rendered: Dict[str, bytes] = {}
+        self._clock = _Clock()
+        self._lock = threading.RLock()
+        self._server = _ThreadingServer((host, port), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        kwargs={'poll_interval': 0.05}, daemon=True)
+
+    @property
+    def domain(self) -> str:
+        """Domain of the server for the clients, used with the ``scheme='http'``"""
+        (host, port) = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self) -> 'StandInServer':
+        self._thread.start()
+        log.info(f"[STANDIN] Listening on http://{self.domain}")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def add_course(self, course: Course) -> Course:
+        with self._lock:
+            self.courses[course.key] = course
+        return course
+
+    def add_folder(self, url: str, updated_at: str = None):
+        """Creates the folder of the Files API, the url ends with ``/``"""
+        self._add_node(url if url.endswith('/') else url + '/', None, updated_at)
+
+    def add_file(self, url: str, data: bytes, updated_at: str = None):
+        """Creates or replaces the file of the Files API, its folders are created as well"""
+        self._add_node(url, data, updated_at)
+
+    def file(self, url: str) -> Optional[bytes]:
+        """Content of the file, None if there is no such file"""
+        node = self._files.get(url)
+        return node.data if node is not None else None
+
+    def _add_node(self, url: str, data: Optional[bytes], updated_at: str = None):
+        with self._lock:
+            stamp = updated_at or self._clock.stamp()
+            for index in range(1, len(url)):
+                # The parent folders
+                if url[index - 1] == '/' and url[:index] not in self._files:
+                    self._insert_node(url[:index], _FileNode(len(self._files) + 1, None, stamp))
+            previous = self._files.get(url)
+            node_id = previous.node_id if previous is not None else len(self._files) + 1
+            self._insert_node(url, _FileNode(node_id, data, stamp))
+            self._files_rendered.clear()
+
+    def _insert_node(self, url: str, node: _FileNode):
+        if url not in self._files:
+            parent = url[:url.rstrip('/').rfind('/') + 1]
+            if parent:
+                self._folders.setdefault(parent, []).append(url)
+        self._files[url] = node
+
+    # Dispatch of the requests
+
+    def _handle(self, method: str, path: str, query: str, headers,
+                body: bytes = None) -> Response:
+        params = parse_params(query)
+        if path == NOTES_PATH:
+            operation = _first(params, 'operace', '')
+        elif path == FILES_PATH:
+            operation = 'fmgr-upload' if method == 'POST' else 'fmgr'
+        elif path.startswith(CONTENT_PREFIX + '/') and method == 'GET':
+            operation = 'content'
+        else:
+            operation = 'unknown'
+        with self._lock:
+            entry = self._entry(operation, params, query)
+            if entry is not None:
+                self.requests.append(entry)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            overloaded = self.max_in_flight is not None and self.in_flight > self.max_in_flight
+        try:
+            delay = self.latency(operation) if callable(self.latency) else self.latency
+            if delay:
+                time.sleep(delay)
+            fault = self._fault(operation, params, overloaded)
+            if fault is not None:
+                return fault
+            try:
+                if operation == 'fmgr':
+                    return self._metadata(_first(params, 'url', ''))
+                if operation == 'fmgr-upload':
+                    return self._upload(params, body or b'')
+                if operation == 'content':
+                    return self._content(path[len(CONTENT_PREFIX):], headers)
+                if operation == 'unknown':
+                    raise StandInError(404, f"Stránka {path} neexistuje.")
+                return self._operation(operation, params)
+            except StandInError as ex:
+                return ex.status, {}, self._error(ex.message)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _entry(self, operation: str, params: Params, query: str):
+        """Entry of the request in the ``requests``, None does not record the request"""
+        return operation, params
+
+    def _fault(self, operation: str, params: Params, overloaded: bool) -> Optional[Response]:
+        if overloaded:
+            return 503, {}, self._error("Služba je přetížena.")
+        if self._throttle is not None:
+            wait = self._throttle.take()
+            if wait:
+                headers = {'Retry-After': str(math.ceil(wait))}
+                return 429, headers, self._error("Příliš mnoho požadavků.")
+        status = self.fail_when(operation, params) if self.fail_when is not None else None
+        if status:
+            return (500 if status is True else status), {}, self._error("Chyba serveru.")
+        if self.error_rate and self._random.random() < self.error_rate:
+            return 500, {}, self._error("Chyba serveru.")
+        return None
+
+    @staticmethod
+    def _error(message: str) -> bytes:
+        return f"<CHYBA>{escape(message)}</CHYBA>".encode('utf-8')
+
+    # Notes API
+
+    _RENDERERS = {
+        'predmet-info': '_course_info',
+        'predmet-seznam': '_course_students',
+        'seminar-seznam': '_seminar_students',
+        'seminar-cvicici-seznam': '_seminar_teachers',
+        'bloky-seznam': '_notes_list',
+        'blok-dej-obsah': '_notepad_content',
+        'terminy-seznam': '_exams',
+    }
+
+    def _operation(self, operation: str, params: Params):
+        try:
+            faculty_id = int(_first(params, 'fakulta', ''))
+        except ValueError:
+            raise StandInError(400, "Chybí parametr fakulta.")
+        course = self.courses.get((faculty_id, _first(params, 'kod')))
+        if course is None:
+            raise StandInError(404, f"Předmět {_first(params, 'kod')} neexistuje.")
+        if _first(params, 'klic') != course.token:
+            raise StandInError(403, "Neplatný klíč.")
+
+        if operation == 'blok-novy':
+            course.add_notepad(_first(params, 'zkratka', ''), _first(params, 'jmeno'),
+                               visible=_flag(params, 'nahlizi'),
+                               complete=not _flag(params, 'nedoplnovat'),
+                               statistic=_flag(params, 'statistika'))
+            return 200, {}, f"<BLOK_NOVY>{SAVED}</BLOK_NOVY>".encode('utf-8')
+        if operation == 'blok-pis-student-obsah':
+            course.write(_first(params, 'zkratka', ''), self._uco(_first(params, 'uco')),
+                         _first(params, 'obsah', ''), last_change=_first(params, 'poslzmeneno'),
+                         override=_flag(params, 'prepis'))
+            return 200, {}, f"<ZAPIS>{SAVED}</ZAPIS>".encode('utf-8')
+        renderer = self._RENDERERS.get(operation)
+        if renderer is None:
+            raise StandInError(400, f"Neznámá operace {operation}.")
+
+        key = (operation,) + tuple(sorted((name, tuple(values))
+                                          for (name, values) in params.items()
+                                          if name not in ('klic', 'fakulta', 'kod')))
+        with course.lock:
+            rendered = course._rendered.get(key)
+            if rendered is None:
+                rendered = getattr(self, renderer)(course, params).encode('utf-8')
+                course._rendered[key] = rendered
+        return 200, {}, rendered
+
+    @staticmethod
+    def _uco(value: Optional[str]) -> int:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise StandInError(400, f"Neplatné UČO {value}.")
+
+    @staticmethod
+    def _listed(student: Student, params: Params, registered: bool = True) -> bool:
+        return (not student.registered or (registered and _flag(params, 'zareg'))) \
+            and (not student.terminated or _flag(params, 'vcukonc')) \
+            and (not student.inactive or _flag(params, 'vcneaktiv'))
+
+    @staticmethod
+    def _person(person) -> str:
+        return (_tag('CELE_JMENO', f"{person.first_name} {person.last_name}")
+                + _tag('JMENO', person.first_name) + _tag('PRIJMENI', person.last_name)
+                + _tag('UCO', person.uco))
+
+    def _student(self, student: Student) -> str:
+        if student.terminated:
+            status = 'ukončené'
+        else:
+            status = 'neaktivní' if student.inactive else 'aktivní'
+        seminars = f"<SEMINARE><SEMINAR>{_tag('OZNACENI', student.seminar)}</SEMINAR></SEMINARE>" \
+            if student.seminar else "<SEMINARE/>"
+        return (f"<STUDENT>{self._person(student)}{seminars}"
+                f"{_tag('STAV_STUDIA', status)}"
+                f"{_tag('STAV_ZAPISU', 'registrováno' if student.registered else 'zapsáno')}"
+                f"{_tag('STUDENT_NEMA_SEMINAR', '0' if student.seminar else '1')}"
+                f"{_tag('UKONCENI', 'z')}</STUDENT>")
+
+    def _course_info(self, course: Course, params: Params) -> str:
+        sizes = Counter(student.seminar for student in course.students.values())
+        seminars = "".join(
+            f"<SEMINAR>{_tag('SEMINAR_ID', seminar.id)}{_tag('OZNACENI', seminar.label)}"
+            f"{_tag('MAX_STUDENTU', seminar.capacity)}"
+            f"{_tag('POCET_STUDENTU_VE_SKUPINE', sizes[seminar.label])}"
+            f"<POZNAMKA/></SEMINAR>" for seminar in course.seminars.values())
+        teachers = "".join(f"<VYUCUJICI>{self._person(teacher)}{_tag('ROLE', teacher.role)}"
+                           f"</VYUCUJICI>" for teacher in course.teachers.values())
+        enrolled = sum(1 for student in course.students.values() if not student.registered)
+        return (f"<PREDMET_INFO>{_tag('FAKULTA_ID', course.faculty_id)}"
+                f"{_tag('KOD_PREDMETU', course.code)}{_tag('NAZEV_PREDMETU', course.name)}"
+                f"{_tag('NAZEV_PREDMETU_ANGL', course.name)}"
+                f"{_tag('POCET_ZAPSANYCH_STUDENTU', enrolled)}"
+                f"{_tag('POCET_ZAREG_STUDENTU', len(course.students))}"
+                f"{_tag('PREDMET_ID', course.course_id)}<SEMINARE>{seminars}</SEMINARE>"
+                f"<VYUCUJICI_SEZNAM>{teachers}</VYUCUJICI_SEZNAM></PREDMET_INFO>")
+
+    def _course_students(self, course: Course, params: Params) -> str:
+        students = "".join(self._student(student) for student in course.students.values()
+                           if self._listed(student, params))
+        return f"<PREDMET_STUDENTI_INFO>{students}</PREDMET_STUDENTI_INFO>"
+
+    def _selected_seminars(self, course: Course, params: Params) -> Iterable[Seminar]:
+        labels = params.get('seminar')
+        if not labels:
+            return course.seminars.values()
+        return [course.seminars[label] for label in labels if label in course.seminars]
+
+    def _seminar_students(self, course: Course, params: Params) -> str:
+        members = {}
+        for student in course.students.values():
+            if student.seminar is not None and self._listed(student, params, registered=False):
+                members.setdefault(student.seminar, []).append(self._student(student))
+        seminars = "".join(
+            f"<SEMINAR>{_tag('OZNACENI', seminar.label)}{_tag('SEMINAR_ID', seminar.id)}"
+            + "".join(members.get(seminar.label, ()))
+            + "</SEMINAR>" for seminar in self._selected_seminars(course, params))
+        return f"<SEMINAR_STUDENTI_INFO>{seminars}</SEMINAR_STUDENTI_INFO>"
+
+    def _seminar_teachers(self, course: Course, params: Params) -> str:
+        seminars = "".join(
+            f"<SEMINAR>{_tag('OZNACENI', seminar.label)}{_tag('SEMINAR_ID', seminar.id)}"
+            + "".join(f"<CVICICI>{self._person(course.teachers[uco])}</CVICICI>"
+                      for uco in seminar.teachers if uco in course.teachers)
+            + "</SEMINAR>" for seminar in self._selected_seminars(course, params))
+        return f"<SEMINAR_CVICICI_INFO>{seminars}</SEMINAR_CVICICI_INFO>"
+
+    def _notes_list(self, course: Course, params: Params) -> str:
+        notes = "".join(
+            f"<POZN_BLOK>{_tag('BLOK_ID', note.id)}{_tag('JMENO', note.name)}"
+            f"{_tag('NEDOPLNOVAT_CHYBEJICI_STUDIA', 'n' if note.complete else 'a')}"
+            f"{_tag('STUDENTOVI_ZOBRAZIT_STATISTIKU', 'a' if note.statistic else 'n')}"
+            f"{_tag('STUDENT_SMI_NAHLIZET', 'a' if note.visible else 'n')}"
+            f"<TYP_ID>1</TYP_ID><TYP_NAZEV>obecný blok</TYP_NAZEV>"
+            f"{_tag('ZKRATKA', note.shortcut)}{_tag('ZMENENO', note.changed)}"
+            f"{_tag('ZMENIL', note.changed_by)}</POZN_BLOK>" for note in course.notepads.values())
+        return f"<POZN_BLOKY_INFO>{notes}</POZN_BLOKY_INFO>"
+
+    def _notepad_content(self, course: Course, params: Params) -> str:
+        shortcut = _first(params, 'zkratka')
+        notepad = course.notepads.get(shortcut)
+        if notepad is None:
+            raise StandInError(400, f"Blok se zkratkou {shortcut} neexistuje.")
+        if params.get('uco'):
+            ucos = [uco for uco in map(self._uco, params['uco']) if uco in course.students]
+        else:
+            ucos = [uco for (uco, student) in course.students.items()
+                    if self._listed(student, params, registered=False)]
+        rows = []
+        for uco in ucos:
+            cell = notepad.cells.get(uco)
+            if cell is None:
+                rows.append(f"<STUDENT><NEMA_POZN_BLOK>1</NEMA_POZN_BLOK>{_tag('UCO', uco)}"
+                            f"</STUDENT>")
+            else:
+                rows.append(f"<STUDENT>{_tag('OBSAH', cell.content)}{_tag('UCO', uco)}"
+                            f"{_tag('ZMENENO', cell.changed)}{_tag('ZMENIL', cell.changed_by)}"
+                            f"</STUDENT>")
+        return f"<BLOKY_OBSAH>{''.join(rows)}</BLOKY_OBSAH>"
+
+    def _exams(self, course: Course, params: Params) -> str:
+        exams = "".join(
+            f"<TERMIN>{_tag('TERMIN_ID', exam.id)}{_tag('DATUM', exam.date)}"
+            f"{_tag('MISTNOST', exam.room)}{_tag('MAX_STUDENTU', exam.capacity)}"
+            + "".join(f"<STUDENT>{_tag('UCO', uco)}</STUDENT>" for uco in exam.students
+                      if uco in course.students
+                      and self._listed(course.students[uco], params, registered=False))
+            + "</TERMIN>" for exam in course.exams)
+        return f"<TERMINY_INFO>{exams}</TERMINY_INFO>"
+
+    # Files API
+
+    def _node(self, url: str, node: _FileNode, subnodes: int) -> str:
+        name = url.rstrip('/').rsplit('/', 1)[-1]
+        parent = self._files.get(url[:url.rstrip('/').rfind('/') + 1])
+        return (f"{_tag('nazev', name)}{_tag('zkratka', name)}{_tag('uzel_id', node.node_id)}"
+                f"{_tag('rodic_id', parent.node_id if parent is not None else 0)}"
+                f"{_tag('cesta', url)}{_tag('zmeneno', node.updated_at)}"
+                f"{_tag('pocet_objektu', 0 if node.data is None else 1)}"
+                f"{_tag('pocet_poduzlu', subnodes)}<smi_cist_auth>1</smi_cist_auth>")
+
+    def _children(self, url: str) -> List[str]:
+        return self._folders.get(url, []) if url.endswith('/') else []
+
+    def _metadata(self, url: str):
+        with self._lock:
+            rendered = self._files_rendered.get(url)
+            if rendered is None:
+                node = self._files.get(url)
+                if node is None:
+                    raise StandInError(404, f"Uzel {url} neexistuje.")
+                children = self._children(url)
+                listed = "".join(
+                    f"<poduzel>{self._node(child, self._files[child], len(self._children(child)))}"
+                    f"</poduzel>" for child in children)
+                rendered = (f"<fmgr><uzel>{self._node(url, node, len(children))}"
+                            f"<poduzly>{listed}</poduzly></uzel></fmgr>").encode('utf-8')
+                self._files_rendered[url] = rendered
+        return 200, {}, rendered
+
+    def _upload(self, params: Params, body: bytes):
+        folder = _first(params, 'url', '')
+        name = _first(params, 'nazev')
+        if folder not in self._files or not folder.endswith('/') or not name:
+            raise StandInError(404, f"Složka {folder} neexistuje.")
+        self.add_file(folder + name, body)
+        return self._metadata(folder + name)
+
+    def _file_content(self, url: str) -> Optional[bytes]:
+        return self.file(url)
+
+    def _content(self, url: str, headers) -> Response:
+        data = self._file_content(url)
+        if data is None:
+            raise StandInError(404, f"Soubor {url} neexistuje.")
+        etag = _etag(data)
+        requested = headers.get('Range')
+        if requested and headers.get('If-Range') not in (None, etag):
+            # The file has changed, the whole content is sent instead of the range
+            requested = None
+        with self._lock:
+            (cut, self.cut_after) = (self.cut_after, None)
+        if not requested:
+            return 200, {'Content-Type': 'application/octet-stream', 'ETag': etag}, data, cut
+        start = int(requested[len('bytes='):].split('-')[0] or 0)
+        if start >= len(data):
+            return 416, {'Content-Range': f"bytes */{len(data)}", 'ETag': etag}, b''
+        return 206, {'Content-Type': 'application/octet-stream', 'ETag': etag,
+                     'Content-Range': f"bytes {start}-{len(data) - 1}/{len(data)}"}, \
+            data[start:], cut
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # The headers and the body are written separately, Nagle would delay the body
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                self._send(*standin._handle('GET', url.path, url.query, self.headers))
+
+            def do_POST(self):
+                url = urlsplit(self.path)
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length) if length else b''
+                self._send(*standin._handle('POST', url.path, url.query, self.headers, body))
+
+            def _send(self, status: int, headers: Dict[str, str], body: bytes,
+                      cut: int = None):
+                with standin._lock:
+                    standin.statuses[status] += 1
+                self.send_response(status)
+                self.send_header('Content-Type', headers.pop('Content-Type',
+                                                             'text/xml; charset=utf-8'))
+                for (name, value) in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if cut is not None:
+                    # The interrupted transfer, the connection is closed
+                    self.wfile.write(body[:cut])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(body)
+
+            def log_message(self, fmt, *args):
+                log.debug(f"[STANDIN] {fmt % args}")
+
+        return Handler
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Stand-in server of the IS Notes and Files API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--course', default='PB000', help="Course code")
+    parser.add_argument('--faculty', type=int, default=1433, help="Id of the faculty")
+    parser.add_argument('--token', default='secret_token', help="Token of the Notes API")
+    parser.add_argument('--students', type=int, default=100)
+    parser.add_argument('--notepads', type=int, default=5)
+    parser.add_argument('--files', type=int, default=0,
+                        help="Number of the files in the folder of the course")
+    parser.add_argument('--latency', type=float, default=0.0, help="Delay in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="Probability of the 500 response")
+    parser.add_argument('--rate', type=float, help="Maximal number of requests per second")
+    parser.add_argument('--max-in-flight', type=int,
+                        help="Maximal number of concurrent requests")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    server = StandInServer(args.host, args.port, latency=args.latency,
+                           error_rate=args.error_rate, rate=args.rate,
+                           max_in_flight=args.max_in_flight)
+    server.add_course(Course.generate(args.course, args.faculty, args.token,
+                                      students=args.students, notepads=args.notepads))
+    folder = f"/el/{args.faculty}/{args.course}/odp/"
+    server.add_folder(folder)
+    for index in range(args.files):
+        server.add_file(f"{folder}file{index}.txt", f"File {index}\n".encode('utf-8'))
+    server.start()
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
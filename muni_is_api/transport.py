@@ -0,0 +1,92 @@
+"""
+Configuration of the HTTP transport (connection pool, keep-alive and timeouts)
+
+One transport can be shared by many clients, they share its connection pool then:
+
+    transport = Transport(pool_maxsize=50, read_timeout=30)
+    clients = [IsApiClient(..., transport=transport) for ... in courses]
+"""
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from typing import Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 120.0
+
+
+class Transport:
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10,
+                 connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT,
+                 keep_alive: bool = True, pool_block: bool = False):
+        """Creates the transport configuration
+        Args:
+            pool_connections(int): Number of the pools (hosts) to cache
+            pool_maxsize(int): Maximal number of the connections kept in the pool per host,
+                should be at least the number of the concurrent requests
+            connect_timeout(float): Timeout of the connection in seconds, None is unlimited
+            read_timeout(float): Timeout between the received bytes in seconds,
+                None is unlimited
+            keep_alive(bool): Reuse the connections for the next requests
+            pool_block(bool): Wait for a free connection instead of opening a new one,
+                when the pool is exhausted
+        """
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._keep_alive = keep_alive
+        self._pool_block = pool_block
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self) -> Tuple[Optional[float], Optional[float]]:
+        """Timeout for the requests
+        Returns(Tuple): Connect and read timeout
+        """
+        return self._connect_timeout, self._read_timeout
+
+    @property
+    def pool_maxsize(self) -> int:
+        return self._pool_maxsize
+
+    @property
+    def session(self) -> requests.Session:
+        """Session with the connection pool shared by all clients using the transport
+        Returns(requests.Session): Shared session
+        """
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self.create_session()
+        return self._session
+
+    def create_session(self) -> requests.Session:
+        """Creates a new session with the configured connection pool
+        Returns(requests.Session): Session instance
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self._pool_connections,
+                              pool_maxsize=self._pool_maxsize,
+                              pool_block=self._pool_block)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not self._keep_alive:
+            session.headers['Connection'] = 'close'
+        log.debug(f"[TRANSPORT] Created session: pool={self._pool_maxsize}, "
+                  f"timeout={self.timeout}, keep_alive={self._keep_alive}")
+        return session
+
+    def close(self):
+        """Closes the shared session and its connections"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
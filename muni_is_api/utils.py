@@ -1,7 +1,11 @@
 import requests
+from lxml import etree
+from requests.sessions import merge_setting
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_auth_from_url, get_netrc_auth, requote_uri
 
-from defusedxml.lxml import RestrictedElement, fromstring
-from typing import Dict, Optional
+from defusedxml.lxml import RestrictedElement, check_docinfo, fromstring
+from typing import BinaryIO, Dict, Iterator, Optional
 
 import logging
 
@@ -14,7 +18,42 @@ def serialize(response: requests.Response) -> Optional[RestrictedElement]:
         response(requests.Response): XML response
     Returns(Dict): Serialized dictionary
     """
-    return fromstring(response.content) if response.ok else None
+    return parse(response.content) if response.ok else None
+
+
+def parse(content: bytes) -> RestrictedElement:
+    """Parses the xml content of the response
+    Args:
+        content(bytes): Raw xml content
+
+    Returns(RestrictedElement): Root element of the parsed document
+    """
+    return fromstring(content)
+
+
+def iterparse(source: BinaryIO, tag: str) -> Iterator[etree._Element]:
+    """Parses the xml incrementally and yields the complete elements with the tag
+    The yielded elements are cleared afterwards, so the memory stays flat. The entities are
+    neither loaded nor expanded and the documents declaring them are rejected as in ``parse``.
+
+    Args:
+        source(BinaryIO): Stream with the xml content
+        tag(str): Tag of the yielded elements
+
+    Returns(Iterator[etree._Element]): Elements in the document order
+    """
+    context = etree.iterparse(source, events=('end',), tag=tag, resolve_entities=False,
+                              no_network=True, load_dtd=False, huge_tree=False)
+    checked = False
+    for (_, element) in context:
+        if not checked:
+            check_docinfo(element.getroottree())
+            checked = True
+        yield element
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        while parent is not None and element.getprevious() is not None:
+            del parent[0]
 
 
 def params_serialize(params: Dict) -> str:
@@ -26,13 +65,25 @@ def params_serialize(params: Dict) -> str:
 
     """
 
-    builder = ""
+    parts = []
     for (key, val) in params.items():
         if isinstance(val, list) or isinstance(val, tuple):
-            builder += _params_iter(key, val) + ";"
+            parts.append(_params_iter(key, val))
         else:
-            builder += f"{key}={val};"
-    return builder
+            parts.append(f"{key}={val}")
+    parts.append("")
+    return ";".join(parts)
+
+
+def build_url(url: str, params: Dict) -> str:
+    """Builds the full request url the same way as ``requests`` does for serialized params
+    Args:
+        url(str): Base url
+        params(Dict): dictionary of params
+
+    Returns(str): Full quoted url
+    """
+    return requote_uri(f"{url}?{params_serialize(params)}")
 
 
 def _params_iter(name, col):
@@ -40,18 +91,89 @@ def _params_iter(name, col):
 
 
 def make_get_request(session: requests.Session, url: str,
-                     params: Dict, fail=False) -> Optional[requests.Response]:
+                     params: Dict, fail=False, stream=False,
+                     **kwargs) -> Optional[requests.Response]:
     serialized = params_serialize(params)
     log.debug(f"[REQ] New: {url} : {serialized}")
-    res = session.get(url, params=serialized)
+    res = session.get(url, params=serialized, stream=stream, **kwargs)
+    return _check_response(res, fail=fail, stream=stream)
+
+
+class GetTemplate:
+    """GET request of the url prepared by the session once, every request only adds its query
+
+    The proxies, the certificates and the ``.netrc`` credentials from the environment are
+    resolved when the template is created, a changed session needs a new template.
+    The headers, the cookies and the authentication of the session are applied to every
+    request, so their later changes are sent as by the ``Session.request``.
+    """
+    __slots__ = ('session', '_request', '_url', '_settings', '_auth', '_headers')
+
+    def __init__(self, session: requests.Session, url: str):
+        """Creates the template
+        Args:
+            session(requests.Session): Session which sends the requests
+            url(str): Url without the query
+        """
+        self.session = session
+        self._request = session.prepare_request(requests.Request('GET', url))
+        self._url = self._request.url
+        self._settings = session.merge_environment_settings(self._url, {}, None, None, None)
+        # The same precedence as the ``Session.prepare_request``: the session, .netrc, the url
+        url_auth = get_auth_from_url(self._url)
+        netrc_auth = get_netrc_auth(self._url) if session.trust_env else None
+        self._auth = netrc_auth or (url_auth if any(url_auth) else None)
+        # Session headers and their prepared copy, prepared again only when they change
+        self._headers = (None, None)
+
+    def send(self, query: str, fail=False, stream=False,
+             **kwargs) -> Optional[requests.Response]:
+        """Sends the request, the same as the ``make_get_request`` does
+        Args:
+            query(str): Serialized and quoted params (see the ``requote_uri``)
+            fail(bool): Throw an exception if the request has not been successful
+            stream(bool): Do not read the body of the response
+            **kwargs: Options of the ``Session.send``, for example the ``timeout``
+
+        Returns(requests.Response): Response
+        """
+        session = self.session
+        request = self._request.copy()
+        request.url = f"{self._url}?{query}"
+        request.headers = self._prepared_headers()
+        if session.cookies:
+            request.prepare_cookies(session.cookies.copy())
+        auth = session.auth or self._auth
+        if auth is not None:
+            request.prepare_auth(auth)
+        log.debug(f"[REQ] New: {self._url} : {query}")
+        res = session.send(request, **{**self._settings, 'stream': stream,
+                                       'allow_redirects': True, **kwargs})
+        return _check_response(res, fail=fail, stream=stream)
+
+    def _prepared_headers(self) -> CaseInsensitiveDict:
+        (seen, prepared) = self._headers
+        headers = self.session.headers
+        if seen is None or headers != seen:
+            request = requests.PreparedRequest()
+            request.prepare_headers(merge_setting({}, headers, dict_class=CaseInsensitiveDict))
+            (seen, prepared) = self._headers = (headers.copy(), request.headers)
+        return prepared.copy()
+
 
-    if res.ok:
-        log.debug(f"[RES] Response[{res.status_code}]: {res.content}")
+def _check_response(res: requests.Response, fail=False,
+                    stream=False) -> Optional[requests.Response]:
+    if res.ok and stream:
+        log.debug(f"[RES] Response[{res.status_code}]: streamed")
+    elif res.ok:
+        # The body is not interpolated, it would be formatted even with debug disabled
+        log.debug(f"[RES] Response[{res.status_code}]: {len(res.content)} bytes")
     else:
         content = res.content
         log.error(f"[RES] Response[{res.status_code}]: {content} - "
                   f"\"{content.decode('utf-8')}\"")
         if fail:
             from muni_is_api import errors
-            raise errors.ISApiError(message=content.decode('utf-8'))
+            raise errors.ISApiError(message=content.decode('utf-8'),
+                                    status_code=res.status_code, headers=res.headers)
     return res
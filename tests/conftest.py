@@ -1,17 +1,81 @@
+import functools
+
 import pytest
+from defusedxml.lxml import fromstring
 
 import muni_is_api
 import muni_is_api.log_config
+from muni_is_api import scoring
+from muni_is_api.standin import Course, StandInServer
+from tests.server import StubServer
 
 muni_is_api.log_config.load_config()
 
+TOKEN = 'secret_token'
+
+
+def parse_entity(cls, xml: str):
+    """Entity of the class over the parsed xml (e.g. the ``tests.sample`` responses)"""
+    return cls(fromstring(xml.strip().encode('utf-8')))
+
 
 @pytest.fixture()
 def stub_params() -> dict:
-    return dict(domain='localhost', token='secret_token',
+    return dict(domain='localhost', token=TOKEN,
                 course_code='PB071', faculty_id=101)
 
 
+@pytest.fixture()
+def client_factory(stub_params):
+    """Creates the clients of a test server: ``client_factory(server, cls=..., **kwargs)``
+    The IS API clients (``IsApiClient`` by default) use the course of the ``stub_params``
+    on the stub server and PB000 (faculty 1433) on the stand-in server.
+    """
+    def factory(server, cls: type = muni_is_api.IsApiClient, **kwargs):
+        if cls is muni_is_api.FilesApiClient:
+            params = dict(uco='1', password='password')
+        elif isinstance(server, StubServer):
+            params = dict(stub_params)
+        else:
+            params = dict(token=TOKEN, course_code='PB000', faculty_id=1433)
+        params.update(domain=server.domain, scheme='http')
+        return cls(**{**params, **kwargs})
+
+    return factory
+
+
+@pytest.fixture()
+def files_client_factory(client_factory):
+    """The ``client_factory`` of the ``FilesApiClient``"""
+    return functools.partial(client_factory, cls=muni_is_api.FilesApiClient)
+
+
 @pytest.fixture()
 def is_stub(stub_params) -> muni_is_api.IsApiClient:
     return muni_is_api.IsApiClient(**stub_params)
+
+
+@pytest.fixture()
+def stub_server():
+    server = StubServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture()
+def standin():
+    """Stand-in server with the course PB000 (faculty 1433) of 50 students and 2 notepads"""
+    server = StandInServer(seed=1).start()
+    server.add_course(Course.generate('PB000', 1433, TOKEN, students=50, notepads=2))
+    yield server
+    server.stop()
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def backend(request, monkeypatch):
+    """Runs the test with the pure Python and the ``numpy`` scoring (skipped without it)"""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(scoring, 'numpy', None)
+    return request.param
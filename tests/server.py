@@ -0,0 +1,148 @@
+from urllib.parse import unquote_plus
+
+from typing import Optional
+
+from muni_is_api.standin import Params, StandInError, StandInServer
+from tests import sample
+
+RESPONSES = {
+    'predmet-info': sample.PREDMET_INFO,
+    'predmet-seznam': sample.COURSE_LIST_STUDENTS,
+    'seminar-seznam': sample.SEMINARY_LIST_STUDENTS,
+    'seminar-cvicici-seznam': sample.SEMINARY_LIST_TEACHERS,
+    'bloky-seznam': sample.NOTES_LIST,
+    'blok-dej-obsah': sample.BLOCKS_CONTENT,
+    'blok-novy': "<BLOK_NOVY>Úspěšně uloženo.</BLOK_NOVY>",
+    'blok-pis-student-obsah': "<ZAPIS>Úspěšně uloženo.</ZAPIS>",
+}
+
+
+def parse_query(query: str) -> list:
+    """Parses the `;` separated query into the list of (name, value) pairs"""
+    pairs = []
+    for part in query.split(';'):
+        if not part:
+            continue
+        name, _, value = part.partition('=')
+        pairs.append((unquote_plus(name), unquote_plus(value)))
+    return pairs
+
+
+def _notepad_content(ucos: list) -> str:
+    students = "".join(f"<STUDENT><OBSAH>{uco} bodů</OBSAH><UCO>{uco}</UCO>"
+                       f"<ZMENENO>20160111104208</ZMENENO><ZMENIL>1</ZMENIL></STUDENT>"
+                       for uco in ucos)
+    return f"<BLOKY_OBSAH>{students}</BLOKY_OBSAH>"
+
+
+def notes_list(shortcuts: list) -> str:
+    """Generates the notepad list with the notepads of the shortcuts"""
+    notes = "".join(f"<POZN_BLOK><BLOK_ID>{index}</BLOK_ID><JMENO>{shortcut}</JMENO>"
+                    f"<ZKRATKA>{shortcut}</ZKRATKA></POZN_BLOK>"
+                    for (index, shortcut) in enumerate(shortcuts, start=1))
+    return f"<POZN_BLOKY_INFO>{notes}</POZN_BLOKY_INFO>"
+
+
+def notepad_content(contents: dict) -> str:
+    """Generates the notepad content with the content of each UCO"""
+    students = "".join(f"<STUDENT><OBSAH>{content}</OBSAH><UCO>{uco}</UCO></STUDENT>"
+                       for (uco, content) in contents.items())
+    return f"<BLOKY_OBSAH>{students}</BLOKY_OBSAH>"
+
+
+def _node_fields(node_id: int, path: str, objects: int, subnodes: int, updated_at: str) -> str:
+    name = path.rstrip('/').rsplit('/', 1)[-1]
+    return (f"<nazev>{name}</nazev><zkratka>{name}</zkratka><uzel_id>{node_id}</uzel_id>"
+            f"<cesta>{path}</cesta><zmeneno>{updated_at}</zmeneno>"
+            f"<pocet_objektu>{objects}</pocet_objektu><pocet_poduzlu>{subnodes}</pocet_poduzlu>")
+
+
+def files_tree(root: str = '/el/fi/PB071/', depth: int = 2, fanout: int = 3, files: int = 0,
+               updated_at: str = '20200101120000', updated: dict = None) -> dict:
+    """Generates the fmgr payloads of the tree, keyed by the url of the node
+
+    The folders have the paths ending with ``/``, the deepest folders contain ``files`` files.
+    The ``updated`` overrides the change time of the nodes, a folder has the latest
+    change time of its subtree.
+    """
+    updated = updated or {}
+    nodes = {}
+    ids = iter(range(1, 10 ** 9))
+
+    def _add(path: str, level: int):
+        children = []
+        if level < depth:
+            children = [f"{path}{index}/" for index in range(fanout)]
+        elif path.endswith('/'):
+            children = [f"{path}file{index}.txt" for index in range(files)]
+        nodes[path] = (next(ids), children)
+        for child in children:
+            _add(child, level + 1 if child.endswith('/') else level)
+
+    def _fields(path: str) -> str:
+        (node_id, children) = nodes[path]
+        changes = [stamp for (changed, stamp) in updated.items() if changed.startswith(path)]
+        return _node_fields(node_id, path, 0 if path.endswith('/') else 1, len(children),
+                            max(changes + [updated_at]))
+
+    _add(root, 0)
+    payloads = {}
+    for (path, (_, children)) in nodes.items():
+        listed = "".join(f"<poduzel>{_fields(child)}</poduzel>" for child in children)
+        payloads[path] = f"<fmgr><uzel>{_fields(path)}<poduzly>{listed}</poduzly></uzel></fmgr>"
+    return payloads
+
+
+class StubServer(StandInServer):
+    """Stand-in server answering with the sample payloads of the IS Notes API
+
+    The requests are not validated, every operation returns its payload from the ``responses``.
+    The Files API serves the metadata of the ``files`` and the content of the ``blobs``,
+    the ``requests`` are the (name, value) pairs of the queries.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(latency=latency)
+        self.responses = dict(RESPONSES)
+        self.notepads = {}
+        self.files = {}
+        self.blobs = {}
+        self.uploads = {}
+        self.ranges = []
+
+    def _entry(self, operation: str, params: Params, query: str):
+        # The file transfers are recorded in the ranges
+        return parse_query(query) if operation != 'content' else None
+
+    def _operation(self, operation: str, params: Params):
+        if operation not in self.responses:
+            raise StandInError(400, f"Unknown operation: {operation}")
+        shortcut = params.get('zkratka', [None])[0]
+        if operation == 'blok-dej-obsah' and shortcut in self.notepads:
+            body = self.notepads[shortcut]
+        elif operation == 'blok-dej-obsah' and params.get('uco'):
+            body = _notepad_content(params['uco'])
+        else:
+            body = self.responses[operation]
+        return 200, {}, body.encode('utf-8')
+
+    def _metadata(self, url: str):
+        if url not in self.files:
+            raise StandInError(404, "Nenalezeno")
+        return 200, {}, self.files[url].encode('utf-8')
+
+    def _upload(self, params: Params, body: bytes):
+        url = params.get('url', [None])[0]
+        if url not in self.files:
+            raise StandInError(404, "Nenalezeno")
+        with self._lock:
+            self.uploads[(url, params.get('nazev', [None])[0])] = body
+        return 200, {}, b"<fmgr><uzel><nazev>ok</nazev></uzel></fmgr>"
+
+    def _file_content(self, url: str) -> Optional[bytes]:
+        return self.blobs.get(url)
+
+    def _content(self, url: str, headers):
+        with self._lock:
+            self.ranges.append(headers.get('Range'))
+        return super()._content(url, headers)
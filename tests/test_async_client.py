@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from muni_is_api import cache, entities, errors
+from muni_is_api.async_client import AsyncIsApiClient
+from muni_is_api.retry import RetryPolicy
+from muni_is_api.standin import Course
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_async_course_info(client_factory, stub_params, stub_server):
+    async def _test():
+        async with client_factory(stub_server, cls=AsyncIsApiClient) as client:
+            return await client.course_info()
+
+    response = _run(_test())
+    assert isinstance(response, entities.CourseInfo)
+    assert response.course.code == 'PB161'
+    assert response.seminars[0].id == 12364
+    query = dict(stub_server.requests[0])
+    assert query['operace'] == 'predmet-info'
+    assert query['klic'] == stub_params['token']
+    assert query['kod'] == stub_params['course_code']
+
+
+def test_async_operations_send_same_params(client_factory, stub_server):
+    async def _test():
+        async with client_factory(stub_server, cls=AsyncIsApiClient) as client:
+            return await asyncio.gather(
+                client.notepad_content(shortcut='foo', ucos=[1, 2]),
+                client.seminar_list_students(seminars=['01', '02']),
+                client.notepad_update(shortcut='blok4', uco=123456, content="Foo points *2"),
+            )
+
+    content, seminars, update = _run(_test())
+    assert content.students[0].content == "1 bodů"
+    assert len(seminars.seminars) == 2
+    assert update('/ZAPIS') == "Úspěšně uloženo."
+    by_operation = {dict(query)['operace']: query for query in stub_server.requests}
+    assert ('uco', '1') in by_operation['blok-dej-obsah']
+    assert ('uco', '2') in by_operation['blok-dej-obsah']
+    assert dict(by_operation['blok-pis-student-obsah'])['obsah'] == "Foo points *2"
+
+
+def test_async_concurrency_is_bounded(client_factory, stub_server):
+    stub_server.latency = 0.05
+
+    async def _test():
+        async with client_factory(stub_server, cls=AsyncIsApiClient, limit=5) as client:
+            return await asyncio.gather(*[client.notepad_list() for _ in range(20)])
+
+    results = _run(_test())
+    assert len(results) == 20
+    assert all(result.notes[0].shortcut == 'tst_x' for result in results)
+    assert 1 < stub_server.peak_in_flight <= 5
+
+
+def test_async_error_raises(client_factory, stub_server):
+    async def _test():
+        async with client_factory(stub_server, cls=AsyncIsApiClient) as client:
+            return await client.http.operation('unknown-operation')
+
+    with pytest.raises(errors.ISApiError):
+        _run(_test())
+
+
+def test_async_read_is_retried(client_factory, stub_server):
+    failures = []
+
+    def _fail_twice(operation, params):
+        if operation == 'predmet-info' and len(failures) < 2:
+            failures.append(params)
+            return 503
+        return None
+
+    stub_server.fail_when = _fail_twice
+
+    async def _test():
+        retry = RetryPolicy(backoff=0.01)
+        async with client_factory(stub_server, cls=AsyncIsApiClient, retry=retry) as client:
+            return await client.course_info(), client.stats()['predmet-info']
+
+    (response, stats) = _run(_test())
+    assert response.course.code == 'PB161'
+    assert len(stub_server.requests) == 3
+    assert (stats.requests, stats.retries) == (3, 2)
+
+
+def test_async_shared_cache_keeps_courses_apart(client_factory, standin):
+    standin.add_course(Course('PB161', 1433, 'other_token'))
+    shared = cache.MemoryCache()
+
+    async def _test():
+        async with client_factory(standin, cls=AsyncIsApiClient, cache=shared) as first, \
+                client_factory(standin, cls=AsyncIsApiClient, token='other_token',
+                               course_code='PB161', cache=shared) as second:
+            return [(await client.course_info()).course.code
+                    for client in (first, second, first, second)]
+
+    assert _run(_test()) == ['PB000', 'PB161', 'PB000', 'PB161']
+    assert len(standin.requests) == 2
@@ -0,0 +1,48 @@
+import time
+
+from muni_is_api import errors
+
+
+def test_notepad_update_many_reports_per_uco(client_factory, stub_server):
+    stub_server.fail_when = lambda operation, params: params.get('uco') == ['3']
+    progress = []
+    client = client_factory(stub_server)
+    contents = {uco: f"{uco} points" for uco in range(1, 6)}
+    results = client.notepad_update_many(
+        'hw01', contents, workers=3,
+        progress=lambda done, total, result: progress.append((done, total)))
+
+    assert list(results) == [1, 2, 3, 4, 5]
+    assert [uco for (uco, result) in results.items() if not result.ok] == [3]
+    assert isinstance(results[3].error, errors.ISApiError)
+    assert results[1].value('/ZAPIS') == "Úspěšně uloženo."
+    assert sorted(progress) == [(done, 5) for done in range(1, 6)]
+    written = {dict(query)['uco']: dict(query)['obsah'] for query in stub_server.requests}
+    assert written['4'] == "4 points"
+
+
+def test_notepad_update_many_respects_limits(client_factory, stub_server):
+    stub_server.latency = 0.02
+    client = client_factory(stub_server)
+    start = time.monotonic()
+    results = client.notepad_update_many('hw01', {uco: 'x' for uco in range(10)},
+                                         workers=2, rate=100)
+    assert all(result.ok for result in results.values())
+    assert stub_server.peak_in_flight <= 2
+    assert time.monotonic() - start >= 0.09
+
+
+def test_sync_notepad_writes_only_changed_cells(client_factory, stub_server):
+    client = client_factory(stub_server)
+    desired = {1: "1 bodů", 2: "2 bodů", 3: "10 bodů", 4: "4 bodů"}
+    result = client.sync_notepad('hw01', desired)
+
+    assert sorted(result.unchanged) == [1, 2, 4]
+    assert list(result.written) == [3]
+    assert result.written[3].ok
+    writes = [dict(query) for query in stub_server.requests
+              if dict(query)['operace'] == 'blok-pis-student-obsah']
+    assert len(writes) == 1
+    assert writes[0]['uco'] == '3'
+    assert writes[0]['obsah'] == "10 bodů"
+    assert writes[0]['poslzmeneno'] == "20160111104208"
@@ -0,0 +1,133 @@
+import time
+
+from defusedxml.lxml import tostring
+
+from muni_is_api import cache, utils
+from muni_is_api.standin import Course
+from tests import sample
+
+
+def test_normalize_params_ignores_token_and_order():
+    first = cache.normalize_params({'klic': 'a', 'zkratka': 'hw', 'uco': [1, 2]})
+    second = cache.normalize_params({'uco': ('1', '2'), 'zkratka': 'hw', 'klic': 'b'})
+    assert first == second
+
+
+def test_memory_cache_hits(client_factory, stub_server):
+    client = client_factory(stub_server, cache=cache.MemoryCache())
+    first = client.course_info()
+    second = client.course_info()
+    assert second.course.code == first.course.code == 'PB161'
+    assert len(stub_server.requests) == 1
+    stats = client.http.cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+
+def test_memory_cache_ttl_and_lru():
+    memory = cache.MemoryCache(max_size=2, ttl={'predmet-info': 0.05})
+    memory.set('predmet-info', {}, 'info')
+    memory.set('bloky-seznam', {}, 'notes')
+    memory.set('blok-dej-obsah', {'zkratka': 'a'}, 'a')
+    assert memory.stats().evictions == 1
+    assert memory.get('predmet-info', {}) is None
+    assert memory.get('bloky-seznam', {}) == 'notes'
+    memory.set('predmet-info', {}, 'info')
+    time.sleep(0.06)
+    assert memory.get('predmet-info', {}) is None
+    memory.set('blok-pis-student-obsah', {'zkratka': 'a', 'uco': 1}, 'written')
+    assert memory.get('blok-pis-student-obsah', {'zkratka': 'a', 'uco': 1}) is None
+
+
+def test_writes_invalidate_dependent_entries(client_factory, stub_server):
+    client = client_factory(stub_server, cache=cache.MemoryCache())
+    client.notepad_list()
+    client.notepad_content('hw01')
+    client.notepad_content('hw02')
+    client.notepad_update('hw01', uco=1, content='*1')
+
+    assert client.http.cache.stats().invalidations == 2
+    client.notepad_content('hw02')
+    assert len(stub_server.requests) == 4
+    client.notepad_content('hw01')
+    client.notepad_list()
+    assert len(stub_server.requests) == 6
+    assert client.notepad_list().notes[0].shortcut == 'tst_x'
+
+
+def test_explicit_invalidate():
+    memory = cache.MemoryCache()
+    memory.set('blok-dej-obsah', {'zkratka': 'a', 'uco': [1, 2]}, sample.BLOCKS_CONTENT)
+    memory.set('blok-dej-obsah', {'zkratka': 'b'}, sample.BLOCKS_CONTENT)
+    assert memory.invalidate('blok-dej-obsah', zkratka='a') == 1
+    assert memory.invalidate('blok-dej-obsah') == 1
+    assert memory.stats().size == 0
+
+
+def test_sqlite_cache_is_shared(tmp_path, client_factory, stub_server):
+    path = tmp_path / 'cache.sqlite'
+    first = client_factory(stub_server, cache=cache.SqliteCache(path))
+    assert first.course_list_students().students[0].uco == 444555666
+
+    second = client_factory(stub_server, cache=cache.SqliteCache(path))
+    students = second.course_list_students()
+    assert students.get(4445557777).first_name == 'Simon'
+    assert len(stub_server.requests) == 1
+    assert second.http.cache.stats().hits == 1
+
+
+def test_sqlite_cache_invalidate_and_eviction(tmp_path):
+    root = utils.parse(sample.BLOCKS_CONTENT.strip().encode('utf-8'))
+    size = len(tostring(root, encoding='utf-8'))
+    disk = cache.SqliteCache(tmp_path / 'cache.sqlite', max_bytes=2 * size)
+    disk.set('blok-dej-obsah', {'zkratka': 'a', 'uco': [1, 2]}, root)
+    disk.set('blok-dej-obsah', {'zkratka': 'b'}, root)
+    assert disk.stats().size == 2
+    assert disk.get('blok-dej-obsah', {'uco': ['1', '2'], 'zkratka': 'a'}) is not None
+
+    assert disk.invalidate('blok-dej-obsah', zkratka='a') == 1
+    assert disk.get('blok-dej-obsah', {'zkratka': 'a', 'uco': [1, 2]}) is None
+
+    disk.set('blok-dej-obsah', {'zkratka': 'c'}, root)
+    disk.set('blok-dej-obsah', {'zkratka': 'd'}, root)
+    assert disk.stats().size == 2
+    assert disk.stats().evictions == 1
+    assert disk.get('blok-dej-obsah', {'zkratka': 'b'}) is None
+    assert disk.get('blok-dej-obsah', {'zkratka': 'd'}) is not None
+
+
+def _courses(client_factory, standin, shared: cache.BaseCache) -> tuple:
+    standin.add_course(Course.generate('PB161', 1433, 'other_token', students=5, notepads=1,
+                                       first_uco=200000))
+    return (client_factory(standin, cache=shared),
+            client_factory(standin, token='other_token', course_code='PB161', cache=shared))
+
+
+def test_shared_cache_keeps_courses_apart(client_factory, standin):
+    (first, second) = _courses(client_factory, standin, cache.MemoryCache())
+    assert first.course_info().course.code == 'PB000'
+    assert second.course_info().course.code == 'PB161'
+    assert first.course_info().course.code == 'PB000'
+    assert len(standin.requests) == 2
+
+    first.notepad_content('hw01')
+    other = second.notepad_content('hw01').get(200000).content
+    # The write invalidates only the notepad of its own course
+    first.notepad_update('hw01', uco=100000, content='*1')
+    assert first.notepad_content('hw01').get(100000).content == '*1'
+    assert second.notepad_content('hw01').get(200000).content == other
+    assert [operation for (operation, _) in list(standin.requests)[2:]] == \
+        ['blok-dej-obsah', 'blok-dej-obsah', 'blok-pis-student-obsah', 'blok-dej-obsah']
+
+    first.http.invalidate('predmet-info')
+    first.course_info()
+    second.course_info()
+    assert len(standin.requests) == 7
+
+
+def test_shared_sqlite_cache_keeps_courses_apart(client_factory, tmp_path, standin):
+    (first, second) = _courses(client_factory, standin,
+                               cache.SqliteCache(tmp_path / 'cache.sqlite'))
+    assert {student.uco for student in first.course_list_students().students} >= {100000}
+    assert {student.uco for student in second.course_list_students().students} <= \
+        set(range(200000, 200005))
+    assert len(standin.requests) == 2
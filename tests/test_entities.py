@@ -0,0 +1,59 @@
+import pytest
+
+from muni_is_api import entities
+from tests import sample
+from tests.conftest import parse_entity
+
+
+def test_collection_items_are_bound_to_own_element():
+    roster = parse_entity(entities.CourseStudents, sample.COURSE_LIST_STUDENTS)
+    students = roster.students
+    assert [student.root.tag for student in students] == ['STUDENT', 'STUDENT']
+    assert [student.uco for student in students] == [444555666, 4445557777]
+    assert students[1].has_seminary
+
+
+def test_nested_collections_are_scoped():
+    seminars = parse_entity(entities.SeminarStudents, sample.SEMINARY_LIST_STUDENTS).seminars
+    assert [seminar.id for seminar in seminars] == [11111111111, 11111111112]
+    assert [len(seminar.students) for seminar in seminars] == [1, 1]
+    assert seminars[1].students[0].root.getparent() is seminars[1].root
+
+
+def test_sub_resources_of_collection_items():
+    content = parse_entity(entities.NotepadContent, sample.BLOCKS_CONTENT)
+    first, second = content.students
+    assert first.changed.person == 444111222
+    assert first.changed.date == "20160111104208"
+    assert second.content is None
+    assert second.changed.date is None
+
+
+def test_roster_uco_index():
+    roster = parse_entity(entities.CourseStudents, sample.COURSE_LIST_STUDENTS)
+    assert roster.students is roster.students
+    assert roster.by_uco() is roster.by_uco()
+    assert roster.get(444555666).last_name == 'Hruska'
+    assert roster.get('4445557777') is roster.students[1]
+    assert roster.get(1) is None
+    assert 444555666 in roster
+    assert 1 not in roster
+
+
+def test_notepad_uco_index():
+    content = parse_entity(entities.NotepadContent, sample.BLOCKS_CONTENT)
+    assert content.get(444111000).content == "25 bodů"
+    assert 444111222 in content
+
+
+def test_seminar_of_student():
+    seminars = parse_entity(entities.SeminarStudents, sample.SEMINARY_LIST_STUDENTS)
+    assert seminars.seminar_of(4445557777).name == '01'
+    assert seminars.seminar_of(1) is None
+    assert 4445557777 in seminars
+    assert 4445557777 in seminars.seminars[1]
+
+
+def test_uco_index_requires_students():
+    with pytest.raises(TypeError):
+        entities.UcoIndexed(None)
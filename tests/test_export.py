@@ -0,0 +1,94 @@
+import csv
+import io
+
+import pytest
+from defusedxml.lxml import fromstring
+
+from muni_is_api import entities, export, records
+from tests import sample
+from tests.conftest import parse_entity
+
+
+def test_roster_columns_match_properties():
+    roster = parse_entity(entities.CourseStudents, sample.COURSE_LIST_STUDENTS)
+    columns = roster.columns()
+    assert list(columns) == [column.name for column in export.STUDENT_COLUMNS]
+    assert columns['uco'] == [student.uco for student in roster.students]
+    assert columns['full_name'] == [student.full_name for student in roster.students]
+    assert columns['has_seminary'] == [student.has_seminary for student in roster.students]
+
+
+def test_notepad_records():
+    content = parse_entity(entities.NotepadContent, sample.BLOCKS_CONTENT)
+    records = content.to_records()
+    assert [record['uco'] for record in records] == [student.uco for student in content.students]
+    assert records[0]['content'] == content.students[0].content
+    assert records[0]['changed'] == content.students[0].changed.date
+    assert set(records[0]) == {'uco', 'content', 'changed', 'changed_by'}
+
+
+def test_columns_follow_schema():
+    content = parse_entity(entities.NotepadContent, sample.BLOCKS_CONTENT)
+    table = content.columns()
+    entries = content.decode().students
+    assert table['changed_by'] == [entry.changed.person for entry in entries]
+    assert table['uco'] == [entry.uco for entry in entries]
+    columns = export.schema_columns(records.STUDENT)
+    assert [column.name for column in columns] == list(records.Student._fields)
+    assert export.schema_columns(records.NOTEPAD_ENTRY, date='changed.date') == \
+        (export.Column('date', 'changed.date'),)
+    with pytest.raises(KeyError):
+        export.schema_columns(records.NOTEPAD_ENTRY, date='changed.day')
+
+
+def test_seminar_columns():
+    seminars = parse_entity(entities.SeminarStudents, sample.SEMINARY_LIST_STUDENTS).seminars
+    for seminar in seminars:
+        assert seminar.columns()['uco'] == [student.uco for student in seminar.students]
+
+
+def test_missing_values_use_defaults():
+    rows = list(fromstring(b"<R><STUDENT><UCO>1</UCO><OBSAH/></STUDENT><STUDENT/></R>"))
+    entries = [records.NOTEPAD_ENTRY.decode(row) for row in rows]
+    table = export.extract(entries, export.NOTEPAD_COLUMNS)
+    assert table == {'uco': [1, None], 'content': [None, None], 'changed': [None, None],
+                     'changed_by': [None, None]}
+    students = [records.STUDENT.decode(row) for row in rows]
+    assert export.extract(students, export.STUDENT_COLUMNS)['has_seminary'] == [True, True]
+
+
+def test_emptyparse_entity():
+    assert entities.NotepadContent(None).to_records() == []
+
+
+def test_to_csv(tmp_path):
+    roster = parse_entity(entities.CourseStudents, sample.COURSE_LIST_STUDENTS)
+    roster.to_csv(tmp_path / 'students.csv')
+    with open(str(tmp_path / 'students.csv'), encoding='utf-8', newline='') as fd:
+        rows = list(csv.reader(fd))
+    assert rows[0] == [column.name for column in export.STUDENT_COLUMNS]
+    assert [int(row[0]) for row in rows[1:]] == roster.columns()['uco']
+
+    buffer = io.StringIO()
+    roster.to_csv(buffer)
+    assert buffer.getvalue().splitlines()[0].startswith('uco,first_name')
+
+
+def test_to_arrow():
+    pyarrow = pytest.importorskip('pyarrow')
+    table = parse_entity(entities.CourseStudents, sample.COURSE_LIST_STUDENTS).to_arrow()
+    assert isinstance(table, pyarrow.Table)
+    assert table.column_names[0] == 'uco'
+
+
+def test_to_dataframe():
+    pytest.importorskip('pandas')
+    frame = parse_entity(entities.NotepadContent, sample.BLOCKS_CONTENT).to_dataframe()
+    assert list(frame.columns) == ['uco', 'content', 'changed', 'changed_by']
+
+
+def test_optional_dependency_message(monkeypatch):
+    import sys
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    with pytest.raises(ImportError, match='muni-is-api\\[arrow\\]'):
+        export.to_arrow({'uco': [1]})
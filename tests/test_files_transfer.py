@@ -0,0 +1,130 @@
+import os
+
+import pytest
+
+import muni_is_api
+from muni_is_api import errors
+from tests.server import files_tree
+
+FILE = '/el/fi/PB071/odp/submission.zip'
+DATA = os.urandom(300 * 1024 + 17)
+
+
+def test_content_url():
+    client = muni_is_api.FilesApiClient('is.muni.cz', '1', 'password')
+    assert client.content_url(FILE) == 'https://is.muni.cz/auth' + FILE
+    assert client.content_url('https://other/x') == 'https://other/x'
+
+
+def test_download_to_path(files_client_factory, stub_server, tmp_path):
+    stub_server.blobs[FILE] = DATA
+    target = tmp_path / 'out' / 'submission.zip'
+    size = files_client_factory(stub_server).for_url(FILE).download(target, chunk_size=4096)
+    assert size == len(DATA)
+    assert target.read_bytes() == DATA
+    assert not (tmp_path / 'out' / 'submission.zip.part').exists()
+    assert stub_server.ranges == [None]
+
+
+def test_interrupted_download_is_resumed(files_client_factory, stub_server, tmp_path):
+    stub_server.blobs[FILE] = DATA
+    stub_server.cut_after = 100 * 1024
+    target = tmp_path / 'submission.zip'
+    assert files_client_factory(stub_server).download(FILE, target, chunk_size=1024) == len(DATA)
+    assert target.read_bytes() == DATA
+    assert stub_server.ranges[0] is None
+    assert stub_server.ranges[1].startswith('bytes=')
+    assert int(stub_server.ranges[1][len('bytes='):-1]) > 0
+
+
+def _interrupted(files_client_factory, server, target):
+    server.cut_after = 1000
+    with pytest.raises(errors.ISApiError):
+        files_client_factory(server).download(FILE, target, chunk_size=100, attempts=1)
+    server.ranges.clear()
+
+
+def test_partial_file_is_resumed(files_client_factory, stub_server, tmp_path):
+    stub_server.blobs[FILE] = DATA
+    target = tmp_path / 'submission.zip'
+    _interrupted(files_client_factory, stub_server, target)
+    assert (tmp_path / 'submission.zip.part').stat().st_size == 1000
+    files_client_factory(stub_server).download(FILE, target)
+    assert target.read_bytes() == DATA
+    assert stub_server.ranges == ['bytes=1000-']
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_partial_file_without_validator_is_downloaded_again(files_client_factory, stub_server,
+                                                            tmp_path):
+    stub_server.blobs[FILE] = DATA
+    target = tmp_path / 'submission.zip'
+    (tmp_path / 'submission.zip.part').write_bytes(b'x' * 1000)
+    files_client_factory(stub_server).download(FILE, target)
+    assert target.read_bytes() == DATA
+    assert stub_server.ranges == [None]
+
+
+def test_changed_file_is_downloaded_again(files_client_factory, stub_server, tmp_path):
+    stub_server.blobs[FILE] = DATA
+    target = tmp_path / 'submission.zip'
+    _interrupted(files_client_factory, stub_server, target)
+    changed = os.urandom(2000)
+    stub_server.blobs[FILE] = changed
+    assert files_client_factory(stub_server).download(FILE, target) == len(changed)
+    assert target.read_bytes() == changed
+    assert stub_server.ranges == ['bytes=1000-']
+
+
+def test_complete_partial_file(files_client_factory, stub_server, tmp_path):
+    stub_server.blobs[FILE] = DATA
+    target = tmp_path / 'submission.zip'
+    _interrupted(files_client_factory, stub_server, target)
+    (tmp_path / 'submission.zip.part').write_bytes(DATA)
+    assert files_client_factory(stub_server).download(FILE, target) == len(DATA)
+    assert target.read_bytes() == DATA
+    assert stub_server.ranges == [f'bytes={len(DATA)}-']
+
+
+def test_partial_file_larger_than_remote(files_client_factory, stub_server, tmp_path):
+    stub_server.blobs[FILE] = DATA
+    target = tmp_path / 'submission.zip'
+    _interrupted(files_client_factory, stub_server, target)
+    # The validator still matches, but the partial file is longer than the remote file
+    (tmp_path / 'submission.zip.part').write_bytes(DATA + b'garbage')
+    assert files_client_factory(stub_server).download(FILE, target) == len(DATA)
+    assert target.read_bytes() == DATA
+    assert stub_server.ranges == [f'bytes={len(DATA) + 7}-', None]
+
+
+def test_download_missing_file(files_client_factory, stub_server, tmp_path):
+    with pytest.raises(errors.ISApiError) as error:
+        files_client_factory(stub_server).download('/el/missing', tmp_path / 'missing')
+    assert error.value.status_code == 404
+
+
+def test_download_many(files_client_factory, stub_server, tmp_path):
+    stub_server.latency = 0.02
+    for index in range(6):
+        stub_server.blobs[f'/el/file{index}'] = DATA[index:]
+    targets = {f'/el/file{index}': tmp_path / f'file{index}' for index in range(6)}
+    targets['/el/missing'] = tmp_path / 'missing'
+    results = files_client_factory(stub_server).download_many(targets, workers=3)
+
+    assert list(results) == list(targets)
+    assert results['/el/file2'].value == len(DATA) - 2
+    assert (tmp_path / 'file5').read_bytes() == DATA[5:]
+    assert not results['/el/missing'].ok
+
+
+def test_upload_from_path(files_client_factory, stub_server, tmp_path):
+    stub_server.files = files_tree('/el/fi/PB071/', depth=0)
+    source = tmp_path / 'report.pdf'
+    source.write_bytes(DATA)
+    client = files_client_factory(stub_server)
+    client.for_url('/el/fi/PB071/').upload(source)
+    client.upload_many('/el/fi/PB071/', [source], name='copy.pdf')
+    assert stub_server.uploads[('/el/fi/PB071/', 'report.pdf')] == DATA
+    assert stub_server.uploads[('/el/fi/PB071/', 'copy.pdf')] == DATA
+    with pytest.raises(errors.ISApiError):
+        client.upload('/el/missing/', source)
@@ -0,0 +1,96 @@
+import muni_is_api
+from tests.server import files_tree
+
+ROOT = '/el/fi/PB071/'
+
+
+def _fetched(server) -> list:
+    return [dict(query)['url'] for query in server.requests]
+
+
+def test_for_url_is_method():
+    client = muni_is_api.FilesApiClient('is.muni.cz', '1', 'password')
+    assert client.for_url(ROOT).url == ROOT
+
+
+def test_walk_yields_whole_tree(files_client_factory, stub_server):
+    stub_server.files = files_tree(ROOT, depth=3, fanout=3)
+    nodes = list(files_client_factory(stub_server).walk(ROOT, workers=4))
+
+    assert len(nodes) == 1 + 3 + 9 + 27
+    assert len({node.node_id for node in nodes}) == len(nodes)
+    assert nodes[0].path == ROOT
+    # The leaves are known from their parents, they are not fetched
+    assert len(stub_server.requests) == 1 + 3 + 9
+
+    # The concurrent requests may arrive in any order, a single worker fetches breadth-first
+    stub_server.requests.clear()
+    list(files_client_factory(stub_server).walk(ROOT, workers=1))
+    depths = [url.count('/') for url in _fetched(stub_server)]
+    assert depths == sorted(depths)
+    assert all(dict(query)['strom'] == '1' for query in stub_server.requests)
+
+
+def test_walk_depth_limit(files_client_factory, stub_server):
+    stub_server.files = files_tree(ROOT, depth=3, fanout=2)
+    nodes = list(files_client_factory(stub_server).walk(ROOT, max_depth=1))
+    assert sorted(node.path for node in nodes) == [ROOT, ROOT + '0/', ROOT + '1/']
+    assert _fetched(stub_server) == [ROOT]
+
+    nodes = list(files_client_factory(stub_server).walk(ROOT, max_depth=0))
+    assert [node.path for node in nodes] == [ROOT]
+
+
+def test_walk_path_filters(files_client_factory, stub_server):
+    stub_server.files = files_tree(ROOT, depth=2, fanout=3)
+    nodes = files_client_factory(stub_server).walk(ROOT, include=[ROOT + '1/?/'],
+                                                   exclude=[ROOT + '2/'])
+    assert sorted(node.path for node in nodes) == [ROOT + f'1/{index}/' for index in range(3)]
+    assert ROOT + '2/' not in _fetched(stub_server)
+
+
+def test_walk_deduplicates_nodes(files_client_factory, stub_server):
+    stub_server.files = files_tree(ROOT, depth=2, fanout=2)
+    # The second child lists the first one again (ex. a link)
+    first = stub_server.files[ROOT + '0/']
+    listed = first[first.index('<uzel>') + len('<uzel>'):first.index('<poduzly>')]
+    second = stub_server.files[ROOT + '1/']
+    stub_server.files[ROOT + '1/'] = second.replace(
+        '<poduzly>', f'<poduzly><poduzel>{listed}</poduzel>')
+
+    nodes = list(files_client_factory(stub_server).walk(ROOT))
+    assert len(nodes) == 7
+    assert sorted(_fetched(stub_server)) == [ROOT, ROOT + '0/', ROOT + '1/']
+
+
+def test_walk_skips_unavailable_subtree(files_client_factory, stub_server):
+    stub_server.files = files_tree(ROOT, depth=2, fanout=2)
+    del stub_server.files[ROOT + '1/']
+    failed = {}
+    nodes = list(files_client_factory(stub_server).walk(ROOT, failed=failed))
+    assert ROOT + '1/' in [node.path for node in nodes]
+    assert len(nodes) == 5
+    assert list(failed) == [ROOT + '1/']
+
+
+def test_walk_bounded_parallelism(files_client_factory, stub_server):
+    stub_server.latency = 0.02
+    stub_server.files = files_tree(ROOT, depth=2, fanout=8)
+    nodes = list(files_client_factory(stub_server).for_url(ROOT).walk(workers=3))
+    assert len(nodes) == 1 + 8 + 64
+    assert stub_server.peak_in_flight <= 3
+
+
+def test_walk_continues_after_failed_fetch(files_client_factory, stub_server):
+    stub_server.files = files_tree(ROOT, depth=2, fanout=2)
+    del stub_server.files[ROOT + '1/']
+    failed = {}
+    nodes = list(files_client_factory(stub_server, fail=True).walk(ROOT, failed=failed))
+    assert len(nodes) == 5
+    assert list(failed) == [ROOT + '1/']
+    assert isinstance(failed[ROOT + '1/'], muni_is_api.errors.ISApiError)
+
+    failed.clear()
+    files = files_client_factory(stub_server, fail=True)
+    assert list(files.walk('/missing/', failed=failed)) == []
+    assert list(failed) == ['/missing/']
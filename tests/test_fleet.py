@@ -0,0 +1,35 @@
+from muni_is_api import errors
+from muni_is_api.fleet import Course, CourseFleet
+
+
+def _fleet(stub_params, server, courses, **kwargs) -> CourseFleet:
+    return CourseFleet(server.domain, stub_params['token'], courses, scheme='http', **kwargs)
+
+
+def test_fleet_runs_operation_for_all_courses(stub_params, stub_server):
+    stub_server.latency = 0.05
+    courses = [(f"PB{index:03}", 1433) for index in range(10)]
+    fleet = _fleet(stub_params, stub_server, courses, workers=10)
+    results = list(fleet.run('course_info'))
+
+    assert sorted(result.key.code for result in results) == [code for (code, _) in courses]
+    assert all(result.ok for result in results)
+    assert results[0].value.course.code == 'PB161'
+    assert sorted(dict(query)['kod'] for query in stub_server.requests) == \
+        [code for (code, _) in courses]
+    assert stub_server.peak_in_flight > 1
+    assert fleet.stats()['predmet-info'].requests == 10
+
+
+def test_fleet_isolates_failures(stub_params, stub_server):
+    stub_server.fail_when = lambda operation, params: params.get('kod') == ['BAD']
+    fleet = _fleet(stub_params, stub_server,
+                   [('PB071', 1433), Course('BAD', 1433, token='other'), ('PB161', 1433)])
+    results = fleet.collect(lambda client, **kwargs: client.course_list_students(**kwargs),
+                            terminated=True)
+
+    assert [course.code for course in results] == ['PB071', 'BAD', 'PB161']
+    assert isinstance(results[Course('BAD', 1433, 'other')].error, errors.ISApiError)
+    assert results[Course('PB071', 1433)].value.get(444555666).last_name == 'Hruska'
+    tokens = {dict(query)['kod']: dict(query)['klic'] for query in stub_server.requests}
+    assert tokens == {'PB071': stub_params['token'], 'BAD': 'other', 'PB161': stub_params['token']}
@@ -0,0 +1,99 @@
+import math
+import time
+
+import pytest
+from defusedxml.lxml import fromstring
+
+from muni_is_api import entities, errors, gradebook
+from tests.server import notepad_content, notes_list
+
+
+def _content(contents: dict) -> entities.NotepadContent:
+    return entities.NotepadContent(fromstring(notepad_content(contents)))
+
+
+def test_gradebook_matrix(backend):
+    book = gradebook.Gradebook([3, 1, 2], ['hw01', 'hw02'], {
+        'hw01': _content({1: '*2', 2: 'odevzdáno', 3: '*1 *1,5', 9: '*10'}),
+        'hw02': _content({1: '4 body', 1000: '*1'}),
+    })
+
+    assert book.shape == (3, 2)
+    assert list(book.ucos) == [3, 1, 2]
+    assert book.shortcuts == ['hw01', 'hw02']
+    assert book.get(3, 'hw01') == 2.5
+    assert book.get(2, 'hw01') is None
+    assert book.get(9, 'hw01', default=0) == 0
+    assert book.row(1) == {'hw01': 2.0, 'hw02': 4.0}
+    assert book.column('hw01').by_uco() == {3: 2.5, 1: 2.0, 2: None}
+    assert book.totals().by_uco() == {3: 2.5, 1: 6.0, 2: None}
+    assert book.columns() == {'uco': [3, 1, 2], 'hw01': [2.5, 2.0, None],
+                              'hw02': [None, 4.0, None]}
+    assert sum(1 for value in (book.points.ravel() if backend == 'numpy' else book.points)
+               if math.isnan(value)) == 3
+
+
+def test_gradebook_empty(backend):
+    book = gradebook.Gradebook([], ['hw01'], {'hw01': _content({1: '*1'})})
+    assert book.shape == (0, 1)
+    assert book.totals().count() == 0
+    assert book.to_records() == []
+
+
+def test_client_gradebook(client_factory, stub_server, backend):
+    stub_server.responses['bloky-seznam'] = notes_list(['hw01', 'hw02', 'quiz'])
+    stub_server.notepads = {
+        'hw01': notepad_content({444555666: '*3', 4445557777: '*1'}),
+        'hw02': notepad_content({4445557777: '2 body'}),
+        'quiz': notepad_content({444555666: '*10'}),
+    }
+    client = client_factory(stub_server)
+    book = client.gradebook(notepads=lambda note: note.shortcut.startswith('hw'))
+
+    assert book.shortcuts == ['hw01', 'hw02']
+    assert list(book.ucos) == [444555666, 4445557777]
+    assert book.row(4445557777) == {'hw01': 1.0, 'hw02': 2.0}
+    assert book.totals().by_uco() == {444555666: 3.0, 4445557777: 3.0}
+    fetched = [dict(query).get('zkratka') for query in stub_server.requests
+               if dict(query)['operace'] == 'blok-dej-obsah']
+    assert sorted(fetched) == ['hw01', 'hw02']
+
+
+def test_client_gradebook_filters(client_factory, stub_server):
+    stub_server.notepads = {'hw01': notepad_content({444555666: '*3', 4445557777: '*1'})}
+    client = client_factory(stub_server)
+
+    book = client.gradebook(notepads=['hw01'], students=lambda student: student.has_seminary)
+    assert list(book.ucos) == [4445557777]
+    assert book.get(4445557777, 'hw01') == 1.0
+
+    stub_server.requests.clear()
+    book = client.gradebook(notepads=['hw01'], students=[444555666])
+    assert book.get(444555666, 'hw01') == 3.0
+    # Neither the notepad list nor the roster are needed
+    assert [dict(query)['operace'] for query in stub_server.requests] == ['blok-dej-obsah']
+    assert dict(stub_server.requests[0])['uco'] == '444555666'
+
+
+def test_client_gradebook_is_concurrent(client_factory, stub_server):
+    shortcuts = [f"hw{index:02}" for index in range(40)]
+    stub_server.responses['bloky-seznam'] = notes_list(shortcuts)
+    stub_server.latency = 0.05
+    client = client_factory(stub_server)
+
+    start = time.monotonic()
+    book = client.gradebook(workers=40)
+    elapsed = time.monotonic() - start
+
+    assert book.shape == (2, 40)
+    assert stub_server.peak_in_flight > 10
+    # The notepad list and the contents, not 42 sequential requests
+    assert elapsed < 0.05 * 10
+
+
+def test_client_gradebook_raises_failure(client_factory, stub_server):
+    stub_server.responses['bloky-seznam'] = notes_list(['hw01', 'hw02'])
+    stub_server.fail_when = lambda operation, params: params.get('zkratka') == ['hw02']
+    client = client_factory(stub_server)
+    with pytest.raises(errors.ISApiError):
+        client.gradebook()
@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+_CHECK = """
+import logging, sys
+handlers = list(logging.getLogger().handlers)
+import muni_is_api
+loaded = sorted(name for name in ('requests', 'lxml', 'defusedxml', 'coloredlogs', 'numpy',
+                                  'aiohttp', 'pandas', 'pyarrow', 'muni_is_api.client',
+                                  'muni_is_api.files_api')
+                if name in sys.modules)
+print(loaded)
+print(logging.getLogger('muni_is_api').handlers == [])
+print(logging.getLogger().handlers == handlers)
+"""
+
+
+def _run(code: str) -> list:
+    output = subprocess.run([sys.executable, '-c', code], check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return output.splitlines()
+
+
+def test_import_has_no_side_effects():
+    loaded, package_handlers, root_handlers = _run(_CHECK)
+    # The package itself imports only the stdlib, the import time is measured
+    # by the benchmarks.import_time
+    assert loaded == '[]'
+    assert package_handlers == 'True'
+    assert root_handlers == 'True'
+
+
+def test_clients_are_imported_lazily():
+    (name,) = _run("import muni_is_api; print(muni_is_api.IsApiClient.__module__)")
+    assert name == 'muni_is_api.client'
+    (name,) = _run("from muni_is_api import FilesApiClient; print(FilesApiClient.__name__)")
+    assert name == 'FilesApiClient'
@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from muni_is_api.errors import ISApiError
+from muni_is_api.limiter import AdaptiveLimiter, TokenBucket
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_window_grows_when_healthy():
+    limiter = AdaptiveLimiter(concurrency=2, max_concurrency=4)
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(0.01, 200)
+    assert limiter.concurrency == 4
+    assert limiter.in_flight == 0
+
+
+def test_window_shrinks_on_throttling():
+    limiter = AdaptiveLimiter(concurrency=16)
+    limiter.acquire()
+    limiter.release(0.01, 429)
+    assert limiter.concurrency == 8
+    time.sleep(0.02)
+    limiter.acquire()
+    limiter.release(0.01, None, error=ConnectionError())
+    assert limiter.concurrency == 4
+
+
+def test_window_shrinks_when_latency_climbs():
+    limiter = AdaptiveLimiter(concurrency=16, max_concurrency=16, latency_tolerance=3)
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(0.01, 200)
+    limiter.acquire()
+    limiter.release(0.5, 200)
+    assert limiter.concurrency == 8
+
+
+def test_concurrent_failures_shrink_once():
+    limiter = AdaptiveLimiter(concurrency=16)
+    for _ in range(4):
+        limiter.acquire()
+    for _ in range(4):
+        limiter.release(1.0, 503)
+    assert limiter.concurrency == 8
+
+
+def test_for_domain_is_shared():
+    first = AdaptiveLimiter.for_domain('limiter.test', concurrency=3)
+    assert AdaptiveLimiter.for_domain('limiter.test') is first
+    assert AdaptiveLimiter.for_domain('other.limiter.test') is not first
+    assert first.concurrency == 3
+
+
+def test_client_respects_window(client_factory, stub_server):
+    stub_server.latency = 0.05
+    limiter = AdaptiveLimiter(concurrency=2, max_concurrency=2)
+    client = client_factory(stub_server, limiter=limiter, workers=8, max_url_length=200)
+    content = client.notepad_content('hw01', ucos=list(range(100000, 100040)))
+    assert len(content.students) == 40
+    assert stub_server.peak_in_flight <= 2
+    assert limiter.in_flight == 0
+
+
+def test_client_shrinks_on_server_errors(client_factory, stub_server):
+    stub_server.fail_when = lambda operation, params: True
+    limiter = AdaptiveLimiter(concurrency=8)
+    client = client_factory(stub_server, limiter=limiter)
+    with pytest.raises(ISApiError):
+        client.course_info()
+    assert limiter.concurrency == 4
+    assert limiter.in_flight == 0
+
+
+def test_streamed_response_releases_slot(client_factory, stub_server):
+    limiter = AdaptiveLimiter(concurrency=2, max_concurrency=2)
+    client = client_factory(stub_server, limiter=limiter)
+    students = client.iter_students(terminated=True)
+    assert next(students).uco == 444555666
+    assert limiter.in_flight == 0
+    assert [student.uco for student in students] == [4445557777]
+    assert limiter.in_flight == 0
+
+
+def test_limited_request_inside_stream(client_factory, stub_server):
+    limiter = AdaptiveLimiter(concurrency=1, max_concurrency=1)
+    client = client_factory(stub_server, limiter=limiter)
+    contents = []
+
+    def _loop():
+        for student in client.iter_students(terminated=True):
+            contents.append(client.notepad_content('hw01', ucos=[student.uco]))
+
+    worker = threading.Thread(target=_loop, daemon=True)
+    worker.start()
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    assert len(contents) == 2
+    assert limiter.in_flight == 0
@@ -0,0 +1,54 @@
+import pytest
+
+from muni_is_api import errors, metrics
+
+
+def test_client_stats_per_operation(client_factory, stub_server):
+    client = client_factory(stub_server)
+    client.course_info()
+    client.course_info()
+    client.notepad_list()
+    stats = client.stats()
+
+    assert set(stats) == {'predmet-info', 'bloky-seznam'}
+    info = stats['predmet-info']
+    assert info.requests == 2
+    assert info.errors == 0
+    assert info.statuses == {200: 2}
+    assert info.response_bytes > 0
+    assert info.network_time > 0
+    assert info.parse_time > 0
+    assert info.max_latency <= info.latency
+
+
+def test_errors_are_recorded(client_factory, stub_server):
+    stub_server.fail_when = lambda operation, params: True
+    client = client_factory(stub_server)
+    with pytest.raises(errors.ISApiError) as error:
+        client.notepad_list()
+    assert error.value.status_code == 500
+    stats = client.stats()['bloky-seznam']
+    assert (stats.requests, stats.errors, stats.statuses) == (1, 1, {500: 1})
+
+
+def test_histogram_hook(client_factory, stub_server):
+    histogram = metrics.Histogram('is_latency', buckets=(0.5, 10.0))
+    events = []
+    shared = metrics.Metrics(hooks=[histogram, events.append])
+    client_factory(stub_server, metrics=shared).course_info()
+    client_factory(stub_server, metrics=shared).course_info()
+
+    assert [event.operation for event in events] == ['predmet-info', 'predmet-info']
+    assert histogram.buckets('predmet-info') == [2, 2, 2]
+    text = histogram.exposition()
+    assert 'is_latency_bucket{operation="predmet-info",le="+Inf"} 2' in text
+    assert 'is_latency_count{operation="predmet-info"} 2' in text
+
+
+def test_failing_hook_does_not_break_requests(client_factory, stub_server):
+    def _hook(event):
+        raise RuntimeError("broken exporter")
+
+    client = client_factory(stub_server, metrics=metrics.Metrics(hooks=[_hook]))
+    assert client.course_info().course.code == 'PB161'
+    assert client.stats()['predmet-info'].requests == 1
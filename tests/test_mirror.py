@@ -0,0 +1,125 @@
+import json
+
+import muni_is_api
+from muni_is_api.mirror import FilesMirror
+from tests.server import files_tree
+
+ROOT = '/el/fi/PB071/'
+CHANGED = ROOT + '0/1/file0.txt'
+
+
+def _serve(server, **kwargs):
+    server.files = files_tree(ROOT, depth=2, fanout=3, files=2, **kwargs)
+    server.blobs.update({path: path.encode('utf-8') for path in server.files
+                         if not path.endswith('/')})
+
+
+def _mirror(client: muni_is_api.FilesApiClient, tmp_path, **kwargs) -> FilesMirror:
+    return FilesMirror(client, ROOT, tmp_path / 'mirror', **kwargs)
+
+
+def _sync(server, mirror, **kwargs):
+    server.requests.clear()
+    server.ranges.clear()
+    return mirror.sync(**kwargs)
+
+
+def test_first_sync_downloads_everything(files_client_factory, stub_server, tmp_path):
+    _serve(stub_server)
+    result = _sync(stub_server, _mirror(files_client_factory(stub_server), tmp_path))
+
+    assert len(result.downloaded) == 18
+    assert result.unchanged == 0
+    assert len(stub_server.requests) == 1 + 3 + 9
+    assert (tmp_path / 'mirror' / '2' / '1' / 'file1.txt').read_bytes() == \
+        (ROOT + '2/1/file1.txt').encode('utf-8')
+    manifest = json.loads((tmp_path / 'mirror' / '.fmgr-manifest.json').read_text())
+    assert manifest['url'] == ROOT
+    assert len(manifest['nodes']) == 13 + 18
+
+
+def test_unchanged_tree_is_not_walked(files_client_factory, stub_server, tmp_path):
+    _serve(stub_server)
+    mirror = _mirror(files_client_factory(stub_server), tmp_path)
+    mirror.sync()
+    result = _sync(stub_server, mirror)
+
+    assert result.downloaded == []
+    assert result.unchanged == 18
+    assert len(stub_server.requests) == 1
+    assert stub_server.ranges == []
+    assert len(mirror.load_manifest()) == 13 + 18
+
+
+def test_only_changed_subtree_is_walked(files_client_factory, stub_server, tmp_path):
+    _serve(stub_server)
+    mirror = _mirror(files_client_factory(stub_server), tmp_path)
+    mirror.sync()
+    _serve(stub_server, updated={CHANGED: '20210101120000'})
+    stub_server.blobs[CHANGED] = b'new content'
+    result = _sync(stub_server, mirror)
+
+    assert result.downloaded == [CHANGED]
+    assert result.unchanged == 17
+    assert sorted(dict(query)['url'] for query in stub_server.requests) == \
+        [ROOT, ROOT + '0/', ROOT + '0/1/']
+    assert (tmp_path / 'mirror' / '0' / '1' / 'file0.txt').read_bytes() == b'new content'
+
+
+def test_full_sync_walks_everything(files_client_factory, stub_server, tmp_path):
+    _serve(stub_server)
+    mirror = _mirror(files_client_factory(stub_server), tmp_path)
+    mirror.sync()
+    result = _sync(stub_server, mirror, full=True)
+    assert result.downloaded == []
+    assert len(stub_server.requests) == 13
+
+
+def test_removed_files(files_client_factory, stub_server, tmp_path):
+    _serve(stub_server)
+    mirror = _mirror(files_client_factory(stub_server), tmp_path, delete=True)
+    mirror.sync()
+    # The folders of the removed files have changed
+    removed = {ROOT + f'{first}/{second}/file1.txt': '20210101120000'
+               for first in range(3) for second in range(3)}
+    stub_server.files = files_tree(ROOT, depth=2, fanout=3, files=1, updated=removed)
+    result = _sync(stub_server, mirror)
+
+    assert len(result.removed) == 9
+    assert ROOT + '1/2/file1.txt' in result.removed
+    assert not (tmp_path / 'mirror' / '1' / '2' / 'file1.txt').exists()
+    assert (tmp_path / 'mirror' / '1' / '2' / 'file0.txt').exists()
+
+
+def test_failed_download_is_retried(files_client_factory, stub_server, tmp_path):
+    _serve(stub_server)
+    missing = stub_server.blobs.pop(CHANGED)
+    mirror = _mirror(files_client_factory(stub_server), tmp_path)
+    result = mirror.sync()
+    assert list(result.failed) == [CHANGED]
+    assert len(result.downloaded) == 17
+
+    stub_server.blobs[CHANGED] = missing
+    result = _sync(stub_server, mirror)
+    assert result.downloaded == [CHANGED]
+    assert result.failed == {}
+    assert result.unchanged == 17
+
+
+def test_failed_folder_is_kept(files_client_factory, stub_server, tmp_path):
+    _serve(stub_server)
+    mirror = _mirror(files_client_factory(stub_server), tmp_path, delete=True)
+    mirror.sync()
+    _serve(stub_server, updated={CHANGED: '20210101120000'})
+    listing = stub_server.files.pop(ROOT + '0/')
+    result = _sync(stub_server, mirror)
+
+    assert list(result.failed) == [ROOT + '0/']
+    assert result.removed == []
+    assert (tmp_path / 'mirror' / '0' / '1' / 'file0.txt').exists()
+    assert len(mirror.load_manifest()) == 13 + 18
+
+    stub_server.files[ROOT + '0/'] = listing
+    result = _sync(stub_server, mirror)
+    assert result.downloaded == [CHANGED]
+    assert result.failed == {}
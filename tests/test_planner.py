@@ -0,0 +1,38 @@
+from muni_is_api import planner, utils
+
+URL = "https://is.muni.cz/export/pb_blok_api"
+
+
+def _params(**params) -> dict:
+    return {'klic': 'secret', 'fakulta': 1433, 'kod': 'PB071', **params}
+
+
+def test_plan_keeps_short_request():
+    params = _params(operace='blok-dej-obsah', zkratka='hw01', uco=[1, 2, 3])
+    assert planner.plan(URL, params) == [params]
+
+
+def test_plan_does_not_split_unknown_operation():
+    params = _params(operace='predmet-seznam', uco=list(range(1000)))
+    assert planner.plan(URL, params, max_length=200) == [params]
+
+
+def test_plan_splits_long_list():
+    ucos = list(range(100000, 101000))
+    params = _params(operace='blok-dej-obsah', zkratka='hw01', uco=ucos)
+    planned = planner.plan(URL, params, max_length=500)
+    assert len(planned) > 1
+    assert [uco for part in planned for uco in part['uco']] == ucos
+    for part in planned:
+        assert part['zkratka'] == 'hw01'
+        assert len(utils.build_url(URL, part)) <= 500
+
+
+def test_split_operation_is_merged(client_factory, stub_server):
+    client = client_factory(stub_server, max_url_length=300)
+    ucos = list(range(400000, 400200))
+    content = client.notepad_content('hw01', ucos=ucos)
+
+    assert len(stub_server.requests) > 1
+    assert [student.uco for student in content.students] == ucos
+    assert content.students[-1].content == f"{ucos[-1]} bodů"
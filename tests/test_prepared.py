@@ -0,0 +1,153 @@
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from muni_is_api import entities, errors, utils
+from muni_is_api.cache import MemoryCache
+from muni_is_api.standin import Course
+from tests.conftest import TOKEN
+
+
+def test_prepared_read_is_decoded(client_factory, standin):
+    client = client_factory(standin)
+    content = client.prepare('blok-dej-obsah', entities.NotepadContent)
+    assert content.operation == 'blok-dej-obsah'
+
+    prepared = content(zkratka='hw01', uco=[100000, 100001])
+    expected = client.notepad_content('hw01', ucos=[100000, 100001])
+    assert isinstance(prepared, entities.NotepadContent)
+    assert [(entry.uco, entry.content) for entry in prepared.students] == \
+        [(entry.uco, entry.content) for entry in expected.students]
+
+    # The prepared and the varying params are sent once each
+    (operation, params) = standin.requests[0]
+    assert operation == 'blok-dej-obsah'
+    assert params == {'klic': [TOKEN], 'fakulta': ['1433'], 'kod': ['PB000'],
+                      'operace': ['blok-dej-obsah'], 'zkratka': ['hw01'],
+                      'uco': ['100000', '100001']}
+    assert standin.requests[1] == standin.requests[0]
+
+
+def test_prepared_write_in_loop(client_factory, standin):
+    client = client_factory(standin)
+    update = client.prepare('blok-pis-student-obsah')
+    for uco in range(100000, 100010):
+        assert isinstance(update(zkratka='hw02', uco=uco, obsah=f"*{uco % 10}", prepis='a'),
+                          entities.Resource)
+
+    content = client.notepad_content('hw02', ucos=list(range(100000, 100010)))
+    assert [entry.content for entry in content.students] == [f"*{index}" for index in range(10)]
+    assert client.stats()['blok-pis-student-obsah'].requests == 10
+
+    with pytest.raises(errors.ISApiError):
+        update(zkratka='missing', uco=100000, obsah='*1')
+
+
+def test_prepared_long_request_is_split(client_factory, standin):
+    client = client_factory(standin, max_url_length=300)
+    ucos = list(range(100000, 100050))
+    content = client.prepare('blok-dej-obsah', entities.NotepadContent)
+    content = content(zkratka='hw01', uco=ucos)
+    assert len(standin.requests) > 1
+    assert [entry.uco for entry in content.students] == ucos
+
+
+def test_prepared_uses_cache(client_factory, standin):
+    client = client_factory(standin, cache=MemoryCache())
+    content = client.prepare('blok-dej-obsah')
+    first = content(zkratka='hw01')
+    assert content(zkratka='hw01').root is first.root
+    assert client.notepad_content('hw01').students[0].uco == 100000
+    assert len(standin.requests) == 1
+
+    client.prepare('blok-pis-student-obsah')(zkratka='hw01', uco=100000, obsah='*1',
+                                             prepis='a')
+    content(zkratka='hw01')
+    assert [operation for (operation, _) in standin.requests] == \
+        ['blok-dej-obsah', 'blok-pis-student-obsah', 'blok-dej-obsah']
+
+
+def test_prepared_query_is_quoted_as_params(client_factory, standin):
+    client = client_factory(standin)
+    content = '*1.5 bodů navíc & "bonus" (+1)'
+    client.notepad_update('hw01', uco=100000, content=content)
+    client.prepare('blok-pis-student-obsah')(zkratka='hw01', uco=100001, obsah=content,
+                                             prepis='a')
+    assert standin.requests[0][1] == {**standin.requests[1][1], 'uco': ['100000']}
+    entries = client.notepad_content('hw01', ucos=[100000, 100001]).students
+    assert [entry.content for entry in entries] == [content, content]
+
+
+def test_prepared_template_follows_session(client_factory, standin):
+    client = client_factory(standin)
+    info = client.prepare('predmet-info', entities.CourseInfo)
+    assert info().course.code == 'PB000'
+    template = client.http._get_template()
+
+    client.http.transport.close()
+    assert info().course.code == 'PB000'
+    assert client.http._get_template() is not template
+    assert client.http._get_template().session is client.http.session
+
+
+def test_prepared_params_are_not_repeated(client_factory, standin):
+    info = client_factory(standin).prepare('predmet-info')
+    with pytest.raises(ValueError) as error:
+        info(kod='PB161', klic='other')
+    assert 'klic, kod' in str(error.value)
+    assert not standin.requests
+
+
+def test_prepared_shared_cache_keeps_courses_apart(client_factory, standin):
+    standin.add_course(Course('PB161', 1433, 'other_token'))
+    shared = MemoryCache()
+    first = client_factory(standin, cache=shared).prepare('predmet-info', entities.CourseInfo)
+    second = client_factory(standin, token='other_token', course_code='PB161',
+                            cache=shared).prepare('predmet-info', entities.CourseInfo)
+    codes = [info().course.code for info in (first, second, first, second)]
+    assert codes == ['PB000', 'PB161', 'PB000', 'PB161']
+    assert len(standin.requests) == 2
+
+
+class _Recorder(BaseAdapter):
+    """Keeps the sent requests and answers them with an empty response"""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def send(self, request, **kwargs) -> requests.Response:
+        self.requests.append(request)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'<ROOT/>'
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def test_template_applies_session_changes():
+    session = requests.Session()
+    recorder = _Recorder()
+    session.mount('https://', recorder)
+    template = utils.GetTemplate(session, 'https://is.muni.cz/export/pb_blok_api')
+    template.send('operace=predmet-info;')
+
+    session.headers['X-Test'] = 'changed'
+    session.cookies.set('iscreds', 'secret', domain='is.muni.cz')
+    session.auth = ('1', 'password')
+    template.send('operace=bloky-seznam;')
+    del session.headers['X-Test']
+    template.send('operace=predmet-info;')
+
+    (first, second, third) = recorder.requests
+    assert second.url == 'https://is.muni.cz/export/pb_blok_api?operace=bloky-seznam;'
+    assert not {'X-Test', 'Cookie', 'Authorization'}.intersection(first.headers)
+    assert second.headers['X-Test'] == 'changed'
+    assert second.headers['Cookie'] == 'iscreds=secret'
+    assert second.headers['Authorization'].startswith('Basic ')
+    assert 'X-Test' not in third.headers
+    assert second.headers['User-Agent'] == session.headers['User-Agent']
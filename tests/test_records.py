@@ -0,0 +1,57 @@
+import pytest
+
+from muni_is_api import entities, records
+from tests import sample
+from tests.conftest import parse_entity
+
+
+def test_decode_course_info():
+    entity = parse_entity(entities.CourseInfo, sample.PREDMET_INFO)
+    info = entity.decode()
+    assert isinstance(info, records.CourseInfo)
+    assert info.course.code == entity.course.code
+    assert info.course.number_of_students == 110
+    assert info.faculty == records.Faculty(id=101, shortcut='fi')
+    seminar = info.seminars[0]
+    assert seminar.id == 12364
+    assert seminar.note is None
+    assert seminar.students.max == 15
+    assert seminar.dates.signin_from == "20150901180000"
+    assert seminar.changed.person == 123456888
+    assert [teacher.uco for teacher in info.teachers] == [44411133, 11223344]
+    assert info.teachers[1].role == 'přednášející'
+
+
+def test_decode_matches_lazy_entities():
+    entity = parse_entity(entities.CourseStudents, sample.COURSE_LIST_STUDENTS)
+    decoded = entity.decode().students
+    for (lazy, record) in zip(entity.students, decoded):
+        assert record == lazy.decode()
+        for name in records.Student._fields:
+            assert getattr(record, name) == getattr(lazy, name)
+
+
+def test_decode_notepad_content():
+    content = parse_entity(entities.NotepadContent, sample.BLOCKS_CONTENT).decode()
+    assert content.students[0] == records.NotepadEntry(
+        uco=444111000, content="25 bodů",
+        changed=records.Changed(person=444111222, date="20160111104208"))
+    assert content.students[1].content is None
+    assert content.students[1].changed == records.Changed(person=None, date=None)
+
+
+def test_decode_seminars_and_notes():
+    seminars = parse_entity(entities.SeminarStudents, sample.SEMINARY_LIST_STUDENTS).decode()
+    assert [seminar.name for seminar in seminars.seminars] == ['01', '02']
+    assert seminars.seminars[1].students[0].uco == 4445557777
+    teachers = parse_entity(entities.SeminarTeachers, sample.SEMINARY_LIST_TEACHERS).decode()
+    assert teachers.seminars[0].teachers[0].full_name == 'RNDr. Mgr. What ever'
+    notes = parse_entity(entities.NotesList, sample.NOTES_LIST).decode()
+    assert notes.notes[0].show_statistic
+    assert notes.notes[0].changed.date == '20160112115151'
+
+
+def test_decode_without_schema():
+    resource = parse_entity(entities.Resource, sample.PREDMET_INFO)
+    with pytest.raises(NotImplementedError):
+        resource.decode()
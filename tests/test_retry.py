@@ -0,0 +1,133 @@
+import email.utils
+import time
+
+import pytest
+import requests
+
+from muni_is_api import errors
+from muni_is_api.client import HttpClient
+from muni_is_api.retry import RetryPolicy, parse_retry_after
+
+
+def _fail_first(count: int, operation: str, status=503):
+    calls = []
+
+    def _predicate(name, params):
+        if name != operation:
+            return None
+        calls.append(params)
+        return status if len(calls) <= count else None
+    return _predicate
+
+
+def _operations(server) -> list:
+    return [dict(query)['operace'] for query in server.requests]
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({'Retry-After': '7'}) == 7.0
+    assert parse_retry_after({}) is None
+    assert parse_retry_after({'Retry-After': 'soon'}) is None
+    date = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 25 < parse_retry_after({'Retry-After': date}) <= 30
+
+
+def test_delay_is_capped_with_jitter():
+    policy = RetryPolicy(backoff=1.0, max_backoff=4.0, jitter=0.5)
+    for attempt in range(1, 10):
+        expected = min(4.0, 2 ** (attempt - 1))
+        assert expected / 2 <= policy.delay(attempt) <= expected
+    assert policy.delay(1, {'Retry-After': '3'}) == 3.0
+    assert RetryPolicy(max_retry_after=2).delay(1, {'Retry-After': '60'}) == 2.0
+
+
+def test_only_reads_and_unsent_writes_are_retried():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.should_retry('predmet-info', 1, 503)
+    assert policy.should_retry('predmet-info', 2, None, requests.exceptions.ReadTimeout())
+    assert not policy.should_retry('predmet-info', 3, 503)
+    assert not policy.should_retry('predmet-info', 1, 400)
+    assert not policy.should_retry('blok-novy', 1, 503)
+    assert not policy.should_retry('blok-novy', 1, None, requests.exceptions.ReadTimeout())
+    assert policy.should_retry('blok-novy', 1, None, requests.exceptions.ConnectTimeout())
+
+
+def test_read_is_retried(client_factory, stub_server):
+    stub_server.fail_when = _fail_first(2, 'predmet-info')
+    client = client_factory(stub_server, retry=RetryPolicy(backoff=0.01))
+    assert client.course_info().course.code == 'PB161'
+    assert _operations(stub_server) == ['predmet-info'] * 3
+    stats = client.stats()['predmet-info']
+    assert stats.requests == 3
+    assert stats.errors == 2
+    assert stats.retries == 2
+
+
+def test_read_gives_up(client_factory, stub_server):
+    stub_server.fail_when = _fail_first(5, 'predmet-info')
+    client = client_factory(stub_server, retry=RetryPolicy(max_attempts=2, backoff=0.01))
+    with pytest.raises(errors.ISApiError) as error:
+        client.course_info()
+    assert error.value.status_code == 503
+    assert len(stub_server.requests) == 2
+
+
+def test_failed_write_is_checked_and_retried(client_factory, stub_server):
+    stub_server.fail_when = _fail_first(1, 'blok-pis-student-obsah', status=500)
+    client = client_factory(stub_server, retry=RetryPolicy(backoff=0.01))
+    results = client.notepad_update_many('hw01', {7: "10 bodů"})
+
+    assert results[7].ok
+    assert results[7].attempts == 2
+    assert _operations(stub_server) == ['blok-pis-student-obsah', 'blok-dej-obsah',
+                                        'blok-pis-student-obsah']
+    assert dict(stub_server.requests[-1])['poslzmeneno'] == "20160111104208"
+
+
+def test_applied_write_is_not_repeated(client_factory, stub_server):
+    stub_server.fail_when = _fail_first(1, 'blok-pis-student-obsah', status=500)
+    client = client_factory(stub_server, retry=RetryPolicy(backoff=0.01))
+    results = client.notepad_update_many('hw01', {7: "7 bodů"})
+
+    assert results[7].ok
+    assert results[7].value is None
+    assert results[7].attempts == 2
+    assert _operations(stub_server) == ['blok-pis-student-obsah', 'blok-dej-obsah']
+
+
+def test_concurrently_changed_cell_is_not_overwritten(client_factory, stub_server):
+    stub_server.fail_when = _fail_first(1, 'blok-pis-student-obsah', status=500)
+    client = client_factory(stub_server, retry=RetryPolicy(backoff=0.01))
+    results = client.notepad_update_many('hw01', {7: "10 bodů"},
+                                         last_changes={7: "20150101000000"})
+
+    assert not results[7].ok
+    assert "has been changed" in results[7].error.message
+    assert _operations(stub_server) == ['blok-pis-student-obsah', 'blok-dej-obsah']
+
+
+def test_write_without_policy_is_not_retried(client_factory, stub_server):
+    stub_server.fail_when = _fail_first(1, 'blok-pis-student-obsah', status=500)
+    results = client_factory(stub_server).notepad_update_many('hw01', {7: "x"})
+    assert not results[7].ok
+    assert results[7].attempts == 1
+    assert len(stub_server.requests) == 1
+
+
+def test_unsent_write_is_retried_once_per_attempt(client_factory, stub_server, monkeypatch):
+    writes = []
+    send_once = HttpClient._send_once
+
+    def _send_once(self, params, **kwargs):
+        if dict(params).get('operace') == 'blok-pis-student-obsah':
+            writes.append(params)
+            raise requests.exceptions.ConnectTimeout()
+        return send_once(self, params, **kwargs)
+
+    monkeypatch.setattr(HttpClient, '_send_once', _send_once)
+    client = client_factory(stub_server, retry=RetryPolicy(max_attempts=3, backoff=0.01))
+    results = client.notepad_update_many('hw01', {7: "10 bodů"})
+
+    assert isinstance(results[7].error, requests.exceptions.ConnectTimeout)
+    assert results[7].attempts == 3
+    assert len(writes) == 3
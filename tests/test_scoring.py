@@ -0,0 +1,79 @@
+import math
+
+import pytest
+from defusedxml.lxml import fromstring
+
+from muni_is_api import entities, scoring
+from tests import sample
+
+
+@pytest.mark.parametrize('text, points', [
+    ("*2", 2.0),
+    ("Great work! *2", 2.0),
+    ("*1,5 and *-0.5", 1.0),
+    ("25 bodů", 25.0),
+    ("2 body", 2.0),
+    ("1 bod", 1.0),
+    ("3,5 b.", 3.5),
+    ("4 pts", 4.0),
+    ("12", 12.0),
+    (" -1,25 ", -1.25),
+    ("*3 (25 bodů)", 3.0),
+    ("odevzdáno", None),
+    ("10 bonusů", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_points(text, points):
+    assert scoring.parse_points(text) == points
+
+
+def _scores(points) -> scoring.Scores:
+    return scoring.Scores(list(range(1, len(points) + 1)), points)
+
+
+def test_statistics(backend):
+    scores = _scores([1, 2, None, 3, 4, 10])
+    assert len(scores) == 6
+    assert scores.count() == 5
+    assert scores.sum() == 20
+    assert scores.mean() == 4
+    assert (scores.min(), scores.max()) == (1, 10)
+    assert type(scores.min()) is float
+    assert (_scores([None]).min(), _scores([None]).max()) == (None, None)
+    assert scores.percentile(50) == 3
+    assert scores.percentile(25) == 2
+    assert scores.percentile(90) == pytest.approx(7.6)
+    assert math.isnan(scores.points[2])
+    assert scores.get(3) is None
+    assert scores.get(6) == 10
+
+
+def test_histogram(backend):
+    (counts, edges) = _scores([0, 1, 2, 2.5, 5, None]).histogram(bins=5)
+    assert counts == [1, 1, 2, 0, 1]
+    assert edges == [0, 1, 2, 3, 4, 5]
+    (counts, _) = _scores([1, 9, 11]).histogram(bins=2, value_range=(0, 10))
+    assert counts == [1, 1]
+
+
+def test_empty_statistics(backend):
+    scores = _scores([None, None])
+    assert scores.sum() == 0
+    assert scores.mean() is None
+    assert scores.percentile(50) is None
+    assert sum(scores.histogram(bins=3)[0]) == 0
+
+
+def test_from_content(backend):
+    content = entities.NotepadContent(fromstring(sample.BLOCKS_CONTENT.strip().encode('utf-8')))
+    scores = scoring.Scores.from_content(content)
+    assert list(scores.ucos) == [student.uco for student in content.students]
+    assert scores.get(content.students[0].uco) == 25
+
+
+def test_totals(backend):
+    first = scoring.Scores([1, 2, 3], [1, None, 2])
+    second = scoring.Scores([2, 3, 4], [None, 5, 1])
+    total = scoring.totals([first, second])
+    assert total.by_uco() == {1: 1, 2: None, 3: 7, 4: 1}
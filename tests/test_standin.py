@@ -0,0 +1,203 @@
+import pytest
+import requests
+
+from muni_is_api import concurrency, errors, utils
+from muni_is_api.retry import RetryPolicy
+from muni_is_api.standin import Course, StandInServer, Student, parse_params
+from tests.conftest import TOKEN
+
+FOLDER = '/el/fi/podzim2020/PB000/odp/'
+
+
+def test_parse_params_of_serialized_query():
+    query = utils.params_serialize(dict(operace='blok-dej-obsah', uco=[1, 2], obsah='*1 a b'))
+    assert parse_params(query) == {'operace': ['blok-dej-obsah'], 'uco': ['1', '2'],
+                                   'obsah': ['*1 a b']}
+
+
+def test_reads(client_factory, standin):
+    client = client_factory(standin)
+    course = standin.courses[(1433, 'PB000')]
+
+    info = client.course_info()
+    assert info.course.code == 'PB000'
+    assert len(info.seminars) == 3
+
+    listed = {student.uco for student in client.course_list_students().students}
+    everyone = {student.uco for student in client.course_list_students(
+        registered=True, terminated=True, inactive=True).students}
+    assert everyone == set(course.students)
+    assert listed == {uco for (uco, student) in course.students.items()
+                      if not (student.registered or student.terminated or student.inactive)}
+
+    seminars = client.seminar_list_students(['01']).seminars
+    assert [seminar.name for seminar in seminars] == ['01']
+    assert len(client.seminar_list_teachers(['01', '02']).seminars[1].teachers) == 2
+    assert [note.shortcut for note in client.notepad_list().notes] == ['hw01', 'hw02']
+    client.exams_list()
+
+
+def test_writes_are_kept(client_factory, standin):
+    client = client_factory(standin)
+    client.notepad_new(name="Homework 03", shortcut='hw03', visible=True)
+    with pytest.raises(errors.ISApiError):
+        client.notepad_new(name="Homework 03", shortcut='hw03')
+
+    client.notepad_update('hw03', uco=100001, content='*5 + bonus')
+    entry = client.notepad_content('hw03', ucos=[100001, 100002]).get(100001)
+    assert entry.content == '*5 + bonus'
+    assert client.notepad_content('hw03').get(100002).content is None
+
+    # The cell changed since the last change is not overwritten
+    with pytest.raises(errors.ISApiError):
+        client.notepad_update('hw03', uco=100001, content='*1', last_change='20000101000000')
+    with pytest.raises(errors.ISApiError):
+        client.notepad_update('hw03', uco=100001, content='*1', override=False)
+    client.notepad_update('hw03', uco=100001, content='*1', last_change=entry.changed.date)
+    assert client.notepad_content('hw03', ucos=[100001]).get(100001).content == '*1'
+
+
+def test_sync_and_gradebook(client_factory, standin):
+    client = client_factory(standin)
+    result = client.sync_notepad('hw01', {100000: '*10', 100001: '*3'})
+    assert all(written.ok for written in result.written.values())
+
+    book = client.gradebook(notepads=['hw01'], students=[100000, 100001])
+    assert book.get(100000, 'hw01') == 10.0
+    assert book.get(100001, 'hw01') == 3.0
+
+
+def test_refused_requests(client_factory, standin):
+    with pytest.raises(errors.ISApiError) as info:
+        client_factory(standin, token='wrong').course_info()
+    assert info.value.status_code == 403
+    with pytest.raises(errors.ISApiError) as info:
+        client_factory(standin, course_code='PB999').course_info()
+    assert info.value.status_code == 404
+    with pytest.raises(errors.ISApiError):
+        client_factory(standin).notepad_content('missing')
+
+
+def test_injected_errors_are_retried(client_factory, standin):
+    standin.error_rate = 0.5
+    client = client_factory(standin, retry=RetryPolicy(max_attempts=20, backoff=0.001, jitter=0))
+    for _ in range(10):
+        client.course_info()
+    assert standin.statuses[500] > 0
+    assert client.stats()['predmet-info'].retries == standin.statuses[500]
+
+
+class _Clock:
+    """Fake monotonic clock, it moves by the ``step`` on each reading"""
+
+    def __init__(self, step: float = 0.0):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+def test_throttling(client_factory, standin):
+    standin.fail_when = lambda operation, params: 503 if params.get('zkratka') == ['hw02'] \
+        else None
+    with pytest.raises(errors.ISApiError) as info:
+        client_factory(standin).notepad_content('hw02')
+    assert info.value.status_code == 503
+
+    clock = _Clock()
+    server = StandInServer(rate=4, clock=clock).start()
+    try:
+        server.add_course(Course('PB000', 1433, TOKEN))
+        client = client_factory(server)
+        for _ in range(4):
+            client.course_info()
+        with pytest.raises(errors.ISApiError) as info:
+            client.course_info()
+        assert info.value.status_code == 429
+        # One token is refilled in 0.25s, the Retry-After is rounded up to whole seconds
+        assert info.value.headers['Retry-After'] == '1'
+        clock.now += 0.25
+        client.course_info()
+
+        # Every request refills a half of the token, so every other request is throttled
+        clock.step = 0.125
+        retried = client_factory(server, retry=RetryPolicy(max_attempts=2, max_retry_after=0))
+        for _ in range(6):
+            retried.course_info()
+        assert server.statuses[429] == 1 + 6
+        assert retried.stats()['predmet-info'].retries == 6
+    finally:
+        server.stop()
+
+
+def test_overload(client_factory, standin):
+    standin.max_in_flight = 1
+    standin.latency = lambda operation: 0.05 if operation == 'predmet-info' else 0
+    client = client_factory(standin)
+    results = list(concurrency.map_concurrently(
+        lambda index: client.course_info(), range(4), workers=4))
+    assert any(not result.ok and result.error.status_code == 503 for result in results)
+    assert standin.peak_in_flight > 1
+
+
+def test_files(files_client_factory, standin, tmp_path):
+    standin.add_file(FOLDER + 'a/report.txt', b'report')
+    standin.add_file(FOLDER + 'b.txt', b'b' * 1000)
+    files = files_client_factory(standin)
+
+    paths = sorted(node.path for node in files.walk(FOLDER))
+    assert paths == [FOLDER, FOLDER + 'a/', FOLDER + 'a/report.txt', FOLDER + 'b.txt']
+
+    assert files.download(FOLDER + 'b.txt', tmp_path / 'b.txt') == 1000
+    partial = tmp_path / 'resumed.txt.part'
+    partial.write_bytes(b'b' * 400)
+    assert files.download(FOLDER + 'b.txt', tmp_path / 'resumed.txt') == 1000
+    assert standin.requests[-1][0] == 'content'
+
+    (tmp_path / 'upload.zip').write_bytes(b'zip')
+    files.upload(FOLDER + 'a/', tmp_path / 'upload.zip')
+    assert standin.file(FOLDER + 'a/upload.zip') == b'zip'
+    assert files.for_url(FOLDER + 'a/').metadata(tree=True).subnodes_count == 2
+
+
+def test_generated_course_is_deterministic():
+    first = Course.generate('PB000', 1433, TOKEN, students=30, seed=4)
+    second = Course.generate('PB000', 1433, TOKEN, students=30, seed=4)
+    assert first.students == second.students
+    assert isinstance(first.students[100000], Student)
+
+
+def test_history_is_bounded():
+    with StandInServer(history=2) as server:
+        for operation in ('first', 'second', 'third'):
+            requests.get(f"http://{server.domain}/export/pb_blok_api?operace={operation}")
+        assert [operation for operation, _ in server.requests] == ['second', 'third']
+
+    with StandInServer(history=0) as server:
+        requests.get(f"http://{server.domain}/export/pb_blok_api")
+        assert not server.requests
+
+
+def test_content_is_validated_by_etag(standin):
+    standin.add_file(FOLDER + 'b.txt', b'0123456789')
+    url = f"http://{standin.domain}/auth{FOLDER}b.txt"
+    response = requests.get(url)
+    etag = response.headers['ETag']
+    assert response.content == b'0123456789'
+
+    resumed = requests.get(url, headers={'Range': 'bytes=4-', 'If-Range': etag})
+    assert (resumed.status_code, resumed.content) == (206, b'456789')
+    assert resumed.headers['Content-Range'] == 'bytes 4-9/10'
+
+    standin.add_file(FOLDER + 'b.txt', b'changed')
+    changed = requests.get(url, headers={'Range': 'bytes=4-', 'If-Range': etag})
+    assert (changed.status_code, changed.content) == (200, b'changed')
+    assert changed.headers['ETag'] != etag
+    assert requests.get(url, headers={'Range': 'bytes=7-'}).status_code == 416
+
+    standin.cut_after = 3
+    with pytest.raises(requests.exceptions.RequestException):
+        requests.get(url).content
+    assert requests.get(url).content == b'changed'
@@ -0,0 +1,59 @@
+import io
+
+import pytest
+from defusedxml import EntitiesForbidden
+
+from muni_is_api import records, utils
+from muni_is_api.client import HttpClient
+
+
+def test_iterparse_clears_processed_elements():
+    xml = "<ROOT>" + "".join(f"<STUDENT><UCO>{uco}</UCO></STUDENT>" for uco in range(5)) + "</ROOT>"
+    seen = []
+    for element in utils.iterparse(io.BytesIO(xml.encode('utf-8')), tag='STUDENT'):
+        seen.append(element.findtext('UCO'))
+        previous = element.getprevious()
+        assert previous is None or (len(previous) == 0 and previous.getprevious() is None)
+    assert seen == ['0', '1', '2', '3', '4']
+
+
+def test_iterparse_rejects_entities():
+    xml = ('<?xml version="1.0"?><!DOCTYPE ROOT [<!ENTITY a "aaaaaaaaaa">'
+           '<!ENTITY b "&a;&a;&a;&a;&a;&a;&a;&a;&a;&a;">'
+           '<!ENTITY c "&b;&b;&b;&b;&b;&b;&b;&b;&b;&b;">]>'
+           '<ROOT><STUDENT><UCO>&c;</UCO></STUDENT></ROOT>')
+    with pytest.raises(EntitiesForbidden):
+        list(utils.iterparse(io.BytesIO(xml.encode('utf-8')), tag='STUDENT'))
+
+
+def test_iter_students(client_factory, stub_server):
+    students = list(client_factory(stub_server).iter_students(terminated=True))
+    assert [student.uco for student in students] == [444555666, 4445557777]
+    assert isinstance(students[0], records.Student)
+    assert not students[0].has_seminary
+    assert dict(stub_server.requests[0])['vcukonc'] == 'a'
+
+
+def test_iter_notepad_entries_streams_split_requests(client_factory, stub_server):
+    client = client_factory(stub_server, max_url_length=300)
+    ucos = list(range(500000, 500100))
+    entries = client.iter_notepad_entries('hw01', ucos=ucos)
+    assert next(entries).uco == ucos[0]
+    assert [entry.uco for entry in entries] == ucos[1:]
+    assert len(stub_server.requests) > 1
+
+
+def test_failed_stream_response_is_closed(client_factory, stub_server, monkeypatch):
+    client = client_factory(stub_server, fail=False)
+    stub_server.fail_when = lambda operation, params: True
+    closed = []
+    send = HttpClient._send
+
+    def _send(*args, **kwargs):
+        (response, network_time, attempt) = send(*args, **kwargs)
+        response.close = lambda: closed.append(response.status_code)
+        return response, network_time, attempt
+
+    monkeypatch.setattr(HttpClient, '_send', _send)
+    assert list(client.iter_students()) == []
+    assert closed == [500]
@@ -0,0 +1,40 @@
+import pytest
+import requests
+
+import muni_is_api
+from muni_is_api.transport import Transport
+
+
+def test_transport_configures_pool():
+    session = Transport(pool_connections=3, pool_maxsize=42, keep_alive=False).session
+    adapter = session.get_adapter('https://is.muni.cz')
+    assert adapter._pool_maxsize == 42
+    assert adapter._pool_connections == 3
+    assert session.headers['Connection'] == 'close'
+
+
+def test_shared_transport_shares_session(client_factory, stub_server):
+    transport = Transport(pool_maxsize=20)
+    first = client_factory(stub_server, transport=transport)
+    second = client_factory(stub_server, transport=transport)
+    assert first.http.session is second.http.session
+    assert client_factory(stub_server).http.session is not first.http.session
+    assert first.course_info().course.code == second.course_info().course.code
+
+
+def test_read_timeout(client_factory, stub_server):
+    stub_server.latency = 0.5
+    client = client_factory(stub_server,
+                            transport=Transport(connect_timeout=1, read_timeout=0.1))
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.course_info()
+    assert client.stats()['predmet-info'].errors == 1
+
+
+def test_files_client_uses_transport():
+    transport = Transport()
+    first = muni_is_api.FilesApiClient('is.muni.cz', '1', 'a', transport=transport)
+    second = muni_is_api.FilesApiClient('is.muni.cz', '2', 'b', transport=transport)
+    assert first.session is second.session
+    assert first.session.auth is None
+    assert first.api_url == "https://is.muni.cz/auth/dok/fmgr_api"